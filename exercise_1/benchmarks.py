@@ -0,0 +1,189 @@
+import argparse  # For choosing which benchmark to run
+import random    # For synthetic gradebooks
+import os        # For file sizes
+import tempfile  # For scratch storage files
+import time      # For wall-clock measurements
+import tracemalloc  # For Python heap measurements
+
+GRADES_PER_STUDENT = 10  # Synthetic books have ~10 grades per student
+
+# Build a synthetic {"name": [grades]} gradebook with the given number of grades
+def synthetic_gradebook(num_grades, seed=0):
+    rng = random.Random(seed)
+    num_students = max(1, num_grades // GRADES_PER_STUDENT)
+    gradebook = {f"student{i}": [] for i in range(num_students)}
+    names = list(gradebook)
+    for _ in range(num_grades):
+        gradebook[rng.choice(names)].append(float(rng.randint(0, 100)))
+    return gradebook
+
+# Time a callable and return (seconds, result)
+def timed(func, *args):
+    start = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - start, result
+
+# Compare the NumPy statistics engine with the per-student loop
+def bench_analytics(sizes):
+    import numpy as np
+    from grade_analytics import GradeColumns, compute_statistics, compute_statistics_loop, letter_grades
+    from student_gradebook import get_letter_grade
+
+    compute_statistics(GradeColumns(["warmup"], [0], [50.0]))  # Exclude NumPy's first-call overhead
+    # Band edges and non-finite averages map to the same letters as get_letter_grade
+    edge_cases = [float("nan"), float("inf"), -float("inf"), -1, 0, 59.999, 60, 69.99, 70, 80, 89.9999, 90, 100, 150]
+    assert letter_grades(np.array(edge_cases)).tolist() == [get_letter_grade(avg) for avg in edge_cases]
+    stats = compute_statistics(GradeColumns(["nan", "a"], [0, 1], [float("nan"), 95.0]))
+    assert stats["letters"].tolist() == [get_letter_grade(float("nan")), "A"]
+    print(f"{'grades':>10} {'loop (s)':>10} {'numpy (s)':>10} {'speedup':>8}")
+    for size in sizes:
+        gradebook = synthetic_gradebook(size)
+        names = list(gradebook)
+        ids = np.repeat(np.arange(len(names), dtype=np.int32), [len(g) for g in gradebook.values()])
+        grades = np.fromiter((g for gs in gradebook.values() for g in gs), dtype=np.float32, count=size)
+        columns = GradeColumns(names, ids, grades)
+
+        loop_time, (averages, letters) = timed(compute_statistics_loop, gradebook)
+        numpy_time, stats = timed(compute_statistics, columns)
+
+        # Letter grades must agree with get_letter_grade for every student
+        assert letters == dict(zip((names[i] for i in stats["student_ids"]), stats["letters"].tolist()))
+        print(f"{size:>10} {loop_time:>10.4f} {numpy_time:>10.4f} {loop_time / numpy_time:>7.1f}x")
+
+# Measure write cost, restart time and memory of the persistent gradebook
+def bench_storage(num_grades):
+    from gradebook_storage import GradebookStorage
+    from student_gradebook import Gradebook
+
+    gradebook = synthetic_gradebook(num_grades)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "gradebook")
+
+        # Write every mutation through the log (no snapshots yet)
+        storage = GradebookStorage(path, snapshot_every=float("inf"))
+        book = storage.load_into(Gradebook())
+        start = time.perf_counter()
+        for name, grades in gradebook.items():
+            book.add_student(name)
+            book.add_grades(name, grades)
+        write_time = time.perf_counter() - start
+        log_size = os.path.getsize(storage.log_path)
+        storage.close()
+
+        replay_time, replay_peak = _measure_restart(path)
+
+        storage = GradebookStorage(path)
+        storage.load_into(Gradebook()).storage.snapshot()
+        snap_size = os.path.getsize(storage.snap_path)
+        storage.close()
+
+        snap_time, snap_peak = _measure_restart(path)
+
+    print(f"Grades: {num_grades:,}  Students: {len(gradebook):,}")
+    print(f"Logged writes: {write_time:.2f}s ({num_grades / write_time:,.0f} grades/s)")
+    print(f"{'restart from':<14} {'file size':>12} {'time (s)':>10} {'peak heap':>12}")
+    print(f"{'log replay':<14} {log_size / 2**20:>10.1f}MB {replay_time:>10.2f} {replay_peak / 2**20:>10.1f}MB")
+    print(f"{'snapshot':<14} {snap_size / 2**20:>10.1f}MB {snap_time:>10.2f} {snap_peak / 2**20:>10.1f}MB")
+
+# Per-grade memory of the old {"name": [floats]} layout vs Student records
+def bench_memory(num_grades):
+    from student_gradebook import Gradebook
+
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    lists = synthetic_gradebook(num_grades)
+    list_bytes = tracemalloc.get_traced_memory()[0] - base
+
+    base = tracemalloc.get_traced_memory()[0]
+    book = Gradebook()
+    book.restore(lists)
+    book_bytes = tracemalloc.get_traced_memory()[0] - base
+
+    # Dropping the ranking heaps frees exactly what they occupy
+    before = tracemalloc.get_traced_memory()[0]
+    book.lowest = book.highest = []
+    ranking_bytes = before - tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    print(f"Grades: {num_grades:,}  Students: {len(lists):,}")
+    print(f"{'layout':<24} {'total':>10} {'per grade':>10}")
+    print(f"{'dict of float lists':<24} {list_bytes / 2**20:>8.1f}MB {list_bytes / num_grades:>9.1f}B")
+    record_bytes = book_bytes - ranking_bytes
+    print(f"{'Student records':<24} {record_bytes / 2**20:>8.1f}MB {record_bytes / num_grades:>9.1f}B")
+    buffer_bytes = sum(len(student.grades) * student.grades.itemsize for student in book.students.values())
+    print(f"{'  of which grade buffers':<24} {buffer_bytes / 2**20:>8.1f}MB {buffer_bytes / num_grades:>9.1f}B")
+    print(f"{'+ ranking heaps':<24} {book_bytes / 2**20:>8.1f}MB {book_bytes / num_grades:>9.1f}B")
+    # The heaps hold one entry per student right after a rebuild and at most about
+    # twice that before the next one, so their cost is per student, not per grade
+    print(f"Ranking heaps: {ranking_bytes / len(book):.0f}B per student after a rebuild, "
+          f"up to {2 * ranking_bytes / len(book):.0f}B with outdated entries")
+
+# Per-grade update cost and top/bottom query cost as the number of students grows;
+# both stay flat because the ranking heaps are O(log n) per grade
+def bench_ranking(sizes, updates):
+    from student_gradebook import Gradebook
+
+    print(f"{'students':>10} {'add_grade (us)':>15} {'top+bottom (us)':>16} {'matches':>8}")
+    for size in sizes:
+        rng = random.Random(size)
+        book = Gradebook()
+        book.restore({f"student{i}": [float(rng.randint(0, 100))] for i in range(size)})
+        names = [f"student{rng.randrange(size)}" for _ in range(updates)]
+        grades = [float(rng.randint(0, 100)) for _ in range(updates)]
+
+        start = time.perf_counter()
+        for name, grade in zip(names, grades):
+            book.add_grade(name, grade)
+        update_time = (time.perf_counter() - start) / updates
+
+        start = time.perf_counter()
+        for _ in range(1000):
+            top, bottom = book.top_student(), book.bottom_student()
+        query_time = (time.perf_counter() - start) / 1000
+
+        # Same answers as a full scan (max/min return the earliest-added student on ties)
+        students = list(book.students.values())
+        best = max(students, key=lambda student: student.average())
+        worst = min(students, key=lambda student: student.average())
+        matches = top == (best.name, best.average()) and bottom == (worst.name, worst.average())
+        print(f"{size:>10,} {update_time * 1e6:>15.2f} {query_time * 1e6:>16.2f} {str(matches):>8}")
+
+# Reload a gradebook twice: once timed, once under tracemalloc for the heap peak
+def _measure_restart(path):
+    from gradebook_storage import GradebookStorage
+    from student_gradebook import Gradebook
+
+    storage = GradebookStorage(path)
+    elapsed, _ = timed(storage.load_into, Gradebook())
+    storage.close()
+
+    tracemalloc.start()
+    storage = GradebookStorage(path)
+    storage.load_into(Gradebook())
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    storage.close()
+    return elapsed, peak
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Gradebook benchmarks")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+    analytics = sub.add_parser("analytics", help="NumPy statistics vs per-student loop")
+    analytics.add_argument("--sizes", type=int, nargs="+", default=[10**4, 10**5, 10**6])
+    storage = sub.add_parser("storage", help="Persistent gradebook write/restart cost")
+    storage.add_argument("--grades", type=int, default=10**6)
+    memory = sub.add_parser("memory", help="Per-grade memory of list vs Student records")
+    memory.add_argument("--grades", type=int, default=10**6)
+    ranking = sub.add_parser("ranking", help="Grade update and top/bottom query cost vs class size")
+    ranking.add_argument("--sizes", type=int, nargs="+", default=[10**4, 10**5, 10**6])
+    ranking.add_argument("--updates", type=int, default=10**5)
+    args = parser.parse_args()
+
+    if args.benchmark == "analytics":
+        bench_analytics(args.sizes)
+    elif args.benchmark == "storage":
+        bench_storage(args.grades)
+    elif args.benchmark == "memory":
+        bench_memory(args.grades)
+    elif args.benchmark == "ranking":
+        bench_ranking(args.sizes, args.updates)
@@ -0,0 +1,171 @@
+import csv   # For reading bulk grade exports
+import json  # For reading gradebook dumps
+import sys   # For command-line arguments
+
+import numpy as np  # Columnar grade storage and batched statistics
+
+from student_gradebook import get_letter_grade
+
+# Lower bounds of the D, C, B and A bands used by get_letter_grade
+LETTER_THRESHOLDS = np.array([60, 70, 80, 90], dtype=np.float64)
+LETTERS = np.array(["F", "D", "C", "B", "A"])
+
+PERCENTILES = [10, 25, 50, 75, 90]  # Percentiles reported for student averages
+HISTOGRAM_BINS = 10  # 0-10, 10-20, ..., 90-100
+
+# Columnar grade data: one name per student and one (student id, grade) pair per grade
+class GradeColumns:
+    def __init__(self, names, student_ids, grades):
+        self.names = names  # Student id -> name
+        self.student_ids = np.asarray(student_ids, dtype=np.int32)
+        self.grades = np.asarray(grades, dtype=np.float32)
+
+    def __len__(self):
+        return len(self.grades)
+
+# Map student names to dense integer ids while reading rows
+def _intern(name, index, names):
+    student_id = index.get(name)
+    if student_id is None:
+        student_id = index[name] = len(names)
+        names.append(name)
+    return student_id
+
+# Read a CSV file of "name,grade" rows (an optional header row is skipped)
+def load_grades_csv(path):
+    index, names, ids, grades = {}, [], [], []
+    with open(path, newline="") as f:
+        for row in csv.reader(f):
+            if len(row) < 2:
+                continue
+            try:
+                grade = float(row[1])
+            except ValueError:
+                continue  # Header or malformed row
+            ids.append(_intern(row[0].strip(), index, names))
+            grades.append(grade)
+    return GradeColumns(names, ids, grades)
+
+# Read a JSON file in gradebook form {"name": [grades]} or as a list of
+# {"name": ..., "grade": ...} records
+def load_grades_json(path):
+    with open(path) as f:
+        raw = json.load(f)
+    index, names, ids, grades = {}, [], [], []
+    if isinstance(raw, dict):
+        for name, student_grades in raw.items():
+            student_id = _intern(name, index, names)
+            ids.extend([student_id] * len(student_grades))
+            grades.extend(student_grades)
+    else:
+        for record in raw:
+            ids.append(_intern(record["name"], index, names))
+            grades.append(record["grade"])
+    return GradeColumns(names, ids, grades)
+
+# Pick the loader from the file extension
+def load_grades(path):
+    if path.lower().endswith(".json"):
+        return load_grades_json(path)
+    return load_grades_csv(path)
+
+# Index into LETTERS for each average; NaN fails every comparison in
+# get_letter_grade, so it maps to "F" here too (searchsorted would put it last)
+def _letter_index(averages):
+    index = np.searchsorted(LETTER_THRESHOLDS, averages, side="right")
+    index[np.isnan(averages)] = 0
+    return index
+
+# Vectorized get_letter_grade: one searchsorted over the band thresholds
+def letter_grades(averages):
+    return LETTERS[_letter_index(np.asarray(averages, dtype=np.float64))]
+
+# Compute every statistic the gradebook reports in one batched pass
+def compute_statistics(columns):
+    num_students = len(columns.names)
+    counts = np.bincount(columns.student_ids, minlength=num_students)
+    sums = np.bincount(columns.student_ids, weights=columns.grades, minlength=num_students)
+
+    graded = np.flatnonzero(counts)  # Students with at least one grade
+    if len(graded) == 0:
+        return None
+    averages = sums[graded] / counts[graded]
+    letter_index = _letter_index(averages)
+
+    top = np.argmax(averages)  # First maximum, i.e. earliest student on ties
+    bottom = np.argmin(averages)
+    histogram, edges = np.histogram(columns.grades, bins=HISTOGRAM_BINS, range=(0, 100))
+
+    return {
+        "student_ids": graded,
+        "averages": averages,
+        "letters": LETTERS[letter_index],
+        "letter_counts": dict(zip(LETTERS.tolist(), np.bincount(letter_index, minlength=len(LETTERS)).tolist())),
+        "class_average": float(averages.mean()),
+        "average_std": float(averages.std()),
+        "grade_std": float(columns.grades.std(dtype=np.float64)),
+        "percentiles": dict(zip(PERCENTILES, np.percentile(averages, PERCENTILES).tolist())),
+        "top": (columns.names[graded[top]], float(averages[top])),
+        "bottom": (columns.names[graded[bottom]], float(averages[bottom])),
+        "histogram": list(zip(edges[:-1].tolist(), histogram.tolist())),
+    }
+
+# Reference implementation: the per-student loop used by the interactive gradebook
+def compute_statistics_loop(gradebook):
+    averages = {}
+    letters = {}
+    for name, grades in gradebook.items():
+        if grades:
+            averages[name] = sum(grades) / len(grades)
+            letters[name] = get_letter_grade(averages[name])
+    return averages, letters
+
+# Merge imported columns into an interactive Gradebook. Grades outside 0-100
+# (or NaN) are rejected, as add_grade does; returns (students, grades, rejected).
+def merge_into_gradebook(columns, gradebook):
+    valid = (columns.grades >= 0) & (columns.grades <= 100)
+    ids = columns.student_ids[valid]
+    if len(ids) == 0:
+        return 0, 0, len(columns)
+    order = np.argsort(ids, kind="stable")  # Group grades per student
+    ids = ids[order]
+    grades = columns.grades[valid][order].tolist()
+    bounds = np.flatnonzero(np.diff(ids)) + 1
+    starts = [0] + bounds.tolist()
+    ends = bounds.tolist() + [len(ids)]
+    for start, end in zip(starts, ends):
+        name = columns.names[ids[start]]
+        gradebook.add_student(name)  # No-op for existing students
+        gradebook.add_grades(name, grades[start:end])
+    return len(starts), len(ids), len(columns) - len(ids)
+
+# Print a class report from compute_statistics output
+def print_statistics(stats):
+    if stats is None:
+        print("No grades available to calculate statistics.")
+        return
+    print(f"Students: {len(stats['averages'])}")
+    print(f"Class Average: {stats['class_average']:.2f} (std {stats['average_std']:.2f})")
+    print(f"Top Student: {stats['top'][0]} ({stats['top'][1]:.2f})")
+    print(f"Lowest Student: {stats['bottom'][0]} ({stats['bottom'][1]:.2f})")
+    print(f"Grade Std Dev: {stats['grade_std']:.2f}")
+
+    print("\nLetter Grades:")
+    for letter in reversed(LETTERS.tolist()):
+        print(f"{letter}: {stats['letter_counts'][letter]}")
+
+    print("\nPercentiles (student averages):")
+    for pct, value in stats["percentiles"].items():
+        print(f"P{pct}: {value:.2f}")
+
+    print("\nGrade Distribution:")
+    largest = max(count for _, count in stats["histogram"]) or 1
+    for low, count in stats["histogram"]:
+        bar = '█' * round(count / largest * 20)
+        print(f"{low:>5.0f}-{low + 100 / HISTOGRAM_BINS:<5.0f} {bar} {count}")
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2:
+        print("Usage: python grade_analytics.py <grades.csv|grades.json>")
+        sys.exit(1)
+    print_statistics(compute_statistics(load_grades(sys.argv[1])))
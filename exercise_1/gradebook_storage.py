@@ -0,0 +1,170 @@
+import os      # For atomic file replacement
+import struct  # For the compact binary record layout
+from array import array  # For bulk reading/writing of grade buffers
+
+# File layout
+# - <path>.log:  header (magic, generation) followed by mutation records
+#                b"S" + name            add student
+#                b"G" + name + grade    add grade (float64)
+# - <path>.snap: header (magic, generation, student count) followed by
+#                name + grade count + packed float32 grades per student
+#                (GBS1 snapshots stored float64 grades and are still readable)
+# A snapshot with generation N supersedes every log with generation < N,
+# so a crash between writing the snapshot and resetting the log is harmless.
+LOG_MAGIC = b"GBL1"
+SNAP_MAGIC = b"GBS2"
+SNAP_TYPECODES = {b"GBS1": "d", SNAP_MAGIC: "f"}  # Snapshot version -> grade array type
+HEADER = struct.Struct("<4sI")  # magic, generation
+SNAP_HEADER = struct.Struct("<4sII")  # magic, generation, student count
+NAME_LEN = struct.Struct("<H")
+GRADE = struct.Struct("<d")
+COUNT = struct.Struct("<I")
+
+SNAPSHOT_EVERY = 100_000  # Log records between automatic snapshots
+
+# Append-only log plus periodic snapshots backing a Gradebook
+class GradebookStorage:
+    def __init__(self, path, snapshot_every=SNAPSHOT_EVERY):
+        self.log_path = path + ".log"
+        self.snap_path = path + ".snap"
+        self.snapshot_every = snapshot_every
+        self.generation = 0
+        self.pending = 0  # Records written since the last snapshot
+        self.gradebook = None
+        self.log = None
+
+    # Restore the gradebook from the snapshot and the log tail, then start logging
+    def load_into(self, gradebook):
+        self.gradebook = gradebook
+        grades_by_name = {}
+        self.generation = self._read_snapshot(grades_by_name)
+        valid_end = self._replay_log(grades_by_name)
+        gradebook.restore(grades_by_name)  # Indexes are rebuilt once, not per record
+
+        if valid_end is None:
+            # No usable log for this generation: start a fresh one
+            self._reset_log()
+        else:
+            self.log = open(self.log_path, "r+b")
+            self.log.truncate(valid_end)  # Drop a half-written trailing record
+            self.log.seek(valid_end)
+        gradebook.storage = self
+        return gradebook
+
+    def _read_snapshot(self, grades_by_name):
+        if not os.path.exists(self.snap_path):
+            return 0
+        with open(self.snap_path, "rb") as f:
+            data = f.read()
+        magic, generation, num_students = SNAP_HEADER.unpack_from(data)
+        if magic not in SNAP_TYPECODES:
+            raise ValueError(f"{self.snap_path} is not a gradebook snapshot")
+        typecode = SNAP_TYPECODES[magic]
+        offset = SNAP_HEADER.size
+        for _ in range(num_students):
+            name, offset = _unpack_name(data, offset)
+            (count,) = COUNT.unpack_from(data, offset)
+            offset += COUNT.size
+            grades = array(typecode)
+            end = offset + count * grades.itemsize
+            grades.frombytes(data[offset:end])
+            offset = end
+            grades_by_name[name] = grades if typecode == "f" else grades.tolist()
+        return generation
+
+    # Replay log records; returns the offset after the last complete record,
+    # or None if the log is missing or belongs to an older generation
+    def _replay_log(self, grades_by_name):
+        if not os.path.exists(self.log_path):
+            return None
+        with open(self.log_path, "rb") as f:
+            data = f.read()
+        if len(data) < HEADER.size:
+            return None
+        magic, generation = HEADER.unpack_from(data)
+        if magic != LOG_MAGIC or generation != self.generation:
+            return None
+
+        offset = HEADER.size
+        while offset < len(data):
+            try:
+                op = data[offset:offset + 1]
+                name, end = _unpack_name(data, offset + 1)
+                if op == b"S":
+                    grades_by_name.setdefault(name, [])
+                elif op == b"G":
+                    (grade,) = GRADE.unpack_from(data, end)
+                    end += GRADE.size
+                    grades_by_name[name].append(grade)
+                else:
+                    break
+            except (struct.error, UnicodeDecodeError):
+                break  # Truncated tail from an interrupted write
+            offset = end
+            self.pending += 1
+        return offset
+
+    def _reset_log(self):
+        if self.log is not None:
+            self.log.close()
+        self.log = open(self.log_path, "wb")
+        self.log.write(HEADER.pack(LOG_MAGIC, self.generation))
+        self.log.flush()
+        self.pending = 0
+
+    def _append(self, record):
+        self.log.write(record)
+        self.log.flush()
+        self.pending += 1
+        if self.pending >= self.snapshot_every:
+            self.snapshot()
+
+    # Mutation hooks called by Gradebook
+    def record_student(self, name):
+        self._append(b"S" + _pack_name(name))
+
+    def record_grade(self, name, grade):
+        self._append(b"G" + _pack_name(name) + GRADE.pack(grade))
+
+    def record_grades(self, name, grades):
+        prefix = b"G" + _pack_name(name)
+        self.log.write(b"".join(prefix + GRADE.pack(grade) for grade in grades))
+        self.log.flush()
+        self.pending += len(grades)
+        if self.pending >= self.snapshot_every:
+            self.snapshot()
+
+    # Write the full gradebook to a new snapshot and start an empty log
+    def snapshot(self):
+        students = self.gradebook.students
+        parts = [SNAP_HEADER.pack(SNAP_MAGIC, self.generation + 1, len(students))]
+        for name, student in students.items():
+            parts.append(_pack_name(name))
+            parts.append(COUNT.pack(len(student.grades)))
+            parts.append(student.grades.tobytes())
+
+        tmp_path = self.snap_path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(b"".join(parts))
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.snap_path)  # Atomic: old snapshot stays valid until now
+
+        self.generation += 1
+        self._reset_log()
+
+    def close(self):
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+def _pack_name(name):
+    encoded = name.encode("utf-8")
+    return NAME_LEN.pack(len(encoded)) + encoded
+
+def _unpack_name(data, offset):
+    (length,) = NAME_LEN.unpack_from(data, offset)
+    start = offset + NAME_LEN.size
+    if start + length > len(data):
+        raise struct.error("truncated name")
+    return data[start:start + length].decode("utf-8"), start + length
@@ -1,3 +1,11 @@
+from array import array  # Packed float32 grade storage
+from heapq import heapify, heappop, heappush  # Top/bottom student indexes
+
+from gradebook_storage import GradebookStorage  # Append-only log + snapshots
+
+GRADEBOOK_FILE = "gradebook"  # Prefix for gradebook.log / gradebook.snap
+STALE_SLACK = 32  # Outdated heap entries tolerated beyond one per graded student
+
 # Function to determine the letter grade based on average score
 def get_letter_grade(avg):
     if avg >= 90:
@@ -11,14 +19,151 @@ def get_letter_grade(avg):
     else:
         return "F"
 
+# Compact per-student record: grades live in a packed float32 buffer
+# (4 bytes each) instead of a list of boxed Python floats
+class Student:
+    __slots__ = ("name", "order", "grades", "total")
+
+    def __init__(self, name, order):
+        self.name = name
+        self.order = order  # Insertion order, used to break ties in rankings
+        self.grades = array("f")
+        self.total = 0.0  # Running sum of the stored grades
+
+    # Current average, or None if the student has no grades yet
+    def average(self):
+        if not self.grades:
+            return None
+        return self.total / len(self.grades)
+
+    # Grades as plain floats, trimmed to float32 precision for display
+    def grade_list(self):
+        return [float(f"{grade:.6g}") for grade in self.grades]
+
+# Gradebook that keeps running aggregates up to date as grades are added,
+# so averages and class statistics never have to rescan every grade
+class Gradebook:
+    def __init__(self):
+        self.students = {}  # Student name -> Student record
+        self.graded = 0  # Number of students with at least one grade
+        self.average_total = 0.0  # Sum of all student averages (for the class average)
+        # Heaps of (average, order, name, grade count) and (-average, order, name,
+        # grade count) for bottom/top queries. A grade pushes a new entry instead of
+        # removing the old one; entries whose count is out of date are skipped.
+        self.lowest = []
+        self.highest = []
+        self.storage = None  # Optional GradebookStorage that persists every mutation
+
+    def __contains__(self, name):
+        return name in self.students
+
+    def __len__(self):
+        return len(self.students)
+
+    # Register a new student; returns False if the name is already taken
+    def add_student(self, name):
+        if name in self.students:
+            return False
+        self.students[name] = Student(name, len(self.students))
+        if self.storage is not None:
+            self.storage.record_student(name)
+        return True
+
+    # Append a grade and update the student's sum, average and ranking entries
+    def add_grade(self, name, grade):
+        self._extend(self.students[name], array("f", [grade]))
+        if self.storage is not None:
+            self.storage.record_grade(name, grade)
+
+    # Append many grades for one student with a single ranking update
+    def add_grades(self, name, new_grades):
+        if not len(new_grades):
+            return
+        self._extend(self.students[name], array("f", new_grades))
+        if self.storage is not None:
+            self.storage.record_grades(name, new_grades)
+
+    # Bulk-load {"name": grades} (e.g. from storage) and rebuild the indexes once
+    def restore(self, grades_by_name):
+        for name, grades in grades_by_name.items():
+            student = self.students.get(name)
+            if student is None:
+                student = self.students[name] = Student(name, len(self.students))
+            if student.grades:
+                student.grades.extend(grades)  # Accepts lists or float32 arrays
+            else:
+                # Adopt loaded buffers as-is; a fresh array is sized exactly
+                student.grades = grades if isinstance(grades, array) else array("f", grades)
+            student.total = sum(student.grades)
+
+        self._rebuild_rankings()
+        self.graded = len(self.lowest)
+        self.average_total = sum(avg for avg, _, _, _ in self.lowest)
+
+    # Heaps with exactly one current entry per graded student, built in O(n)
+    def _rebuild_rankings(self):
+        self.lowest = [(student.average(), student.order, student.name, len(student.grades))
+                       for student in self.students.values() if student.grades]
+        self.highest = [(-avg, order, name, count) for avg, order, name, count in self.lowest]
+        heapify(self.lowest)
+        heapify(self.highest)
+
+    def _extend(self, student, packed):
+        old_avg = student.average()
+        if old_avg is None:
+            self.graded += 1
+        else:
+            self.average_total -= old_avg
+
+        student.grades.extend(packed)
+        student.total += sum(packed)  # Sum of the float32 values actually stored
+        avg = student.average()
+        self.average_total += avg
+        count = len(student.grades)
+        heappush(self.lowest, (avg, student.order, student.name, count))  # O(log n)
+        heappush(self.highest, (-avg, student.order, student.name, count))
+        limit = 2 * self.graded + STALE_SLACK
+        if len(self.lowest) > limit or len(self.highest) > limit:
+            self._rebuild_rankings()  # Amortized O(1): at least graded pushes since the last rebuild
+
+    # Drop outdated entries from the top of a heap; returns its current best entry
+    def _current(self, heap):
+        students = self.students
+        while heap and len(students[heap[0][2]].grades) != heap[0][3]:
+            heappop(heap)
+        return heap[0] if heap else None
+
+    # Average of a single student, or None if they have no grades yet
+    def average(self, name):
+        return self.students[name].average()
+
+    # Average of all student averages, or None if nobody has grades
+    def class_average(self):
+        if not self.graded:
+            return None
+        return self.average_total / self.graded
+
+    # Student with the highest average (earliest added wins ties)
+    def top_student(self):
+        entry = self._current(self.highest)
+        if entry is None:
+            return None
+        return entry[2], -entry[0]
+
+    # Student with the lowest average (earliest added wins ties)
+    def bottom_student(self):
+        entry = self._current(self.lowest)
+        if entry is None:
+            return None
+        return entry[2], entry[0]
+
 # Function to add a new student to the gradebook
 def add_student(gradebook):
     name = input("Enter student name: ").strip()
-    if name in gradebook:
-        print(f"{name} already exists.")  # Prevent duplicate entries
-    else:
-        gradebook[name] = []  # Initialize with empty grade list
+    if gradebook.add_student(name):
         print(f"{name} added successfully.")
+    else:
+        print(f"{name} already exists.")  # Prevent duplicate entries
 
 # Function to add a grade to an existing student
 def add_grade(gradebook):
@@ -29,7 +174,7 @@ def add_grade(gradebook):
     try:
         grade = float(input("Enter grade (0-100): "))
         if 0 <= grade <= 100:
-            gradebook[name].append(grade)  # Add grade to student's list
+            gradebook.add_grade(name, grade)  # Add grade and refresh running totals
             print(f"Grade {grade} added to {name}.")
         else:
             print("Grade must be between 0 and 100.")  # Validate range
@@ -42,43 +187,48 @@ def view_student_report(gradebook):
     if name not in gradebook:
         print("Student not found.")
         return
-    grades = gradebook[name]
-    if not grades:
+    avg = gradebook.average(name)  # Maintained incrementally by add_grade
+    if avg is None:
         print(f"{name} has no grades yet.")  # Handle empty grade list
         return
-    avg = sum(grades) / len(grades)  # Compute average
     letter = get_letter_grade(avg)  # Get corresponding letter grade
     print(f"{name}'s Average: {avg:.2f} (Grade: {letter})")
-    print(f"Grades: {grades}")
+    print(f"Grades: {gradebook.students[name].grade_list()}")
 
 # Function to compute and display overall class statistics
 def class_statistics(gradebook):
-    all_averages = []
-    for grades in gradebook.values():
-        if grades:
-            avg = sum(grades) / len(grades)  # Compute student average
-            all_averages.append((avg, grades))  # Store with their grades
-
-    if not all_averages:
+    class_avg = gradebook.class_average()
+    if class_avg is None:
         print("No grades available to calculate statistics.")
         return
 
-    class_avg = sum(avg for avg, _ in all_averages) / len(all_averages)  # Class average
-    highest = max(all_averages)  # Student with highest average
-    lowest = min(all_averages)  # Student with lowest average
-
-    # Find the corresponding student names
-    best_student = [name for name, grades in gradebook.items() if grades and sum(grades) / len(grades) == highest[0]][0]
-    worst_student = [name for name, grades in gradebook.items() if grades and sum(grades) / len(grades) == lowest[0]][0]
+    best_student, best_avg = gradebook.top_student()  # Highest average
+    worst_student, worst_avg = gradebook.bottom_student()  # Lowest average
 
     # Output statistics
     print(f"Class Average: {class_avg:.2f}")
-    print(f"Top Student: {best_student} ({highest[0]:.2f})")
-    print(f"Lowest Student: {worst_student} ({lowest[0]:.2f})")
+    print(f"Top Student: {best_student} ({best_avg:.2f})")
+    print(f"Lowest Student: {worst_student} ({worst_avg:.2f})")
+
+# Bulk-import a CSV (name,grade) or JSON grade file into the gradebook
+def import_grades(gradebook):
+    from grade_analytics import load_grades, merge_into_gradebook  # NumPy is only needed for imports
+
+    path = input("Grade file (CSV or JSON): ").strip()
+    try:
+        columns = load_grades(path)
+    except (OSError, ValueError, KeyError) as error:
+        print(f"Could not read {path}: {error}")
+        return
+    students, grades, rejected = merge_into_gradebook(columns, gradebook)
+    print(f"Imported {grades} grades for {students} students.")
+    if rejected:
+        print(f"Skipped {rejected} grades outside 0-100.")
 
 # Main menu loop to interact with the gradebook
 def gradebook_menu():
-    gradebook = {}  # Dictionary to store student names and grades
+    storage = GradebookStorage(GRADEBOOK_FILE)
+    gradebook = storage.load_into(Gradebook())  # Restore grades saved by earlier runs
 
     while True:
         print("\n=== STUDENT GRADEBOOK MANAGER ===")
@@ -86,7 +236,8 @@ def gradebook_menu():
         print("2. Add Grade")
         print("3. View Student Report")
         print("4. Class Statistics")
-        print("5. Exit")
+        print("5. Import Grades")
+        print("6. Exit")
 
         choice = input("Choice: ").strip()
 
@@ -100,6 +251,9 @@ def gradebook_menu():
         elif choice == "4":
             class_statistics(gradebook)
         elif choice == "5":
+            import_grades(gradebook)
+        elif choice == "6":
+            storage.close()
             print("Exiting Gradebook Manager.")
             break
         else:
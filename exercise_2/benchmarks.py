@@ -0,0 +1,230 @@
+import argparse  # For choosing which benchmark to run
+import csv       # For the text catalog the dict inventory is built from
+import json      # For results from the catalog child processes
+import os        # For scratch file paths
+import random    # For synthetic catalogs and movements
+import subprocess  # For measuring each catalog load in a fresh process
+import sys       # Path of the current interpreter
+import tempfile  # For scratch movement files
+import threading  # For concurrent workers
+import time      # For wall-clock measurements
+
+from inventory_manager import Inventory
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Build an Inventory with num_skus synthetic items spread over a few categories
+def synthetic_inventory(num_skus, seed=0, **kwargs):
+    rng = random.Random(seed)
+    inventory = Inventory(**kwargs)
+    for i in range(num_skus):
+        inventory.add_item(f"SKU{i}", round(rng.uniform(1, 500), 2), rng.randint(0, 200), f"Category{i % 50}")
+    return inventory
+
+# Stream a movement file through the batch pipeline and check it against
+# applying every movement with update_stock in order
+def bench_movements(num_skus, num_movements, chunk_size):
+    from stock_movements import apply_movement_file, print_movement_report, read_movements
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "movements.csv")
+        with open(path, "w") as f:
+            f.write("sku,delta\n")
+            for _ in range(num_movements):
+                # ~0.1% of movements reference SKUs that do not exist
+                sku = rng.randrange(int(num_skus * 1.001))
+                f.write(f"SKU{sku},{rng.randint(-20, 20)}\n")
+
+        batch = synthetic_inventory(num_skus)
+        report = apply_movement_file(batch, path, chunk_size)
+        print_movement_report(report)
+
+        sequential = synthetic_inventory(num_skus)
+        negative = set()  # SKUs that went below zero, found one movement at a time
+        start = time.perf_counter()
+        for movement in read_movements(path):
+            if movement is not None and movement[0] in sequential:
+                if sequential.update_stock(*movement) < 0:
+                    negative.add(movement[0])
+        seconds = time.perf_counter() - start
+
+    same = all(batch[sku]["stock"] == details["stock"] for sku, details in sequential.items.items())
+    same = same and batch.total_cents == sequential.total_cents
+    same = same and batch.low_stock(20) == sequential.low_stock(20)
+    same = same and report["negative_count"] == len(negative)
+    print(f"Per-movement update_stock: {seconds:.2f}s ({num_movements / seconds:,.0f} movements/sec)")
+    print(f"Final state matches sequential updates: {same}")
+
+# One stress run: workers apply random deltas and reservations while a reader
+# takes snapshots; returns ops/sec (test_concurrent_inventory.py checks correctness)
+def _stress_run(num_skus, total_ops, workers, io_delay):
+    from concurrent_inventory import ConcurrentInventory
+
+    inventory = ConcurrentInventory()
+    initial_stock = 10 * total_ops  # Large enough that every reservation can succeed
+    for i in range(num_skus):
+        inventory.add_item(f"SKU{i}", 9.99, initial_stock, f"Category{i % 50}")
+
+    done = threading.Event()
+
+    def worker(index):
+        rng = random.Random(index)
+        for _ in range(total_ops // workers):
+            sku = f"SKU{rng.randrange(num_skus)}"
+            qty = rng.randint(1, 5)
+            if rng.random() < 0.5:
+                inventory.update_stock(sku, qty)
+            else:
+                inventory.reserve(sku, qty)
+            if io_delay:
+                time.sleep(io_delay)  # Simulated per-movement I/O outside any lock
+
+    def reader():
+        while not done.is_set():
+            inventory.snapshot()  # Readers contend for every shard lock
+            time.sleep(0.01)
+
+    threads = [threading.Thread(target=worker, args=(i,)) for i in range(workers)]
+    reader_thread = threading.Thread(target=reader)
+    reader_thread.start()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    seconds = time.perf_counter() - start
+    done.set()
+    reader_thread.join()
+    return (total_ops // workers) * workers / seconds
+
+# Throughput of the lock-striped inventory from 1 to max_workers threads
+def bench_concurrency(num_skus, total_ops, max_workers, io_delay):
+    print(f"SKUs: {num_skus:,}  Operations: {total_ops:,}  Simulated I/O per op: {io_delay * 1e6:.0f}us")
+    print(f"{'workers':>8} {'ops/sec':>12} {'scaling':>8}")
+    workers = 1
+    baseline = None
+    while workers <= max_workers:
+        rate = _stress_run(num_skus, total_ops, workers, io_delay)
+        baseline = baseline or rate
+        print(f"{workers:>8} {rate:>12,.0f} {rate / baseline:>7.1f}x")
+        workers *= 2
+
+# Deterministic (name, price_cents, stock, category) catalog records
+def synthetic_records(num_skus, seed=0):
+    rng = random.Random(seed)
+    for i in range(num_skus):
+        yield f"SKU{i}", rng.randint(100, 50_000), rng.randint(0, 200), f"Category{i % 50}"
+
+# Fill an Inventory from a name,price_cents,stock,category CSV the fastest way the
+# dict layout allows (one stock index rebuild instead of an update per item)
+def load_csv_inventory(path):
+    inventory = Inventory()
+    items = inventory.items
+    with open(path, newline="") as f:
+        for name, price_cents, stock, category in csv.reader(f):
+            price_cents, stock = int(price_cents), int(stock)
+            items[name] = {"price_cents": price_cents, "stock": stock, "category": category}
+            inventory.by_category.setdefault(category, {})[name] = None
+            inventory.total_cents += price_cents * stock
+            inventory.category_cents[category] = inventory.category_cents.get(category, 0) + price_cents * stock
+    inventory.rebuild_stock_index()
+    return inventory
+
+# Child process for the catalog benchmark: load one way, run the report queries
+# and some stock updates, print timings, memory and results as JSON
+CATALOG_RUNNER = """
+import json, random, sys, time
+sys.path.insert(0, {here!r})
+
+def rss_kib():
+    with open("/proc/self/status") as f:
+        return next(int(line.split()[1]) for line in f if line.startswith("VmRSS"))
+
+from benchmarks import load_csv_inventory
+from inventory_file import MappedInventory  # Imported (with NumPy) before timing either load
+
+before = rss_kib()
+start = time.perf_counter()
+inventory = MappedInventory({path!r}) if {mapped!r} else load_csv_inventory({path!r})
+result = {{"load": time.perf_counter() - start, "rss_load": rss_kib() - before}}
+
+start = time.perf_counter()
+result["total_cents"] = inventory.total_cents
+result["total"] = time.perf_counter() - start
+start = time.perf_counter()
+result["low_stock"] = inventory.low_stock(0)
+result["low"] = time.perf_counter() - start
+start = time.perf_counter()
+result["category"] = inventory.items_in_category("Category7")
+result["search"] = time.perf_counter() - start
+
+rng = random.Random(2)
+updates = [("SKU%d" % rng.randrange({num_skus}), rng.randint(-5, 5)) for _ in range({updates})]
+start = time.perf_counter()
+for name, qty in updates:
+    inventory.update_stock(name, qty)
+result["update"] = (time.perf_counter() - start) / len(updates)
+result["total_after"] = inventory.total_cents
+result["rss_end"] = rss_kib() - before
+if {mapped!r}:
+    inventory.close()
+print(json.dumps(result))
+"""
+
+# Open time and memory of a memory-mapped catalog vs building the dict inventory
+def bench_catalog(num_skus, updates):
+    from inventory_file import MappedInventory, write_inventory_file
+
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "catalog.csv")
+        with open(csv_path, "w", newline="") as f:
+            csv.writer(f).writerows(synthetic_records(num_skus))
+        catalog_path = os.path.join(tmp, "catalog.inv")
+        start = time.perf_counter()
+        write_inventory_file(catalog_path, synthetic_records(num_skus))
+        size = os.path.getsize(catalog_path)
+        print(f"SKUs: {num_skus:,}  Catalog file: {size / 2**20:,.1f} MiB, written in {time.perf_counter() - start:.1f}s")
+
+        results = {}
+        for label, mapped, path in (("dict from CSV", False, csv_path), ("mapped file", True, catalog_path)):
+            output = subprocess.run([sys.executable, "-c", CATALOG_RUNNER.format(
+                here=HERE, mapped=mapped, path=path, num_skus=num_skus, updates=updates)],
+                capture_output=True, text=True, check=True).stdout
+            result = results[label] = json.loads(output)
+            print(f"{label:<14} load {result['load'] * 1000:>9,.1f} ms  RSS +{result['rss_load'] / 1024:>7,.1f} MiB "
+                  f"(+{result['rss_end'] / 1024:,.1f} MiB after queries)")
+            print(f"{'':<14} total value {result['total'] * 1000:,.1f} ms, low stock {result['low'] * 1000:,.1f} ms, "
+                  f"category search {result['search'] * 1000:,.1f} ms, update_stock {result['update'] * 1e6:,.1f} us")
+
+        dict_result, mapped_result = results["dict from CSV"], results["mapped file"]
+        same = all(dict_result[key] == mapped_result[key]
+                   for key in ("total_cents", "low_stock", "category", "total_after"))
+        reopened = MappedInventory(catalog_path)
+        same = same and reopened.total_cents == dict_result["total_after"] and os.path.getsize(catalog_path) == size
+        reopened.close()
+        print(f"Results match, and stock updates persisted in place: {same}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Inventory benchmarks")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+    movements = sub.add_parser("movements", help="Batch stock-movement pipeline throughput")
+    movements.add_argument("--skus", type=int, default=50_000)
+    movements.add_argument("--movements", type=int, default=1_000_000)
+    movements.add_argument("--chunk-size", type=int, default=100_000)
+    stress = sub.add_parser("concurrency", help="Lock-striped inventory stress test")
+    stress.add_argument("--skus", type=int, default=10_000)
+    stress.add_argument("--ops", type=int, default=200_000)
+    stress.add_argument("--workers", type=int, default=8)
+    stress.add_argument("--io-delay", type=float, default=0.0, help="Seconds of simulated I/O per operation")
+    catalog = sub.add_parser("catalog", help="Memory-mapped catalog file vs building the dict inventory")
+    catalog.add_argument("--skus", type=int, default=2_000_000)
+    catalog.add_argument("--updates", type=int, default=10_000)
+    args = parser.parse_args()
+
+    if args.benchmark == "movements":
+        bench_movements(args.skus, args.movements, args.chunk_size)
+    elif args.benchmark == "concurrency":
+        bench_concurrency(args.skus, args.ops, args.workers, args.io_delay)
+    elif args.benchmark == "catalog":
+        bench_catalog(args.skus, args.updates)
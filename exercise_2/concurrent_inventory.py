@@ -0,0 +1,89 @@
+import threading  # Per-shard locks
+from contextlib import ExitStack
+from heapq import merge  # Combine per-shard low-stock lists in stock order
+
+from inventory_manager import LOW_STOCK_THRESHOLD, Inventory
+
+NUM_SHARDS = 64  # Lock stripes; items are spread over shards by hash(name)
+
+# Inventory split into independently locked shards, so workers touching
+# different SKUs rarely wait on each other. Every read-modify-write happens
+# under its shard's lock; reports lock all shards (in a fixed order) to see
+# one consistent state.
+class ConcurrentInventory:
+    def __init__(self, num_shards=NUM_SHARDS, low_stock_threshold=LOW_STOCK_THRESHOLD):
+        self.shards = [Inventory(low_stock_threshold) for _ in range(num_shards)]
+        self.locks = [threading.Lock() for _ in range(num_shards)]
+        self.low_stock_threshold = low_stock_threshold
+
+    def _shard(self, name):
+        index = hash(name) % len(self.shards)
+        return self.shards[index], self.locks[index]
+
+    def __contains__(self, name):
+        shard, lock = self._shard(name)
+        with lock:
+            return name in shard
+
+    # Add a new item priced in dollars; returns False if the name is already taken
+    def add_item(self, name, price, stock, category):
+        shard, lock = self._shard(name)
+        with lock:
+            return shard.add_item(name, price, stock, category)
+
+    # Atomically apply a stock change and return the new level
+    def update_stock(self, name, qty):
+        shard, lock = self._shard(name)
+        with lock:
+            return shard.update_stock(name, qty)
+
+    # Atomically take qty units if that many are in stock; returns True on success
+    def reserve(self, name, qty):
+        shard, lock = self._shard(name)
+        with lock:
+            if shard[name]["stock"] < qty:
+                return False
+            shard.update_stock(name, -qty)
+            return True
+
+    # Current stock of one item
+    def stock(self, name):
+        shard, lock = self._shard(name)
+        with lock:
+            return shard[name]["stock"]
+
+    # Hold every shard lock at once; always acquired in shard order to avoid deadlock
+    def _locked(self):
+        stack = ExitStack()
+        for lock in self.locks:
+            stack.enter_context(lock)
+        return stack
+
+    # Consistent total value in cents (O(shards), no item scan)
+    @property
+    def total_cents(self):
+        with self._locked():
+            return sum(shard.total_cents for shard in self.shards)
+
+    # Consistent list of (name, stock) with stock <= threshold, lowest first
+    def low_stock(self, threshold=None):
+        if threshold is None:
+            threshold = self.low_stock_threshold
+        with self._locked():
+            per_shard = [[(shard[name]["stock"], name) for name in shard.low_stock(threshold)] for shard in self.shards]
+        return [(name, stock) for stock, name in merge(*per_shard)]
+
+    # Point-in-time copy as a plain Inventory, usable with the menu report functions
+    def snapshot(self):
+        copy = Inventory(self.low_stock_threshold)
+        with self._locked():
+            for shard in self.shards:
+                for name, details in shard.items.items():
+                    copy.items[name] = dict(details)
+                for category, cents in shard.category_cents.items():
+                    copy.category_cents[category] = copy.category_cents.get(category, 0) + cents
+                copy.total_cents += shard.total_cents
+        for name, details in copy.items.items():
+            copy.by_category.setdefault(details["category"], {})[name] = None
+        copy.rebuild_stock_index()
+        return copy
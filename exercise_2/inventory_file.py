@@ -0,0 +1,291 @@
+import hashlib  # Stable 64-bit name hashes for the lookup index
+import json     # Category table
+import mmap     # Memory-mapped catalog
+import os       # Atomic replace and file checks
+import struct   # File header
+import tempfile  # Spill file for names while writing
+from heapq import merge  # Combine file and newly added low-stock lists in stock order
+from itertools import islice
+
+import numpy as np  # Vectorized scans and in-place updates over the mapped records
+
+from inventory_manager import LOW_STOCK_THRESHOLD, Inventory
+
+# File layout (all little-endian, every section 8-byte aligned except names)
+# - header:   magic, record size, record count, and the offsets of the sections below
+# - records:  one fixed-width RECORD per SKU, in the order items were added
+# - index:    record count uint64 name hashes, sorted, then the matching uint32 record numbers
+# - names:    UTF-8 item names, referenced by (offset, length) from each record
+# - metadata: JSON {"categories": [...]}, referenced by category id from each record
+MAGIC = b"INV1"
+HEADER = struct.Struct("<4sIQQQQ")  # magic, record size, count, index, names, metadata offsets
+RECORD = np.dtype([("price_cents", "<i8"), ("stock", "<i8"), ("category", "<u4"),
+                   ("name_length", "<u4"), ("name_offset", "<u8")])
+WRITE_BATCH = 65536  # Records converted to the fixed-width layout at a time
+COPY_BLOCK = 1 << 20  # Bytes per read when copying the names into the file
+
+def name_hash(name):
+    return int.from_bytes(hashlib.blake2b(name.encode("utf-8"), digest_size=8).digest(), "little")
+
+# Lists of up to size items from an iterable
+def _chunks(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+# Write a catalog file from (name, price_cents, stock, category) records, streamed:
+# records go straight to the file, names to a spill file appended afterwards
+def write_inventory_file(path, records):
+    tmp_path = path + ".tmp"
+    categories, category_ids = [], {}
+    hashes = bytearray()  # 8-byte little-endian name hashes, in record order
+    with open(tmp_path, "wb") as f, tempfile.TemporaryFile() as names:
+        f.write(b"\0" * HEADER.size)  # Filled in once the sizes are known
+        names_size = 0
+        for chunk in _chunks(records, WRITE_BATCH):
+            batch = np.zeros(len(chunk), dtype=RECORD)
+            encoded = [name.encode("utf-8") for name, _, _, _ in chunk]
+            lengths = np.fromiter(map(len, encoded), dtype=np.uint32, count=len(chunk))
+            batch["price_cents"] = [price_cents for _, price_cents, _, _ in chunk]
+            batch["stock"] = [stock for _, _, stock, _ in chunk]
+            for category in {category for _, _, _, category in chunk} - category_ids.keys():
+                category_ids[category] = len(categories)
+                categories.append(category)
+            batch["category"] = [category_ids[category] for _, _, _, category in chunk]
+            batch["name_length"] = lengths
+            batch["name_offset"] = names_size + np.cumsum(lengths, dtype=np.uint64) - lengths
+            names_size += int(lengths.sum())
+            hashes += b"".join([hashlib.blake2b(name, digest_size=8).digest() for name in encoded])
+            f.write(batch.tobytes())
+            names.write(b"".join(encoded))
+
+        hash_column = np.frombuffer(hashes, dtype="<u8")
+        order = np.argsort(hash_column, kind="stable")
+        index_offset = f.tell()
+        f.write(hash_column[order].tobytes())
+        f.write(order.astype(np.uint32).tobytes())
+        names_offset = f.tell()
+        names.seek(0)
+        while True:
+            block = names.read(COPY_BLOCK)
+            if not block:
+                break
+            f.write(block)
+        metadata_offset = f.tell()
+        f.write(json.dumps({"categories": categories}).encode("utf-8"))
+        f.seek(0)
+        f.write(HEADER.pack(MAGIC, RECORD.itemsize, len(hash_column), index_offset, names_offset, metadata_offset))
+    os.replace(tmp_path, path)
+
+# Write an in-memory Inventory as a catalog file
+def save_inventory(inventory, path):
+    write_inventory_file(path, ((name, details["price_cents"], details["stock"], details["category"])
+                                for name, details in inventory.items.items()))
+
+# Read-only mapping of item name -> {"price_cents", "stock", "category"} over a
+# MappedInventory, so code written against Inventory.items works unchanged
+class MappedItems:
+    def __init__(self, inventory):
+        self.inventory = inventory
+
+    def __len__(self):
+        return len(self.inventory)
+
+    def __contains__(self, name):
+        return name in self.inventory
+
+    def __getitem__(self, name):
+        return self.inventory[name]
+
+    def __iter__(self):
+        return iter(self.inventory.names())
+
+    def get(self, name, default=None):
+        return self.inventory[name] if name in self.inventory else default
+
+    def items(self):
+        return ((name, {"price_cents": price_cents, "stock": stock, "category": category})
+                for name, price_cents, stock, category in self.inventory.iter_records())
+
+# Inventory backed by a memory-mapped catalog file. Opening maps the file and
+# reads only the header and category table; records are paged in on use.
+# Stock changes are written into the mapped records in place (flush() or
+# close() forces them to disk). Items added after opening live in a small
+# in-memory Inventory and are written into the file by close().
+class MappedInventory:
+    def __init__(self, path, low_stock_threshold=LOW_STOCK_THRESHOLD):
+        self.path = path
+        self.low_stock_threshold = low_stock_threshold
+        self.added = Inventory(low_stock_threshold)  # Items added since the file was written
+        self.positions = {}  # Name -> record number, for names already looked up
+        self._total_cents = None  # Computed on first use, then maintained
+        self._category_cents = None
+        self.items = MappedItems(self)
+        self._open()
+
+    def _open(self):
+        self.file = open(self.path, "r+b")
+        self.mm = mmap.mmap(self.file.fileno(), 0)
+        magic, record_size, count, index_offset, names_offset, metadata_offset = HEADER.unpack_from(self.mm)
+        if magic != MAGIC or record_size != RECORD.itemsize:
+            raise ValueError(f"{self.path} is not an inventory catalog")
+        self.records = np.frombuffer(self.mm, dtype=RECORD, count=count, offset=HEADER.size)
+        self.stock = self.records["stock"]  # Writable views into the mapping
+        self.hashes = np.frombuffer(self.mm, dtype=np.uint64, count=count, offset=index_offset)
+        self.record_numbers = np.frombuffer(self.mm, dtype=np.uint32, count=count, offset=index_offset + 8 * count)
+        self.names_offset = names_offset
+        self.categories = json.loads(self.mm[metadata_offset:])["categories"]
+        self.category_index = {category: category_id for category_id, category in enumerate(self.categories)}
+
+    def __len__(self):
+        return len(self.records) + len(self.added)
+
+    def _name(self, position):
+        record = self.records[position]
+        start = self.names_offset + int(record["name_offset"])
+        return self.mm[start:start + int(record["name_length"])].decode("utf-8")
+
+    # Names for an array (or slice) of record numbers
+    def _names(self, positions):
+        starts = self.records["name_offset"][positions] + self.names_offset
+        ends = starts + self.records["name_length"][positions]
+        mm = self.mm
+        return [mm[start:end].decode("utf-8") for start, end in zip(starts.tolist(), ends.tolist())]
+
+    # (name, price_cents, stock, category) for every item, file records first
+    def iter_records(self):
+        categories = self.categories
+        for first in range(0, len(self.records), WRITE_BATCH):
+            window = slice(first, first + WRITE_BATCH)
+            records = self.records[window]
+            yield from zip(self._names(window), records["price_cents"].tolist(), records["stock"].tolist(),
+                           [categories[category_id] for category_id in records["category"].tolist()])
+        for name, details in self.added.items.items():
+            yield name, details["price_cents"], details["stock"], details["category"]
+
+    # Record number of a name in the file, or None; binary search of the hash index
+    def _position(self, name):
+        position = self.positions.get(name)
+        if position is None:
+            key = np.uint64(name_hash(name))
+            slot = int(np.searchsorted(self.hashes, key))
+            while slot < len(self.hashes) and self.hashes[slot] == key:
+                candidate = int(self.record_numbers[slot])
+                if self._name(candidate) == name:
+                    position = self.positions[name] = candidate
+                    break
+                slot += 1  # Hash collision
+        return position
+
+    def __contains__(self, name):
+        return self._position(name) is not None or name in self.added
+
+    def __getitem__(self, name):
+        position = self._position(name)
+        if position is None:
+            return self.added[name]
+        record = self.records[position]
+        return {"price_cents": int(record["price_cents"]), "stock": int(record["stock"]),
+                "category": self.categories[int(record["category"])]}
+
+    # Item names in catalog order, then the ones added since opening
+    def names(self):
+        for name, _, _, _ in self.iter_records():
+            yield name
+
+    # Add a new item priced in dollars; returns False if the name is already taken
+    def add_item(self, name, price, stock, category):
+        if self._position(name) is not None or not self.added.add_item(name, price, stock, category):
+            return False
+        self._add_value(category, self.added[name]["price_cents"] * stock)
+        return True
+
+    # Apply a stock change (positive or negative) in place and return the new level
+    def update_stock(self, name, qty):
+        position = self._position(name)
+        if position is None:
+            stock = self.added.update_stock(name, qty)
+            details = self.added[name]
+            self._add_value(details["category"], details["price_cents"] * qty)
+            return stock
+        self.stock[position] += qty
+        record = self.records[position]
+        self._add_value(self.categories[int(record["category"])], int(record["price_cents"]) * qty)
+        return int(record["stock"])
+
+    # Apply {name: qty} stock changes at once
+    def apply_stock_deltas(self, deltas):
+        for name, qty in deltas.items():
+            self.update_stock(name, qty)
+
+    def _add_value(self, category, cents):
+        if self._total_cents is not None:
+            self._total_cents += cents
+            self._category_cents[category] = self._category_cents.get(category, 0) + cents
+
+    # Total and per-category value in cents: one vectorized pass over the mapped
+    # records on first use, then kept up to date by update_stock and add_item
+    def _compute_values(self):
+        values = self.records["price_cents"] * self.stock  # int64: exact below $92 quadrillion
+        # Float64 sums of integer cents are exact up to 2**53 cents per category
+        by_category = np.rint(np.bincount(self.records["category"], weights=values,
+                                          minlength=len(self.categories))).astype(np.int64)
+        self._category_cents = {category: int(cents) for category, cents in zip(self.categories, by_category)}
+        self._total_cents = int(values.sum())
+        for category, cents in self.added.category_cents.items():
+            self._category_cents[category] = self._category_cents.get(category, 0) + cents
+        self._total_cents += self.added.total_cents
+
+    @property
+    def total_cents(self):
+        if self._total_cents is None:
+            self._compute_values()
+        return self._total_cents
+
+    @property
+    def category_cents(self):
+        if self._category_cents is None:
+            self._compute_values()
+        return self._category_cents
+
+    # Names of the items in a category, in the order they were added
+    def items_in_category(self, category):
+        names = []
+        category_id = self.category_index.get(category)
+        if category_id is not None:
+            names = self._names(np.flatnonzero(self.records["category"] == category_id))
+        return names + self.added.items_in_category(category)
+
+    # Names of items with stock <= threshold, lowest stock first
+    def low_stock(self, threshold=None):
+        if threshold is None:
+            threshold = self.low_stock_threshold
+        positions = np.flatnonzero(self.stock <= threshold)
+        in_file = sorted(zip(self.stock[positions].tolist(), self._names(positions)))
+        added = [(self.added[name]["stock"], name) for name in self.added.low_stock(threshold)]
+        return [name for _, name in merge(in_file, added)]
+
+    # Force in-place stock changes to disk
+    def flush(self):
+        self.mm.flush()
+
+    # Flush, write newly added items into the file, and unmap it
+    def close(self):
+        if self.mm is None:
+            return
+        self.flush()
+        if len(self.added):
+            write_inventory_file(self.path, self.iter_records())  # Reads the old mapping while writing the new file
+        self.records = self.stock = self.hashes = self.record_numbers = None  # Release views before unmapping
+        self.mm.close()
+        self.file.close()
+        self.mm = None
+
+# Open a catalog file, creating an empty one if it does not exist yet
+def open_inventory(path, low_stock_threshold=LOW_STOCK_THRESHOLD):
+    if not os.path.exists(path):
+        write_inventory_file(path, [])
+    return MappedInventory(path, low_stock_threshold)
@@ -1,6 +1,168 @@
-# Function to format currency into $XX.XX style
-def format_currency(amount):
-    return f"${amount:.2f}"
+import argparse  # For the --verify and --file command-line flags
+from heapq import heapify, heappush  # Stock levels for low-stock queries
+from decimal import ROUND_HALF_UP, Decimal  # Exact dollars -> cents conversion
+
+from stock_movements import apply_movement_file, print_movement_report
+
+LOW_STOCK_THRESHOLD = 5  # Default stock level that triggers a low-stock alert
+STALE_LEVEL_SLACK = 64  # Emptied stock levels tolerated in the level heap before a rebuild
+
+# Format an integer number of cents as $XX.XX without going through float
+def format_cents(cents):
+    sign = "-" if cents < 0 else ""
+    dollars, cents = divmod(abs(cents), 100)
+    return f"${sign}{dollars}.{cents:02d}"
+
+# Convert a dollar amount to integer cents, rounding half-cents up;
+# inf and nan raise ValueError like any other invalid price
+def to_cents(amount):
+    d = Decimal(str(amount))
+    if not d.is_finite():
+        raise ValueError(f"Price must be a finite number, not {amount}")
+    return int((d * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+# Inventory with secondary indexes kept up to date on every change, so
+# category searches and low-stock checks only touch the matching items
+class Inventory:
+    def __init__(self, low_stock_threshold=LOW_STOCK_THRESHOLD, verify=False):
+        self.items = {}  # Item name -> {"price_cents": int, "stock": int, "category": str}
+        self.by_category = {}  # Category -> {item name: None} (insertion-ordered set)
+        self.by_stock = {}  # Stock level -> {item name: None} for every level some item has
+        self.stock_levels = []  # Min-heap of stock levels; may still hold emptied or repeated levels
+        self.low_stock_threshold = low_stock_threshold
+        self.total_cents = 0  # Maintained sum of price * stock over all items
+        self.category_cents = {}  # Category -> maintained subtotal in cents
+        self.verify = verify  # Cross-check the maintained totals after every change
+
+    def __contains__(self, name):
+        return name in self.items
+
+    def __len__(self):
+        return len(self.items)
+
+    def __getitem__(self, name):
+        return self.items[name]
+
+    # Add a new item priced in dollars; returns False if the name is already taken
+    def add_item(self, name, price, stock, category):
+        if name in self.items:
+            return False
+        price_cents = to_cents(price)
+        self.items[name] = {"price_cents": price_cents, "stock": stock, "category": category}
+        self.by_category.setdefault(category, {})[name] = None
+        self._index_stock(name, stock)
+        self._add_value(category, price_cents * stock)
+        return True
+
+    # Apply a stock change (positive or negative) and return the new level
+    def update_stock(self, name, qty):
+        details = self.items[name]
+        self._move_stock(name, details["stock"], details["stock"] + qty)
+        details["stock"] += qty
+        self._add_value(details["category"], details["price_cents"] * qty)
+        return details["stock"]
+
+    # Apply {name: qty} stock changes at once, folding the value changes into
+    # the totals once per category
+    def apply_stock_deltas(self, deltas):
+        value_changes = {}  # Category -> cents
+        for name, qty in deltas.items():
+            details = self.items[name]
+            self._move_stock(name, details["stock"], details["stock"] + qty)
+            details["stock"] += qty
+            category = details["category"]
+            value_changes[category] = value_changes.get(category, 0) + details["price_cents"] * qty
+        for category, cents in value_changes.items():
+            self._fold_value(category, cents)
+        self._verify()  # Only once every total is updated
+
+    # Stock index updates: O(1) dict moves, plus an O(log n) heap push when a
+    # stock level gets its first item. Emptied levels stay in the heap until it
+    # holds more than twice the live levels, then it is rebuilt (amortized O(1)).
+    def _index_stock(self, name, stock):
+        bucket = self.by_stock.get(stock)
+        if bucket is None:
+            bucket = self.by_stock[stock] = {}
+            heappush(self.stock_levels, stock)
+            if len(self.stock_levels) > 2 * len(self.by_stock) + STALE_LEVEL_SLACK:
+                self.stock_levels = list(self.by_stock)
+                heapify(self.stock_levels)
+        bucket[name] = None
+
+    def _move_stock(self, name, old_stock, new_stock):
+        bucket = self.by_stock[old_stock]
+        del bucket[name]
+        if not bucket:
+            del self.by_stock[old_stock]
+        self._index_stock(name, new_stock)
+
+    # Rebuild the stock index from the items, e.g. after filling items directly
+    def rebuild_stock_index(self):
+        self.by_stock = {}
+        for name, details in self.items.items():
+            self.by_stock.setdefault(details["stock"], {})[name] = None
+        self.stock_levels = list(self.by_stock)
+        heapify(self.stock_levels)
+
+    def _add_value(self, category, cents):
+        self._fold_value(category, cents)
+        self._verify()
+
+    def _fold_value(self, category, cents):
+        self.total_cents += cents
+        self.category_cents[category] = self.category_cents.get(category, 0) + cents
+
+    def _verify(self):
+        if self.verify:
+            problems = self.check_consistency()
+            if problems:
+                raise RuntimeError("Inventory totals out of sync: " + "; ".join(problems))
+
+    # Full O(n) recomputation of the total and per-category values, in cents
+    def recompute_totals(self):
+        total = 0
+        by_category = {}
+        for details in self.items.values():
+            value = details["price_cents"] * details["stock"]
+            total += value
+            by_category[details["category"]] = by_category.get(details["category"], 0) + value
+        return total, by_category
+
+    # Compare the maintained totals with a full recomputation; returns mismatches
+    def check_consistency(self):
+        total, by_category = self.recompute_totals()
+        problems = []
+        if total != self.total_cents:
+            problems.append(f"total {self.total_cents} != {total}")
+        for category in by_category.keys() | self.category_cents.keys():
+            expected = by_category.get(category, 0)
+            actual = self.category_cents.get(category, 0)
+            if expected != actual:
+                problems.append(f"{category} {actual} != {expected}")
+        return problems
+
+    # Names of the items in a category, in the order they were added
+    def items_in_category(self, category):
+        return list(self.by_category.get(category, ()))
+
+    # Names of items with stock <= threshold, lowest stock first (then by name).
+    # Only heap entries <= threshold are visited: a heap node's children are never
+    # smaller than it, so the walk stops at the first level above the threshold.
+    def low_stock(self, threshold=None):
+        if threshold is None:
+            threshold = self.low_stock_threshold
+        heap = self.stock_levels
+        levels = set()
+        pending = [0] if heap else []
+        while pending:
+            node = pending.pop()
+            if heap[node] <= threshold:
+                levels.add(heap[node])
+                pending.extend(child for child in (2 * node + 1, 2 * node + 2) if child < len(heap))
+        names = []
+        for level in sorted(levels):
+            names.extend(sorted(self.by_stock.get(level, ())))  # Emptied levels have no bucket
+        return names
 
 # Add a new item to inventory
 def add_item(inventory):
@@ -12,7 +174,7 @@ def add_item(inventory):
         price = float(input("Price: "))
         stock = int(input("Stock: "))
         category = input("Category: ").strip()
-        inventory[name] = {"price": price, "stock": stock, "category": category}
+        inventory.add_item(name, price, stock, category)
         print(f"{name} added successfully.")
     except ValueError:
         print("Invalid input.")
@@ -25,27 +187,27 @@ def update_stock(inventory):
         return
     try:
         qty = int(input("Add (+) or Remove (-) stock: "))
-        inventory[name]["stock"] += qty  # Update stock count
-        print(f"Updated stock for {name}: {inventory[name]['stock']} units.")
+        stock = inventory.update_stock(name, qty)  # Update stock count and index
+        print(f"Updated stock for {name}: {stock} units.")
     except ValueError:
         print("Invalid input.")
 
 # Search for items by category
 def search_by_category(inventory):
     category = input("Category to search: ").strip()
-    found = [name for name, details in inventory.items() if details["category"] == category]
+    found = inventory.items_in_category(category)  # Index lookup, no full scan
     if not found:
         print("No items found in this category.")
     else:
-        print(f"Found {len(found)} items in {category}:")
+        print(f"Found {len(found)} items in {category} (worth {format_cents(inventory.category_cents[category])}):")
         for item in found:
-            price = format_currency(inventory[item]["price"])
+            price = format_cents(inventory[item]["price_cents"])
             stock = inventory[item]["stock"]
             print(f"• {item} - {price} ({stock} in stock)")
 
-# Show low stock items (stock <= 5)
-def check_low_stock(inventory):
-    low_stock_items = [name for name, details in inventory.items() if details["stock"] <= 5]
+# Show low stock items (stock <= the inventory's threshold unless one is given)
+def check_low_stock(inventory, threshold=None):
+    low_stock_items = inventory.low_stock(threshold)
     if not low_stock_items:
         print("No low stock items.")
     else:
@@ -53,20 +215,43 @@ def check_low_stock(inventory):
         for item in low_stock_items:
             print(f"- {item} ({inventory[item]['stock']} units remaining)")
 
-# Calculate total inventory value
+# Apply a CSV / JSON-lines file of (sku, delta) stock movements in bulk
+def import_stock_movements(inventory):
+    path = input("Movement file (CSV or JSONL): ").strip()
+    try:
+        report = apply_movement_file(inventory, path)
+    except OSError as error:
+        print(f"Could not read {path}: {error}")
+        return
+    print_movement_report(report)
+
+# Change the stock level that counts as "low"
+def set_low_stock_threshold(inventory):
+    try:
+        inventory.low_stock_threshold = int(input("Low stock threshold: "))
+        print(f"Low stock threshold set to {inventory.low_stock_threshold} units.")
+    except ValueError:
+        print("Invalid input.")
+
+# Show total inventory value (maintained incrementally, no rescan)
 def total_inventory_value(inventory):
-    total = sum(details["price"] * details["stock"] for details in inventory.values())
-    print(f"Current Inventory Value: {format_currency(total)}")
+    print(f"Current Inventory Value: {format_cents(inventory.total_cents)}")
+
+# Main interactive menu loop; verify=True cross-checks totals after each change.
+# With a path, the inventory is a memory-mapped catalog file kept across runs.
+def inventory_menu(verify=False, path=None):
+    if path is not None:
+        from inventory_file import open_inventory  # NumPy is only needed for catalog files
 
-# Main interactive menu loop
-def inventory_menu():
-    inventory = {}  # Nested dictionary to hold inventory data
+        inventory = open_inventory(path)  # Stock changes are written into the file in place
+    else:
+        inventory = Inventory(verify=verify)  # Item dictionary plus indexes and running totals
 
     while True:
         print("\n=== SMART INVENTORY MANAGER ===")
         total_inventory_value(inventory)
         check_low_stock(inventory)
-        print("\n1. Add Item\n2. Update Stock\n3. Search by Category\n4. Exit")
+        print("\n1. Add Item\n2. Update Stock\n3. Search by Category\n4. Set Low Stock Threshold\n5. Import Stock Movements\n6. Exit")
 
         choice = input("Choose option: ").strip()
         if choice == "1":
@@ -76,10 +261,22 @@ def inventory_menu():
         elif choice == "3":
             search_by_category(inventory)
         elif choice == "4":
+            set_low_stock_threshold(inventory)
+        elif choice == "5":
+            import_stock_movements(inventory)
+        elif choice == "6":
+            if path is not None:
+                inventory.close()  # Flushes stock changes and writes newly added items
             print("Exiting Inventory Manager.")
             break
         else:
             print("Invalid choice.")
 
 if __name__ == "__main__":
-    inventory_menu()
+    parser = argparse.ArgumentParser(description="Smart inventory manager")
+    storage = parser.add_mutually_exclusive_group()  # MappedInventory has no verify mode
+    storage.add_argument("--verify", action="store_true",
+                         help="Compare the maintained totals with a full recomputation after every change")
+    storage.add_argument("--file", help="Memory-mapped catalog file to keep the inventory in")
+    args = parser.parse_args()
+    inventory_menu(verify=args.verify, path=args.file)
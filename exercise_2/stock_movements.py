@@ -0,0 +1,112 @@
+import csv   # For CSV movement files
+import json  # For JSON-lines movement files
+import time  # For throughput reporting
+from itertools import islice
+
+CHUNK_SIZE = 100_000  # Movements grouped and applied together
+MAX_REPORTED = 20  # Distinct SKUs listed per problem type in the report
+
+# Stream (sku, delta) pairs from a CSV ("sku,delta", optional header) or
+# JSON-lines ({"sku": ..., "delta": ...}) file; malformed rows yield None
+def read_movements(path):
+    with open(path, newline="") as f:
+        if path.lower().endswith((".jsonl", ".ndjson")):
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    yield record["sku"], int(record["delta"])
+                except (ValueError, KeyError, TypeError):
+                    yield None
+        else:
+            for line_no, row in enumerate(csv.reader(f)):
+                try:
+                    yield row[0].strip(), int(row[1])
+                except (ValueError, IndexError):
+                    if line_no:  # A bad first row is treated as a header
+                        yield None
+
+# Split a stream into lists of at most size items
+def chunked(iterable, size):
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, size))
+        if not chunk:
+            return
+        yield chunk
+
+# Collapse a chunk into {sku: [net delta, lowest running delta, movements]};
+# the running minimum spots stock dipping below zero mid-chunk without replay
+def group_deltas(chunk):
+    grouped = {}
+    for sku, delta in chunk:
+        entry = grouped.get(sku)
+        if entry is None:
+            grouped[sku] = [delta, delta, 1]
+        else:
+            entry[0] += delta
+            entry[2] += 1
+            if entry[0] < entry[1]:
+                entry[1] = entry[0]
+    return grouped
+
+# Remember a problem SKU, keeping the report bounded
+def _note(problems, sku, value):
+    if sku in problems or len(problems) < MAX_REPORTED:
+        problems[sku] = value
+
+# Apply a movement file to an Inventory; the final stock levels match applying
+# each movement through update_stock in order. negative_count is the number of
+# distinct SKUs whose stock dropped below zero at any point, however many times
+# it did; "negative" lists up to MAX_REPORTED of them with the lowest level reached.
+def apply_movement_file(inventory, path, chunk_size=CHUNK_SIZE):
+    report = {
+        "movements": 0, "applied": 0, "malformed": 0, "skus_updated": 0,
+        "unknown_count": 0, "unknown": {}, "negative_count": 0, "negative": {},
+    }
+    negative = set()  # Every SKU that went below zero so far
+    items = inventory.items
+    start = time.perf_counter()
+    for chunk in chunked(read_movements(path), chunk_size):
+        report["movements"] += len(chunk)
+        valid = [movement for movement in chunk if movement is not None]
+        report["malformed"] += len(chunk) - len(valid)
+
+        deltas = {}
+        for sku, (net, lowest, count) in group_deltas(valid).items():
+            details = items.get(sku)
+            if details is None:
+                report["unknown_count"] += count
+                _note(report["unknown"], sku, report["unknown"].get(sku, 0) + count)
+                continue
+            stock_before = details["stock"]
+            if stock_before + lowest < 0:
+                negative.add(sku)
+                _note(report["negative"], sku, min(stock_before + lowest, report["negative"].get(sku, 0)))
+            if net:
+                deltas[sku] = net
+            report["skus_updated"] += 1
+        inventory.apply_stock_deltas(deltas)
+        report["applied"] = report["movements"] - report["malformed"] - report["unknown_count"]
+        report["negative_count"] = len(negative)
+
+    report["seconds"] = time.perf_counter() - start
+    return report
+
+# Print a bulk summary of an apply_movement_file run
+def print_movement_report(report):
+    seconds = report["seconds"]
+    rate = report["movements"] / seconds if seconds else 0
+    print(f"Processed {report['movements']:,} movements in {seconds:.2f}s ({rate:,.0f} movements/sec)")
+    print(f"Applied: {report['applied']:,} across {report['skus_updated']:,} SKU updates")
+    if report["malformed"]:
+        print(f"Skipped {report['malformed']:,} malformed rows")
+    if report["unknown_count"]:
+        print(f"⚠️ {report['unknown_count']:,} movements for unknown SKUs:")
+        for sku, count in report["unknown"].items():
+            print(f"- {sku} ({count} movements)")
+    if report["negative_count"]:
+        print(f"⚠️ {report['negative_count']:,} SKUs dropped below zero stock:")
+        for sku, lowest in report["negative"].items():
+            print(f"- {sku} (dropped to {lowest} units)")
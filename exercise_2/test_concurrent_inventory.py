@@ -0,0 +1,76 @@
+import random     # Deterministic per-thread operation streams
+import sys        # Thread switch interval
+import threading  # Concurrent workers
+import unittest
+
+from concurrent_inventory import ConcurrentInventory
+
+NUM_SKUS = 20  # Few SKUs, so threads keep contending for the same shards
+WORKERS = 8
+OPS_PER_WORKER = 20_000
+PRICE_CENTS = 999
+
+# Threads hammer update_stock and reserve on a handful of SKUs; afterwards every
+# SKU must equal its start value plus each thread's successful changes, and the
+# running totals must equal the items they summarize
+class LostUpdateTest(unittest.TestCase):
+    def setUp(self):
+        self.switch_interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)  # Switch threads as often as possible to expose races
+
+    def tearDown(self):
+        sys.setswitchinterval(self.switch_interval)
+
+    def test_no_updates_lost(self):
+        inventory = ConcurrentInventory(num_shards=4)
+        initial_stock = 50  # Low, so some reservations fail and must change nothing
+        for i in range(NUM_SKUS):
+            inventory.add_item(f"SKU{i}", PRICE_CENTS / 100, initial_stock, f"Category{i % 3}")
+        applied = [dict() for _ in range(WORKERS)]  # Per-worker net change per SKU
+        snapshot_problems = []
+        errors = []  # Exceptions raised in worker threads
+        done = threading.Event()
+
+        def worker(index):
+            rng = random.Random(index)
+            changes = applied[index]
+            try:
+                for _ in range(OPS_PER_WORKER):
+                    sku = f"SKU{rng.randrange(NUM_SKUS)}"
+                    qty = rng.randint(1, 5)
+                    if rng.random() < 0.5:
+                        inventory.update_stock(sku, qty)
+                        changes[sku] = changes.get(sku, 0) + qty
+                    elif inventory.reserve(sku, qty):
+                        changes[sku] = changes.get(sku, 0) - qty
+            except Exception as error:
+                errors.append(error)
+
+        def reader():
+            while not done.is_set():
+                snapshot_problems.extend(inventory.snapshot().check_consistency())
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(WORKERS)]
+        reader_thread = threading.Thread(target=reader)
+        reader_thread.start()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        done.set()
+        reader_thread.join()
+
+        self.assertEqual(errors, [])
+        expected_total = 0
+        for i in range(NUM_SKUS):
+            sku = f"SKU{i}"
+            expected = initial_stock + sum(changes.get(sku, 0) for changes in applied)
+            self.assertEqual(inventory.stock(sku), expected, sku)
+            self.assertGreaterEqual(inventory.stock(sku), 0, sku)  # Reservations never oversell
+            expected_total += expected * PRICE_CENTS
+        self.assertEqual(inventory.total_cents, expected_total)
+        self.assertEqual(snapshot_problems, [])
+        self.assertEqual(inventory.snapshot().check_consistency(), [])
+
+if __name__ == "__main__":
+    unittest.main()
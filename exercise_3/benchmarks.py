@@ -0,0 +1,166 @@
+import argparse  # For choosing which benchmark to run
+import os        # For CPU count and scratch file paths
+import re        # For the legacy per-check regex baseline
+import random    # For synthetic password lists
+import string    # For synthetic password alphabets
+import tempfile  # For the synthetic password file
+import time      # For wall-clock measurements
+
+from password_manager import COMMON_PASSWORDS
+
+ALPHABET = string.ascii_letters + string.digits + "!@#$%^&*-_."
+
+# Synthetic credential dump: mostly random passwords plus some common ones
+def synthetic_passwords(count, seed=0):
+    rng = random.Random(seed)
+    passwords = []
+    for _ in range(count):
+        if rng.random() < 0.05:
+            passwords.append(rng.choice(COMMON_PASSWORDS))
+        else:
+            passwords.append("".join(rng.choices(ALPHABET, k=rng.randint(4, 16))))
+    return passwords
+
+# The original analyze_password (four regex searches, list scan, strings for
+# every check), kept as the baseline for the bulk audit benchmark
+def legacy_analyze_password(password):
+    score = 0
+    results = []
+    suggestions = []
+    checks = [
+        (len(password) >= 8, "✅ Length requirement (8+ chars)", "❌ Length is less than 8 characters", "Use at least 8 characters"),
+        (re.search(r'[A-Z]', password), "✅ Contains uppercase letters", "❌ Missing uppercase letters", "Include uppercase letters"),
+        (re.search(r'[a-z]', password), "✅ Contains lowercase letters", "❌ Missing lowercase letters", "Include lowercase letters"),
+        (re.search(r'\d', password), "✅ Contains numbers", "❌ Missing numbers", "Include at least one number"),
+        (re.search(r'[!@#$%^&*]', password), "✅ Contains special characters", "❌ Missing special characters", "Add characters like !@#$%^&*"),
+        (password.lower() not in COMMON_PASSWORDS, "✅ Not a common password", "❌ Common password detected", "Avoid using common passwords"),
+    ]
+    for passed, ok, failed, suggestion in checks:
+        if passed:
+            score += 20
+            results.append(ok)
+        else:
+            results.append(failed)
+            suggestions.append(suggestion)
+    return score, results, suggestions
+
+# Passwords/sec of analyze_many vs calling analyze_password per password
+def bench_analyze(count):
+    from password_manager import analyze_many, analyze_password, describe
+
+    passwords = synthetic_passwords(count)
+
+    start = time.perf_counter()
+    expected = [legacy_analyze_password(password) for password in passwords]
+    legacy = time.perf_counter() - start
+
+    start = time.perf_counter()
+    reports = [analyze_password(password) for password in passwords]
+    single = time.perf_counter() - start
+
+    start = time.perf_counter()
+    masks = analyze_many(passwords)
+    bulk = time.perf_counter() - start
+
+    # Same score, results and suggestions as the original checks (strength is
+    # derived from the score), with the strings built on demand
+    def verdicts(reports):
+        return [(score, results, suggestions) for score, _, results, suggestions in reports]
+    assert verdicts(reports) == expected
+    assert verdicts(describe(mask) for mask in masks) == expected
+    edge_cases = ["", "Ω", "PASSWORD", "Pässwörd1!", "١٢٣abcDEF!", "ＡＢＣdef12#", "Admin", "pass word*9X"]
+    assert verdicts(map(analyze_password, edge_cases)) == list(map(legacy_analyze_password, edge_cases))
+    print(f"Passwords: {count:,}")
+    print(f"{'original checks':<18} {legacy:>6.2f}s {count / legacy:>12,.0f} passwords/sec")
+    print(f"{'analyze_password':<18} {single:>6.2f}s {count / single:>12,.0f} passwords/sec")
+    print(f"{'analyze_many':<18} {bulk:>6.2f}s {count / bulk:>12,.0f} passwords/sec ({legacy / bulk:.1f}x original)")
+
+# Audit a synthetic password file with 1, 2, 4, ... worker processes
+def bench_audit(lines, max_workers):
+    from password_audit import audit_stream
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "passwords.txt")
+        with open(path, "w") as f:
+            batch = 100_000
+            for offset in range(0, lines, batch):
+                f.write("\n".join(synthetic_passwords(min(batch, lines - offset), seed=offset)))
+                f.write("\n")
+
+        print(f"Lines: {lines:,}  CPUs: {os.cpu_count()}")
+        print(f"{'workers':>8} {'seconds':>9} {'passwords/sec':>15} {'speedup':>8}")
+        baseline = None
+        expected = None
+        workers = 1
+        while workers <= max_workers:
+            start = time.perf_counter()
+            with open(path, "rb") as stream:
+                counts = audit_stream(stream, workers)
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            expected = expected or counts
+            assert counts == expected  # Sharding must not change the result
+            print(f"{workers:>8} {seconds:>9.2f} {lines / seconds:>15,.0f} {baseline / seconds:>7.2f}x")
+            workers *= 2
+
+# Per-stage latency of the entropy/pattern scoring pipeline
+def bench_scoring(count):
+    from strength_scoring import StrengthScorer
+
+    samples = {}
+    scorer = StrengthScorer(timing_hook=lambda stage, seconds: samples.setdefault(stage, []).append(seconds))
+    passwords = synthetic_passwords(count)
+    # Realistic dumps repeat base words with small variations
+    rng = random.Random(2)
+    for i in range(0, count, 3):
+        passwords[i] = rng.choice(["P@ssw0rd", "dragon", "Sunshine", "m0nkey", "letmein"]) + str(rng.randint(0, 9999))
+
+    totals = []
+    for password in passwords:
+        start = time.perf_counter()
+        scorer.score(password)
+        totals.append(time.perf_counter() - start)
+    samples["total"] = totals
+
+    print(f"Passwords: {count:,}")
+    print(f"{'stage':<18} {'mean us':>9} {'p50 us':>9} {'p99 us':>9} {'max us':>9}")
+    for stage, values in samples.items():
+        values.sort()
+        mean = sum(values) / len(values)
+        p50 = values[len(values) // 2]
+        p99 = values[min(len(values) - 1, int(len(values) * 0.99))]
+        print(f"{stage:<18} {mean * 1e6:>9.2f} {p50 * 1e6:>9.2f} {p99 * 1e6:>9.2f} {values[-1] * 1e6:>9.2f}")
+    info = scorer.find_words.cache_info()
+    lookups = info.hits + info.misses
+    print(f"Dictionary cache: {info.hits:,}/{lookups:,} hits ({info.hits / lookups * 100 if lookups else 0:.1f}%)")
+
+    # Characters whose lowercase is longer ("İ" -> "i̇") must not shift pattern positions
+    checks = [("İİİabcdef", ("sequence", "abcdef")), ("İpassword", ("dictionary", "password")),
+              ("dragonİİ1234", ("dictionary", "dragon"))]
+    matches = all(pattern in scorer.score(password)["patterns"] for password, pattern in checks)
+    print(f"Patterns found at the right positions after length-changing lowercase: {matches}")
+    # Digits at a token's edge can be leetspeak; zigzags are not sequences
+    found = all(pattern in scorer.score(password)["patterns"]
+                for password, pattern in [("4dmin", ("dictionary", "4dmin")), ("dr4g0n2024", ("dictionary", "dr4g0n")),
+                                          ("zq54321", ("sequence", "54321"))])
+    zigzags = [kind for password in ("xababax", "qwqwqw", "1212") for kind, _ in scorer.score(password)["patterns"]]
+    print(f"Leet digits at token edges matched, zigzags not taken for sequences: {found and 'sequence' not in zigzags}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Password analyzer benchmarks")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+    analyze = sub.add_parser("analyze", help="Bulk analyze_many vs per-password analyze_password")
+    analyze.add_argument("--count", type=int, default=1_000_000)
+    audit = sub.add_parser("audit", help="Multi-process audit speedup by worker count")
+    audit.add_argument("--lines", type=int, default=10_000_000)
+    audit.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    scoring = sub.add_parser("scoring", help="Per-stage latency of the strength scoring pipeline")
+    scoring.add_argument("--count", type=int, default=200_000)
+    args = parser.parse_args()
+
+    if args.benchmark == "analyze":
+        bench_analyze(args.count)
+    elif args.benchmark == "audit":
+        bench_audit(args.lines, args.workers)
+    elif args.benchmark == "scoring":
+        bench_scoring(args.count)
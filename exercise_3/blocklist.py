@@ -0,0 +1,153 @@
+import hashlib  # 64-bit password fingerprints
+import heapq    # Merging sorted runs while building an index
+import mmap     # Zero-parse access to prebuilt indexes
+import os       # File sizes and timestamps
+import struct   # Index header
+import sys      # Byte order check and command-line arguments
+import tempfile  # Sorted run files while building an index
+from array import array
+from bisect import bisect_left
+
+# Prebuilt index layout: header followed by sorted, de-duplicated uint64
+# fingerprints of the lowercased entries. Lookups binary-search the mapped file,
+# so opening a 100M-entry list costs one mmap call instead of parsing it.
+# Two distinct passwords share a 64-bit fingerprint with probability ~n/2^64.
+INDEX_MAGIC = b"PWBL"
+INDEX_HEADER = struct.Struct("<4sBxxxQI4x")  # magic, little-endian flag, count, max length
+INDEX_SUFFIX = ".pwbl"
+
+SMALL_LIST_BYTES = 16 * 2**20  # Plain-text lists up to this size load into a set
+RUN_SIZE = 5_000_000  # Fingerprints sorted in memory per run while building
+
+# 64-bit fingerprint of a (lowercased) password
+def fingerprint(word):
+    return int.from_bytes(hashlib.blake2b(word.encode("utf-8"), digest_size=8).digest(), "little")
+
+# In-memory blocklist for small lists
+class SetBlocklist:
+    def __init__(self, words):
+        self.words = frozenset(word.lower() for word in words)
+        self.max_length = max(map(len, self.words), default=0)  # Longer passwords can't match
+
+    def __contains__(self, word):
+        return word in self.words
+
+    def __len__(self):
+        return len(self.words)
+
+# Memory-mapped sorted fingerprint file for very large lists
+class HashFileBlocklist:
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, little_endian, count, self.max_length = INDEX_HEADER.unpack_from(self.map)
+        if magic != INDEX_MAGIC:
+            raise ValueError(f"{path} is not a blocklist index")
+        if bool(little_endian) != (sys.byteorder == "little"):
+            raise ValueError(f"{path} was built on a machine with a different byte order")
+        self.hashes = memoryview(self.map)[INDEX_HEADER.size:INDEX_HEADER.size + count * 8].cast("Q")
+
+    def __contains__(self, word):
+        target = fingerprint(word)
+        index = bisect_left(self.hashes, target)  # O(log n) probes into the mapped file
+        return index < len(self.hashes) and self.hashes[index] == target
+
+    def __len__(self):
+        return len(self.hashes)
+
+    def close(self):
+        self.hashes.release()
+        self.map.close()
+
+# Stream stripped, non-empty, lowercased entries from a text list
+def read_words(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        for line in f:
+            word = line.strip()
+            if word:
+                yield word.lower()
+
+def _read_run(path):
+    with open(path, "rb") as f:
+        while True:
+            chunk = array("Q")
+            chunk.frombytes(f.read(8 * 65536))
+            if not chunk:
+                return
+            yield from chunk
+
+# Build a sorted fingerprint index from a text list in bounded memory:
+# sort fixed-size runs, spill them to disk, then stream a k-way merge
+def build_index(source, dest, run_size=RUN_SIZE):
+    max_length = 0
+    runs = []
+    with tempfile.TemporaryDirectory() as tmp:
+        run = array("Q")
+        for word in read_words(source):
+            max_length = max(max_length, len(word))
+            run.append(fingerprint(word))
+            if len(run) >= run_size:
+                runs.append(_write_run(run, tmp, len(runs)))
+                run = array("Q")
+        if run or not runs:
+            runs.append(_write_run(run, tmp, len(runs)))
+
+        count = 0
+        previous = None
+        # A unique temp file next to dest, so concurrent builds never share one
+        fd, tmp_dest = tempfile.mkstemp(prefix=os.path.basename(dest) + ".", suffix=".tmp",
+                                        dir=os.path.dirname(os.path.abspath(dest)))
+        with os.fdopen(fd, "wb") as out:
+            out.write(INDEX_HEADER.pack(INDEX_MAGIC, sys.byteorder == "little", 0, 0))
+            buffer = array("Q")
+            for value in heapq.merge(*(_read_run(path) for path in runs)):
+                if value != previous:  # Drop duplicate entries
+                    buffer.append(value)
+                    previous = value
+                    if len(buffer) >= 65536:
+                        buffer.tofile(out)
+                        count += len(buffer)
+                        buffer = array("Q")
+            buffer.tofile(out)
+            count += len(buffer)
+            out.seek(0)
+            out.write(INDEX_HEADER.pack(INDEX_MAGIC, sys.byteorder == "little", count, max_length))
+        os.chmod(tmp_dest, 0o644)  # mkstemp creates the file owner-only
+        os.replace(tmp_dest, dest)
+    return count
+
+def _write_run(run, directory, number):
+    path = os.path.join(directory, f"run{number}")
+    with open(path, "wb") as f:
+        array("Q", sorted(run)).tofile(f)
+    return path
+
+def _is_index(path):
+    with open(path, "rb") as f:
+        return f.read(len(INDEX_MAGIC)) == INDEX_MAGIC
+
+# The file load_blocklist should read: prebuilt indexes and small text lists as
+# they are, large text lists via an index built next to them (reused while current).
+# Call once before starting worker processes so they never build the index themselves.
+def resolve_blocklist(path):
+    if _is_index(path) or os.path.getsize(path) <= SMALL_LIST_BYTES:
+        return path
+    index_path = path + INDEX_SUFFIX
+    if not os.path.exists(index_path) or os.path.getmtime(index_path) < os.path.getmtime(path):
+        build_index(path, index_path)
+    return index_path
+
+# Load a blocklist: prebuilt indexes are mapped, small text lists become a set,
+# and large text lists get an index built next to them (reused while current)
+def load_blocklist(path):
+    path = resolve_blocklist(path)
+    if _is_index(path):
+        return HashFileBlocklist(path)
+    return SetBlocklist(read_words(path))
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python blocklist.py <wordlist.txt> <index.pwbl>")
+        sys.exit(1)
+    entries = build_index(sys.argv[1], sys.argv[2])
+    print(f"Indexed {entries:,} unique entries into {sys.argv[2]}")
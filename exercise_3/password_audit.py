@@ -0,0 +1,119 @@
+import argparse  # Command-line options
+import os        # CPU count for the default worker count
+import sys       # For reading passwords from stdin
+import time      # Throughput reporting
+from collections import Counter, deque
+from multiprocessing import Pool
+
+from blocklist import load_blocklist, resolve_blocklist
+from password_manager import CHECK_MESSAGES, DEFAULT_BLOCKLIST, analyze_many, score_for, strength_for
+
+BLOCK_SIZE = 1 << 20  # Bytes of input per work unit (split on line boundaries)
+MAX_PENDING_PER_WORKER = 4  # Work units in flight per worker; bounds memory use
+STRENGTHS = ["Weak", "Fair", "Good", "Strong", "Excellent"]
+
+_worker_blocklist = DEFAULT_BLOCKLIST  # Set per worker process by _init_worker
+
+# Yield newline-terminated blocks of raw bytes from a binary stream, so
+# workers receive cheap-to-pickle bytes rather than lists of strings
+def read_blocks(stream, block_size=BLOCK_SIZE):
+    leftover = b""
+    while True:
+        data = stream.read(block_size)
+        if not data:
+            if leftover:
+                yield leftover
+            return
+        data = leftover + data
+        cut = data.rfind(b"\n") + 1
+        if cut == 0:
+            leftover = data  # No complete line yet
+            continue
+        leftover = data[cut:]
+        yield data[:cut]
+
+# Pool initializer: load the blocklist once per worker process (the path must
+# already be resolved, see resolve_blocklist)
+def _init_worker(blocklist_path):
+    global _worker_blocklist
+    if blocklist_path:
+        _worker_blocklist = load_blocklist(blocklist_path)  # Indexes are mmapped, so shared via the page cache
+
+# Audit one block; returns {check mask: count} (at most 64 entries), never passwords
+def audit_block(block):
+    text = block.decode("utf-8", errors="replace").replace("\r\n", "\n")
+    passwords = [line for line in text.split("\n") if line]
+    return Counter(analyze_many(passwords, _worker_blocklist))
+
+# Stream passwords from a binary stream through a pool of workers and return
+# the combined {check mask: count}; at most workers * MAX_PENDING_PER_WORKER
+# blocks are held in memory at once
+def audit_stream(stream, workers, blocklist_path=None, block_size=BLOCK_SIZE):
+    totals = Counter()
+    if blocklist_path:
+        blocklist_path = resolve_blocklist(blocklist_path)  # Any index is built here, once, before the pool starts
+    if workers <= 1:
+        _init_worker(blocklist_path)
+        for block in read_blocks(stream, block_size):
+            totals.update(audit_block(block))
+        return totals
+
+    with Pool(workers, initializer=_init_worker, initargs=(blocklist_path,)) as pool:
+        pending = deque()
+        for block in read_blocks(stream, block_size):
+            pending.append(pool.apply_async(audit_block, (block,)))
+            if len(pending) >= workers * MAX_PENDING_PER_WORKER:
+                totals.update(pending.popleft().get())
+        while pending:
+            totals.update(pending.popleft().get())
+    return totals
+
+# Turn {check mask: count} into strength counts and per-check failure counts
+def summarize(mask_counts):
+    strengths = Counter()
+    failures = Counter()
+    for mask, count in mask_counts.items():
+        strengths[strength_for(score_for(mask))] += count
+        for flag, _, failed, _ in CHECK_MESSAGES:
+            if not mask & flag:
+                failures[failed] += count
+    return strengths, failures
+
+# Print the aggregate audit report (no individual passwords are shown)
+def print_audit_report(mask_counts, seconds):
+    total = sum(mask_counts.values())
+    strengths, failures = summarize(mask_counts)
+    rate = total / seconds if seconds else 0
+
+    print("=== PASSWORD AUDIT REPORT ===")
+    print(f"Passwords analyzed: {total:,} in {seconds:.2f}s ({rate:,.0f} passwords/sec)")
+    print("\nStrength distribution:")
+    for strength in STRENGTHS:
+        count = strengths[strength]
+        percent = count / total * 100 if total else 0
+        print(f"{strength:<10} {count:>12,} ({percent:.1f}%)")
+    print("\nMost common failed checks:")
+    if not failures:
+        print("None")
+    for failed, count in failures.most_common():
+        percent = count / total * 100
+        print(f"{failed:<40} {count:>12,} ({percent:.1f}%)")
+
+def main():
+    parser = argparse.ArgumentParser(description="Audit a password list without echoing any password")
+    parser.add_argument("input", nargs="?", default="-", help="Password file, one per line ('-' for stdin)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--blocklist", help="Common-password list or prebuilt .pwbl index")
+    parser.add_argument("--block-size", type=int, default=BLOCK_SIZE, help="Bytes per work unit")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.input == "-":
+        mask_counts = audit_stream(sys.stdin.buffer, args.workers, args.blocklist, args.block_size)
+    else:
+        with open(args.input, "rb") as stream:
+            mask_counts = audit_stream(stream, args.workers, args.blocklist, args.block_size)
+    print_audit_report(mask_counts, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main()
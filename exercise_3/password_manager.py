@@ -1,84 +1,119 @@
 import re
+import string  # Character classes for the lookup table
+import sys     # Optional blocklist path on the command line
+from array import array  # Compact per-password results for bulk audits
+
+from blocklist import SetBlocklist, load_blocklist
+from strength_scoring import score_password
 
 # Common passwords to avoid (predefined list)
 COMMON_PASSWORDS = ["123456", "password", "qwerty", "abc123", "letmein", "football", 
                     "admin", "welcome", "login", "monkey", "dragon", "passw0rd", "master", "hello",
                     "freedom", "whatever", "12345", "12345678", "123456789", "iloveyou"]
 
-# Analyze password strength based on various criteria
-def analyze_password(password):
-    score = 0
-    results = []
-    suggestions = []
-
-    # Length check
-    if len(password) >= 8:
-        score += 20
-        results.append("✅ Length requirement (8+ chars)")
-    else:
-        results.append("❌ Length is less than 8 characters")
-        suggestions.append("Use at least 8 characters")
-
-    # Uppercase letter check using regex
-    if re.search(r'[A-Z]', password):
-        score += 20
-        results.append("✅ Contains uppercase letters")
-    else:
-        results.append("❌ Missing uppercase letters")
-        suggestions.append("Include uppercase letters")
-
-    # Lowercase letter check
-    if re.search(r'[a-z]', password):
-        score += 20
-        results.append("✅ Contains lowercase letters")
-    else:
-        results.append("❌ Missing lowercase letters")
-        suggestions.append("Include lowercase letters")
-
-    # Digit check
-    if re.search(r'\d', password):
-        score += 20
-        results.append("✅ Contains numbers")
+# Bit flags for each passed check, in the order they are reported
+LENGTH_OK = 1
+HAS_UPPER = 2
+HAS_LOWER = 4
+HAS_DIGIT = 8
+HAS_SPECIAL = 16
+NOT_COMMON = 32
+ALL_CHECKS = 63
+
+MIN_LENGTH = 8
+SPECIAL_CHARS = "!@#$%^&*"
+
+# (flag, pass message, fail message, suggestion) for building readable reports
+CHECK_MESSAGES = [
+    (LENGTH_OK, "✅ Length requirement (8+ chars)", "❌ Length is less than 8 characters", "Use at least 8 characters"),
+    (HAS_UPPER, "✅ Contains uppercase letters", "❌ Missing uppercase letters", "Include uppercase letters"),
+    (HAS_LOWER, "✅ Contains lowercase letters", "❌ Missing lowercase letters", "Include lowercase letters"),
+    (HAS_DIGIT, "✅ Contains numbers", "❌ Missing numbers", "Include at least one number"),
+    (HAS_SPECIAL, "✅ Contains special characters", "❌ Missing special characters", "Add characters like !@#$%^&*"),
+    (NOT_COMMON, "✅ Not a common password", "❌ Common password detected", "Avoid using common passwords"),
+]
+
+DEFAULT_BLOCKLIST = SetBlocklist(COMMON_PASSWORDS)  # O(1) membership instead of a list scan
+
+# Byte -> character-class flag; summing the distinct flags of a password's
+# bytes yields all of its class bits in one pass (flags are distinct powers of 2)
+def _build_class_flags():
+    table = bytearray(256)
+    for chars, flag in ((string.ascii_uppercase, HAS_UPPER), (string.ascii_lowercase, HAS_LOWER),
+                        (string.digits, HAS_DIGIT), (SPECIAL_CHARS, HAS_SPECIAL)):
+        for char in chars:
+            table[ord(char)] = flag
+    return bytes(table)
+
+CLASS_FLAGS = _build_class_flags()
+
+# Regexes for non-ASCII passwords, where \d also matches non-ASCII digits
+CLASS_PATTERNS = [(HAS_UPPER, re.compile(r'[A-Z]')), (HAS_LOWER, re.compile(r'[a-z]')),
+                  (HAS_DIGIT, re.compile(r'\d')), (HAS_SPECIAL, re.compile(r'[!@#$%^&*]'))]
+
+# Run every check on one password and return the passed-check bit mask;
+# blocklist is any SetBlocklist / HashFileBlocklist (defaults to COMMON_PASSWORDS)
+def check_password(password, blocklist=DEFAULT_BLOCKLIST):
+    if password.isascii():
+        mask = sum(set(password.encode("ascii").translate(CLASS_FLAGS)))
     else:
-        results.append("❌ Missing numbers")
-        suggestions.append("Include at least one number")
-
-    # Special character check
-    if re.search(r'[!@#$%^&*]', password):
-        score += 20
-        results.append("✅ Contains special characters")
-    else:
-        results.append("❌ Missing special characters")
-        suggestions.append("Add characters like !@#$%^&*")
-
-    # Common password check
-    if password.lower() not in COMMON_PASSWORDS:
-        score += 20
-        results.append("✅ Not a common password")
-    else:
-        results.append("❌ Common password detected")
-        suggestions.append("Avoid using common passwords")
-
-    # Determine strength level
+        mask = 0
+        for flag, pattern in CLASS_PATTERNS:
+            if pattern.search(password):
+                mask |= flag
+    if len(password) >= MIN_LENGTH:
+        mask |= LENGTH_OK
+    if len(password) > blocklist.max_length or password.lower() not in blocklist:
+        mask |= NOT_COMMON
+    return mask
+
+# Check many passwords; returns a compact array of bit masks (one byte each)
+def analyze_many(passwords, blocklist=DEFAULT_BLOCKLIST):
+    return array("B", (check_password(password, blocklist) for password in passwords))
+
+# Score for a check mask: 20 points per passed check
+def score_for(mask):
+    return 20 * bin(mask).count("1")
+
+# Determine strength level from a score
+def strength_for(score):
     if score <= 40:
-        strength = "Weak"
+        return "Weak"
     elif score <= 60:
-        strength = "Fair"
+        return "Fair"
     elif score <= 80:
-        strength = "Good"
+        return "Good"
     elif score <= 100:
-        strength = "Strong"
+        return "Strong"
     else:
-        strength = "Excellent"
+        return "Excellent"
 
-    return score, strength, results, suggestions
+# Build the human-readable report for a check mask
+def describe(mask):
+    results = []
+    suggestions = []
+    for flag, passed, failed, suggestion in CHECK_MESSAGES:
+        if mask & flag:
+            results.append(passed)
+        else:
+            results.append(failed)
+            suggestions.append(suggestion)
+    score = score_for(mask)
+    return score, strength_for(score), results, suggestions
+
+# Analyze password strength based on various criteria
+def analyze_password(password, blocklist=DEFAULT_BLOCKLIST):
+    return describe(check_password(password, blocklist))
+
+# Main function to interact with user; an optional blocklist file replaces
+# the built-in common password list
+def main(blocklist_path=None):
+    blocklist = load_blocklist(blocklist_path) if blocklist_path else DEFAULT_BLOCKLIST
 
-# Main function to interact with user
-def main():
     print("=== PASSWORD SECURITY ANALYZER ===")
     password = input("Enter password to analyze: ")
 
-    score, strength, results, suggestions = analyze_password(password)
+    score, strength, results, suggestions = analyze_password(password, blocklist)
 
     print("\n🔒 SECURITY ANALYSIS RESULTS")
     print(f"Password: {password}")
@@ -87,6 +122,12 @@ def main():
     for res in results:
         print(res)
 
+    # Entropy estimate that also accounts for repeats, sequences and dictionary words
+    analysis = score_password(password)
+    print(f"\n🔎 Estimated entropy: {analysis['bits']:.0f} bits ({analysis['rating']})")
+    for kind, fragment in analysis["patterns"]:
+        print(f"- {kind.capitalize()} pattern: {fragment}")
+
     if suggestions:
         print("\n💡 SUGGESTIONS:")
         for sug in suggestions:
@@ -95,4 +136,4 @@ def main():
         print("\n🎉 Your password is excellent!")
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1] if len(sys.argv) > 1 else None)
@@ -0,0 +1,194 @@
+import math  # Entropy in bits
+import re    # Repeat and token detection
+import time  # Per-stage timing hooks
+from functools import lru_cache
+
+MAX_ANALYZED_LENGTH = 64  # Only the first 64 characters are pattern-checked (bounded cost)
+MIN_PATTERN_LENGTH = 3  # Shortest sequence / keyboard walk / repeat that counts
+MIN_WORD_LENGTH = 4  # Shortest dictionary word that counts
+MAX_WORD_LENGTH = 16  # Longest dictionary word tried at each position
+CACHE_SIZE = 65536  # Entries per LRU cache
+
+# Character pool sizes used to estimate brute-force entropy
+POOL_SIZES = [("lower", 26), ("upper", 26), ("digit", 10), ("symbol", 33), ("other", 100)]
+
+# Common base words; leetspeak variants (p@ssw0rd, dr4g0n) are matched too
+DICTIONARY_WORDS = frozenset([
+    "password", "dragon", "monkey", "master", "shadow", "sunshine", "princess", "football",
+    "baseball", "soccer", "hockey", "letmein", "welcome", "admin", "login", "hello", "freedom",
+    "whatever", "iloveyou", "love", "secret", "summer", "winter", "spring", "autumn", "qwerty",
+    "trustno", "batman", "superman", "michael", "jennifer", "jordan", "hunter", "ranger",
+    "buster", "charlie", "thomas", "tigger", "pepper", "cookie", "flower", "ginger",
+    "orange", "purple", "silver", "golden", "diamond", "chocolate", "computer", "internet",
+    "starwars", "pokemon", "matrix", "mustang", "corvette", "ferrari", "harley", "yankees",
+    "dallas", "london", "paris", "berlin", "money", "angel", "baby", "family", "friend",
+    "happy", "lucky", "magic", "music", "pass", "word", "user", "guest", "root", "test",
+])
+
+# Leetspeak substitutions undone before dictionary lookups
+LEET_TABLE = str.maketrans({"@": "a", "4": "a", "8": "b", "(": "c", "3": "e", "6": "g", "9": "g",
+                            "1": "i", "!": "i", "|": "l", "0": "o", "$": "s", "5": "s", "7": "t",
+                            "+": "t", "2": "z"})
+
+KEYBOARD_ROWS = ["`1234567890-=", "qwertyuiop[]\\", "asdfghjkl;'", "zxcvbnm,./"]
+
+REPEAT_PATTERN = re.compile(r"(.+?)\1+")  # A chunk immediately repeated
+TOKEN_PATTERN = re.compile(r"[a-z@48(3691!|0$57+2]{%d,}" % MIN_WORD_LENGTH)  # Letter-ish runs
+
+# Strength rating bands by estimated entropy (bits)
+RATINGS = [(28, "Very Weak"), (36, "Weak"), (60, "Reasonable"), (128, "Strong")]
+
+# Undo common leetspeak substitutions in a lowercased token
+def deleet(token):
+    return token.translate(LEET_TABLE)
+
+# Lowercase text without changing its length, so pattern positions found in
+# the lowercased copy index the original ("İ" lowercases to two code points
+# and is kept as is)
+def same_length_lower(text):
+    lower = text.lower()
+    if len(lower) == len(text):
+        return lower
+    return "".join(char.lower() if len(char.lower()) == 1 else char for char in text)
+
+# Character -> (row, column) on the keyboard, for keyboard-walk detection
+KEYBOARD_POSITIONS = {char: (row, column) for row, keys in enumerate(KEYBOARD_ROWS)
+                      for column, char in enumerate(keys)}
+
+def _rating(bits):
+    for limit, label in RATINGS:
+        if bits < limit:
+            return label
+    return "Very Strong"
+
+# Estimate brute-force entropy from the character classes present
+def charset_stage(password, analysis, scorer):
+    classes = set()
+    for char in analysis["text"]:
+        if char.islower() and char.isascii():
+            classes.add("lower")
+        elif char.isupper() and char.isascii():
+            classes.add("upper")
+        elif char.isdigit() and char.isascii():
+            classes.add("digit")
+        elif char.isascii():
+            classes.add("symbol")
+        else:
+            classes.add("other")
+    pool = sum(size for name, size in POOL_SIZES if name in classes)
+    analysis["bits_per_char"] = math.log2(pool) if pool else 0.0
+    analysis["entropy_bits"] = len(analysis["text"]) * analysis["bits_per_char"]
+
+# Repeated characters or chunks ("aaaa", "abcabc")
+def repeat_stage(password, analysis, scorer):
+    text = analysis["text"]
+    for match in REPEAT_PATTERN.finditer(text):
+        if len(match.group(0)) >= MIN_PATTERN_LENGTH:
+            unit = len(match.group(1))
+            # Only the first copy carries entropy, plus ~log2(copies) bits for the count
+            cost = unit * analysis["bits_per_char"] + math.log2(len(match.group(0)) // unit)
+            scorer.add_pattern(analysis, "repeat", match.start(), match.end(), cost)
+
+# Alphabet/digit sequences ("abcd", "4321") and keyboard walks ("qwerty", "asdf").
+# A run keeps one direction: zigzags such as "abab" or "qwqw" are not sequences.
+def sequence_stage(password, analysis, scorer):
+    text = analysis["lower"]
+    start = 0
+    direction = set()  # Steps every pair of the current run has taken
+    for i in range(1, len(text) + 1):
+        steps = _steps(text[i - 1], text[i]) if i < len(text) else set()
+        if steps and (i - start == 1 or steps & direction):
+            direction = steps if i - start == 1 else steps & direction
+            continue
+        if i - start >= MIN_PATTERN_LENGTH:
+            # Only the starting character and direction are really chosen
+            scorer.add_pattern(analysis, "sequence", start, i, analysis["bits_per_char"] + 1)
+        if steps:  # Direction changed: the turning character starts the next run ("abcba")
+            start, direction = i - 1, steps
+        else:
+            start, direction = i, set()
+
+# Ways b follows a: ("alphabet", +1/-1) for neighbouring letters or digits,
+# ("keyboard", +1/-1) for neighbouring keys in one keyboard row
+def _steps(a, b):
+    steps = set()
+    if abs(ord(a) - ord(b)) == 1 and (a.isalnum() and b.isalnum()):
+        steps.add(("alphabet", ord(b) - ord(a)))
+    key_a, key_b = KEYBOARD_POSITIONS.get(a), KEYBOARD_POSITIONS.get(b)
+    if key_a and key_b and key_a[0] == key_b[0] and abs(key_a[1] - key_b[1]) == 1:
+        steps.add(("keyboard", key_b[1] - key_a[1]))
+    return steps
+
+# Dictionary words, including leetspeak variants, via cached token lookups.
+# Leetspeak is undone before anything else, so digits at either end of a token
+# can still be letters ("4dmin" is "admin"); deleet keeps positions aligned.
+def dictionary_stage(password, analysis, scorer):
+    for match in TOKEN_PATTERN.finditer(analysis["lower"]):
+        for offset, length in scorer.find_words(deleet(match.group(0))):
+            start = match.start() + offset
+            scorer.add_pattern(analysis, "dictionary", start, start + length, scorer.word_bits)
+
+DEFAULT_STAGES = [charset_stage, repeat_stage, sequence_stage, dictionary_stage]
+
+# Pluggable entropy/pattern scoring pipeline. Each stage is a function
+# (password, analysis, scorer) that updates the shared analysis dict; an
+# optional timing hook receives (stage name, seconds) for every stage run.
+class StrengthScorer:
+    def __init__(self, stages=None, words=DICTIONARY_WORDS, timing_hook=None, cache_size=CACHE_SIZE):
+        self.stages = list(stages or DEFAULT_STAGES)
+        self.words = frozenset(words)
+        self.word_bits = math.log2(max(len(self.words), 2))  # Cost of picking a word from the list
+        self.timing_hook = timing_hook
+        self.find_words = lru_cache(maxsize=cache_size)(self._find_words)
+
+    # Dictionary words inside a lowercased, de-leeted token, as (offset, length) pairs
+    def _find_words(self, normalized):
+        found = []
+        position = 0
+        while position <= len(normalized) - MIN_WORD_LENGTH:
+            # Prefer the longest word starting here, then skip past it
+            for length in range(min(MAX_WORD_LENGTH, len(normalized) - position), MIN_WORD_LENGTH - 1, -1):
+                if normalized[position:position + length] in self.words:
+                    found.append((position, length))
+                    position += length
+                    break
+            else:
+                position += 1
+        return tuple(found)
+
+    # Record a pattern over text[start:end]; characters already explained by an
+    # earlier pattern are not discounted twice
+    def add_pattern(self, analysis, kind, start, end, cost_bits):
+        covered = analysis["covered"]
+        fresh = sum(1 for i in range(start, end) if not covered[i])
+        if not fresh:
+            return
+        for i in range(start, end):
+            covered[i] = True
+        saved = max(0.0, fresh * analysis["bits_per_char"] - cost_bits)
+        analysis["patterns"].append((kind, analysis["text"][start:end]))
+        analysis["penalty_bits"] += saved
+
+    # Run every stage and return the analysis dict
+    def score(self, password):
+        text = password[:MAX_ANALYZED_LENGTH]
+        analysis = {
+            "text": text, "lower": same_length_lower(text), "covered": [False] * len(text),
+            "bits_per_char": 0.0, "entropy_bits": 0.0, "penalty_bits": 0.0, "patterns": [],
+        }
+        for stage in self.stages:
+            if self.timing_hook is None:
+                stage(password, analysis, self)
+            else:
+                start = time.perf_counter()
+                stage(password, analysis, self)
+                self.timing_hook(stage.__name__, time.perf_counter() - start)
+        analysis["bits"] = max(0.0, analysis["entropy_bits"] - analysis["penalty_bits"])
+        analysis["rating"] = _rating(analysis["bits"])
+        return analysis
+
+DEFAULT_SCORER = StrengthScorer()
+
+# Score a password with the default pipeline
+def score_password(password):
+    return DEFAULT_SCORER.score(password)
@@ -0,0 +1,391 @@
+import json    # Stats file header
+import math    # Logistic ability model
+import os      # Atomic stats file replace
+import random  # Weighted sampling
+from array import array
+
+NUM_BINS = 16  # Items are grouped by estimated success rate into this many bins
+TARGET_SUCCESS = 0.7  # Aim for questions the player answers correctly ~70% of the time
+BIN_SPREAD = 0.15  # How sharply bin choice favours the target success rate
+ABILITY_STEP = 0.6  # Elo-style step for the player's running ability
+MAX_REJECTIONS = 16  # Samples that may hit already-asked questions before falling back to a scan
+
+# Binary indexed tree over non-negative weights: point update, prefix sum and
+# weighted sampling in O(log n). A saved tree array can be adopted as is.
+class FenwickTree:
+    def __init__(self, weights=(), tree=None):
+        self.values = weights if isinstance(weights, array) else array("d", weights)
+        self.total = sum(self.values)  # Kept up to date so bin choice needs no tree walk
+        if tree is not None:
+            self.tree = tree
+            return
+        self.tree = array("d", [0.0])  # 1-based; tree[0] is unused
+        self.tree.extend(self.values)
+        for i in range(1, len(self.tree)):  # O(n) build: push each node into its parent
+            parent = i + (i & -i)
+            if parent < len(self.tree):
+                self.tree[parent] += self.tree[i]
+
+    def __len__(self):
+        return len(self.values)
+
+    # Add a slot at the end holding weight
+    def append(self, weight):
+        self.values.append(weight)
+        self.total += weight
+        i = len(self.values)
+        lowest = i & -i
+        # Node i covers slots (i - lowest, i]; everything but the new slot is already summed
+        self.tree.append(weight + self.prefix_sum(i - 1) - self.prefix_sum(i - lowest))
+
+    # Remove the last slot
+    def pop(self):
+        self.set(len(self.values) - 1, 0.0)
+        self.values.pop()
+        self.tree.pop()
+        if not self.values:
+            self.total = 0.0  # Drop accumulated rounding error
+
+    def set(self, index, weight):
+        delta = weight - self.values[index]
+        self.values[index] = weight
+        self.total += delta
+        i = index + 1
+        while i < len(self.tree):
+            self.tree[i] += delta
+            i += i & -i
+
+    # Sum of the weights of slots [0, count)
+    def prefix_sum(self, count):
+        total = 0.0
+        while count > 0:
+            total += self.tree[count]
+            count -= count & -count
+        return total
+
+    # Slot whose cumulative weight range contains value (0 <= value < total)
+    def find(self, value):
+        position = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            nxt = position + step
+            if nxt < len(self.tree) and self.tree[nxt] <= value:  # Skip this whole subtree
+                position = nxt
+                value -= self.tree[nxt]
+            step >>= 1
+        return min(position, len(self.values) - 1)
+
+# Compact per-question answer counts for one question list
+class QuestionStats:
+    def __init__(self, num_questions):
+        self.attempts = array("I", bytes(4 * num_questions))
+        self.correct = array("I", bytes(4 * num_questions))
+        self.seconds = array("f", bytes(4 * num_questions))  # Total answer time
+
+    def __len__(self):
+        return len(self.attempts)
+
+    def record(self, index, correct, elapsed):
+        self.attempts[index] += 1
+        self.correct[index] += bool(correct)
+        self.seconds[index] += elapsed
+
+    # Estimated chance an average player answers correctly (Laplace-smoothed)
+    def success_rate(self, index):
+        return (self.correct[index] + 1) / (self.attempts[index] + 2)
+
+    def mean_seconds(self, index):
+        attempts = self.attempts[index]
+        return self.seconds[index] / attempts if attempts else 0.0
+
+# Stats for every question list, saved to one file: a JSON header line, then
+# each list's raw arrays in header order. Version 2 headers map
+# "category\tdifficulty" to {"count", "bins"}; bins > 0 means the list's
+# AdaptiveSelector layout follows its stats (see SelectorLayout), so a quiz
+# restores the selector instead of rebuilding it. Opening reads the header only;
+# a list's arrays are read the first time it is used, and lists that were never
+# used are copied unparsed on save. (Version 1 headers map keys to counts.)
+class QuestionStatsStore:
+    def __init__(self, path):
+        self.path = path
+        self.groups = {}  # (category, difficulty) -> QuestionStats, for lists read so far
+        self.selectors = {}  # (category, difficulty) -> AdaptiveSelector saved with its stats
+        self.sections = {}  # (category, difficulty) -> (offset, length, count, bins, bin sizes) not read yet
+        self.body_start = 0
+        if os.path.exists(path):
+            with open(path, "rb") as f:
+                header = json.loads(f.readline())
+                self.body_start = f.tell()
+            offset = 0
+            for key, meta in header["groups"].items():
+                if isinstance(meta, int):
+                    meta = {"count": meta, "bins": 0, "bin_sizes": []}
+                length = stats_size(meta["count"]) + layout_size(meta["count"], meta["bins"])
+                self.sections[tuple(key.split("\t"))] = (offset, length, meta["count"], meta["bins"], meta["bin_sizes"])
+                offset += length
+
+    # Read a list's stats (and selector layout, if saved) from the file
+    def _read(self, key):
+        offset, length, count, bins, bin_sizes = self.sections.pop(key)
+        stats = QuestionStats(0)
+        layout = None
+        with open(self.path, "rb") as f:
+            f.seek(self.body_start + offset)
+            for column in (stats.attempts, stats.correct, stats.seconds):
+                column.fromfile(f, count)
+            if bins:
+                layout = SelectorLayout.read(f, count, bin_sizes)
+        return stats, layout
+
+    # Stats for a question list, resized to num_questions if the bank gained or lost questions
+    def get(self, category, difficulty, num_questions):
+        return self._get((category, difficulty), num_questions)[0]
+
+    def _get(self, key, num_questions):
+        layout = None
+        stats = self.groups.get(key)
+        if stats is None:
+            if key in self.sections:
+                stats, layout = self._read(key)
+            else:
+                stats = QuestionStats(0)
+            self.groups[key] = stats
+        missing = num_questions - len(stats)
+        if missing > 0:
+            stats.attempts.frombytes(bytes(4 * missing))
+            stats.correct.frombytes(bytes(4 * missing))
+            stats.seconds.frombytes(bytes(4 * missing))
+        elif missing < 0:  # Shorter list, e.g. the built-in questions instead of a bank file
+            del stats.attempts[num_questions:], stats.correct[num_questions:], stats.seconds[num_questions:]
+        return stats, layout
+
+    # AdaptiveSelector for a question list, restored from the saved layout when
+    # there is one (questions added or removed since are inserted or dropped
+    # incrementally) and saved with it
+    def selector(self, category, difficulty, num_questions, rng=None):
+        key = (category, difficulty)
+        selector = self.selectors.get(key)
+        if selector is None:
+            stats, layout = self._get(key, num_questions)
+            if layout is not None and layout.num_bins != NUM_BINS:
+                layout = None  # Saved with another bin count: rebuild
+            selector = self.selectors[key] = AdaptiveSelector(stats, rng=rng, layout=layout)
+        else:
+            self._get(key, num_questions)
+            selector.sync()
+        return selector
+
+    def save(self):
+        groups = {}
+        parts = []  # Bytes of each list, in header order
+        old = open(self.path, "rb") if self.sections else None
+        try:
+            for key, (offset, length, count, bins, bin_sizes) in self.sections.items():
+                old.seek(self.body_start + offset)
+                parts.append(old.read(length))
+                groups[key] = {"count": count, "bins": bins, "bin_sizes": bin_sizes}
+        finally:
+            if old is not None:
+                old.close()
+        for key, stats in self.groups.items():
+            part = [stats.attempts.tobytes(), stats.correct.tobytes(), stats.seconds.tobytes()]
+            meta = {"count": len(stats), "bins": 0, "bin_sizes": []}
+            selector = self.selectors.get(key)
+            if selector is not None:
+                selector.sync()
+                layout = selector.layout()
+                part.append(layout.tobytes())
+                meta["bins"], meta["bin_sizes"] = layout.num_bins, layout.bin_sizes()
+            parts.append(b"".join(part))
+            groups[key] = meta
+        header = {"version": 2, "groups": {f"{category}\t{difficulty}": meta
+                                           for (category, difficulty), meta in groups.items()}}
+        header_line = json.dumps(header).encode("utf-8") + b"\n"
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(header_line)
+            f.writelines(parts)
+        os.replace(tmp_path, self.path)
+        # Lists not read stay in the file, at their new offsets
+        self.body_start = len(header_line)
+        offset = 0
+        for key, part in zip(groups, parts):
+            if key in self.sections:
+                _, _, count, bins, bin_sizes = self.sections[key]
+                self.sections[key] = (offset, len(part), count, bins, bin_sizes)
+            offset += len(part)
+
+# Bytes of one list's stats columns
+def stats_size(count):
+    return 12 * count
+
+# Bytes of a saved selector layout for count questions in bins bins
+def layout_size(count, bins):
+    if not bins:
+        return 0
+    return count + 4 * count + 4 * count + 8 * count + 8 * (count + bins)
+
+# An AdaptiveSelector's precomputed structures, as saved after a list's stats:
+# bin_of (uint8) and slot_of (uint32) per question, then for each bin its slot ->
+# question array (uint32), Fenwick weights (float64) and tree (float64, size + 1)
+class SelectorLayout:
+    def __init__(self, bin_of, slot_of, slots, trees):
+        self.bin_of = bin_of
+        self.slot_of = slot_of
+        self.slots = slots
+        self.trees = trees
+        self.num_bins = len(slots)
+
+    def bin_sizes(self):
+        return [len(slots) for slots in self.slots]
+
+    @classmethod
+    def read(cls, f, count, bin_sizes):
+        bin_of, slot_of = array("B"), array("I")
+        bin_of.fromfile(f, count)
+        slot_of.fromfile(f, count)
+        slots, trees = [], []
+        for size in bin_sizes:
+            bin_slots, values, tree = array("I"), array("d"), array("d")
+            bin_slots.fromfile(f, size)
+            values.fromfile(f, size)
+            tree.fromfile(f, size + 1)
+            slots.append(bin_slots)
+            trees.append(FenwickTree(values, tree))
+        return cls(bin_of, slot_of, slots, trees)
+
+    def tobytes(self):
+        parts = [self.bin_of.tobytes(), self.slot_of.tobytes()]
+        for slots, tree in zip(self.slots, self.trees):
+            parts += [slots.tobytes(), tree.values.tobytes(), tree.tree.tobytes()]
+        return b"".join(parts)
+
+def _logit(p):
+    return math.log(p / (1 - p))
+
+# Running estimate of one player's ability on a logit scale (0 = average player)
+class PlayerModel:
+    def __init__(self, ability=0.0):
+        self.ability = ability
+        self.answered = 0
+
+    # Chance this player answers an item with the given average success rate
+    def expected(self, success_rate):
+        return 1 / (1 + math.exp(-(self.ability + _logit(success_rate))))
+
+    def update(self, success_rate, correct):
+        step = ABILITY_STEP / math.sqrt(1 + self.answered)  # Settle as evidence accumulates
+        self.ability += step * (bool(correct) - self.expected(success_rate))
+        self.answered += 1
+
+# Picks the next question for a player from one question list. Items are
+# bucketed by estimated success rate; each bucket keeps a Fenwick tree of
+# sampling weights (rarely asked items weigh more), so choosing a question and
+# recording an answer cost O(bins + log n) however large the list is. Building
+# is O(n); a SelectorLayout saved by QuestionStatsStore is adopted instead.
+class AdaptiveSelector:
+    def __init__(self, stats, num_bins=NUM_BINS, target=TARGET_SUCCESS, rng=None, layout=None):
+        self.stats = stats
+        self.target = target
+        self.rng = rng or random.Random()
+        if layout is not None:
+            self.num_bins = layout.num_bins
+            self.bin_of, self.slot_of, self.slots, self.trees = layout.bin_of, layout.slot_of, layout.slots, layout.trees
+            self.sync()
+            return
+        self.num_bins = num_bins
+        self.slots = [array("I") for _ in range(num_bins)]  # Slot -> question index
+        self.bin_of = array("B")
+        self.slot_of = array("I")
+        for index in range(len(stats)):
+            bin_index = self._bin_for(index)
+            self.bin_of.append(bin_index)
+            self.slot_of.append(len(self.slots[bin_index]))
+            self.slots[bin_index].append(index)
+        self.trees = [FenwickTree(self._weight(index) for index in slots) for slots in self.slots]
+
+    # Match stats after the list changed length: insert questions added since the
+    # selector was built, or drop those past the end of a shorter list, in O(log n) each
+    def sync(self):
+        for index in range(len(self.bin_of) - 1, len(self.stats) - 1, -1):
+            self._remove(index)
+        del self.bin_of[len(self.stats):], self.slot_of[len(self.stats):]
+        for index in range(len(self.bin_of), len(self.stats)):
+            self.bin_of.append(0)
+            self.slot_of.append(0)
+            self._insert(index)
+
+    # The structures to save, for QuestionStatsStore
+    def layout(self):
+        return SelectorLayout(self.bin_of, self.slot_of, self.slots, self.trees)
+
+    def _bin_for(self, index):
+        return min(self.num_bins - 1, int(self.stats.success_rate(index) * self.num_bins))
+
+    # Favour questions with few answers so new questions get calibrated
+    def _weight(self, index):
+        return 1 / math.sqrt(1 + self.stats.attempts[index])
+
+    # Remove an item from its bin by moving the bin's last item into its slot
+    def _remove(self, index):
+        bin_index, slot = self.bin_of[index], self.slot_of[index]
+        tree, slots = self.trees[bin_index], self.slots[bin_index]
+        last = slots[-1]
+        slots[slot] = last
+        self.slot_of[last] = slot
+        tree.set(slot, tree.values[-1])
+        slots.pop()
+        tree.pop()
+
+    def _insert(self, index):
+        bin_index = self._bin_for(index)
+        self.bin_of[index] = bin_index
+        self.slot_of[index] = len(self.slots[bin_index])
+        self.slots[bin_index].append(index)
+        self.trees[bin_index].append(self._weight(index))
+
+    # Bin weights: bin size times closeness of the player's expected success to the target
+    def _bin_weights(self, player):
+        weights = []
+        for bin_index, tree in enumerate(self.trees):
+            total = tree.total if len(tree) else 0.0
+            if total:
+                expected = player.expected((bin_index + 0.5) / self.num_bins)
+                total *= math.exp(-((expected - self.target) / BIN_SPREAD) ** 2)
+            weights.append(total)
+        return weights
+
+    # Next question index for player, skipping indexes in exclude; None if all are excluded
+    def select(self, player, exclude=()):
+        weights = self._bin_weights(player)
+        total = sum(weights)
+        if total:
+            for _ in range(MAX_REJECTIONS):
+                value = self.rng.random() * total
+                bin_index = 0
+                while bin_index < self.num_bins - 1 and value >= weights[bin_index]:
+                    value -= weights[bin_index]
+                    bin_index += 1
+                tree = self.trees[bin_index]
+                if not len(tree):
+                    continue
+                index = self.slots[bin_index][tree.find(self.rng.random() * tree.total)]
+                if index not in exclude:
+                    return index
+        # Most of the list was excluded: take the closest-fitting remaining question
+        for bin_index in sorted(range(self.num_bins), key=lambda b: -weights[b]):
+            for index in self.slots[bin_index]:
+                if index not in exclude:
+                    return index
+        return None
+
+    # Record an answer: updates the question's stats, its bin and weight, and the player
+    def record(self, index, correct, elapsed, player=None):
+        if player is not None:
+            player.update(self.stats.success_rate(index), correct)  # Rate against the pre-answer estimate
+        self.stats.record(index, correct, elapsed)
+        if self._bin_for(index) != self.bin_of[index]:
+            self._remove(index)
+            self._insert(index)
+        else:
+            self.trees[self.bin_of[index]].set(self.slot_of[index], self._weight(index))
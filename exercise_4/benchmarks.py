@@ -0,0 +1,297 @@
+import argparse  # For choosing which benchmark to run
+import asyncio   # For the simulated players
+import json      # For writing the synthetic inline module
+import os        # For scratch file paths
+import py_compile  # Pre-compile the inline module so imports load a .pyc
+import random    # For synthetic questions
+import subprocess  # Cold starts need a fresh interpreter each time
+import sys       # Path of the current interpreter
+import tempfile  # For scratch banks
+import time      # For wall-clock measurements
+
+from adaptive_selection import AdaptiveSelector, PlayerModel, QuestionStats, QuestionStatsStore
+from high_scores import HighScoreStore
+from question_bank import build_question_bank
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Yield (category, difficulty, question) for a synthetic bank
+def synthetic_questions(num_questions, num_categories, seed=0):
+    rng = random.Random(seed)
+    for i in range(num_questions):
+        question = {
+            "question": f"Synthetic question {i}: which option is number {i % 4}?",
+            "options": [f"Option {rng.randint(0, 10**6)}" for _ in range(4)],
+            "answer": i % 4,
+        }
+        yield f"Category{i % num_categories}", "easy" if i % 2 else "hard", question
+
+# Write the same questions as a module with an inline QUESTIONS_DB literal
+def write_inline_module(path, num_questions, num_categories):
+    questions_db = {}
+    for category, difficulty, question in synthetic_questions(num_questions, num_categories):
+        questions_db.setdefault(category, {}).setdefault(difficulty, []).append(question)
+    with open(path, "w") as f:
+        f.write("QUESTIONS_DB = ")
+        json.dump(questions_db, f, indent=1)  # Valid Python for str/int/list/dict data
+        f.write("\n")
+
+# Child process: run code, then print its own peak RSS in KiB. VmHWM is reset
+# by exec, unlike ru_maxrss, which would include the benchmark's own memory.
+CHILD_TEMPLATE = """
+import sys
+sys.path[:0] = {paths!r}
+{code}
+with open("/proc/self/status") as status:
+    print(next(line.split()[1] for line in status if line.startswith("VmHWM")))
+"""
+
+# Run code in a fresh interpreter; returns (seconds, peak RSS in MiB)
+def _cold_run(code, paths):
+    start = time.perf_counter()
+    output = subprocess.run([sys.executable, "-c", CHILD_TEMPLATE.format(paths=paths, code=code)],
+                            check=True, capture_output=True, text=True).stdout
+    seconds = time.perf_counter() - start
+    return seconds, int(output.split()[-1]) / 1024
+
+# Cold start to the first question of one category: inline dict module vs indexed bank
+def bench_coldstart(num_questions, num_categories, repeats):
+    with tempfile.TemporaryDirectory() as tmp:
+        start = time.perf_counter()
+        inline_path = os.path.join(tmp, "inline_questions.py")
+        write_inline_module(inline_path, num_questions, num_categories)
+        build_question_bank(synthetic_questions(num_questions, num_categories), os.path.join(tmp, "questions"))
+        print(f"Questions: {num_questions:,} in {num_categories} categories "
+              f"(generated in {time.perf_counter() - start:.1f}s)")
+
+        paths = [tmp, HERE]
+        category = f"Category{num_categories // 2}"
+        runs = [
+            ("interpreter only", "pass"),
+            ("inline dict", "from inline_questions import QUESTIONS_DB\n"
+                            "categories = list(QUESTIONS_DB)\n"
+                            f"questions = QUESTIONS_DB[{category!r}]['easy']\n"
+                            "first = questions[0]"),
+            ("indexed bank", "from question_bank import QuestionBank\n"
+                             f"bank = QuestionBank({os.path.join(tmp, 'questions')!r})\n"
+                             "categories = bank.categories()\n"
+                             f"questions = bank.questions({category!r}, 'easy')\n"
+                             "first = questions[0]"),
+            ("indexed bank, full category", "from question_bank import QuestionBank\n"
+                                            f"bank = QuestionBank({os.path.join(tmp, 'questions')!r})\n"
+                                            f"questions = list(bank.questions({category!r}, 'easy'))"),
+        ]
+
+        # Compile once up front, as a first import would (even with PYTHONDONTWRITEBYTECODE set)
+        start = time.perf_counter()
+        py_compile.compile(inline_path, doraise=True)
+        print(f"Compiling the inline module to .pyc: {(time.perf_counter() - start) * 1000:,.0f} ms\n")
+
+        print(f"{'approach':<30} {'cold start':>12} {'peak RSS':>12}")
+        for label, code in runs:
+            results = [_cold_run(code, paths) for _ in range(repeats)]
+            seconds = min(r[0] for r in results)
+            rss = min(r[1] for r in results)
+            print(f"{label:<30} {seconds * 1000:>9,.0f} ms {rss:>8,.1f} MiB")
+
+# Cost per new record: rewriting the whole JSON file (old save_high_scores)
+# vs the batched append-only store, starting from existing_scores scores
+def bench_highscores(existing_scores, num_records, durable):
+    rng = random.Random(2)
+    keys = [(f"Category{c}", difficulty) for c in range(50) for difficulty in ("easy", "hard")]
+    existing = [(f"Player{rng.randrange(existing_scores)}", *rng.choice(keys), rng.randrange(100))
+                for _ in range(existing_scores)]
+    records = [(f"Player{rng.randrange(existing_scores)}", *rng.choice(keys), 100 + i) for i in range(num_records)]
+    print(f"Existing scores: {existing_scores:,}  New records: {num_records:,}  fsync: {durable}")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        legacy_path = os.path.join(tmp, "legacy.json")
+        high_scores = {f"{player}|{category}_{difficulty}": score for player, category, difficulty, score in existing}
+        start = time.perf_counter()
+        for player, category, difficulty, score in records:
+            high_scores[f"{player}|{category}_{difficulty}"] = score
+            with open(legacy_path, "w") as f:
+                json.dump(high_scores, f, indent=4)
+                if durable:
+                    f.flush()
+                    os.fsync(f.fileno())
+        legacy = time.perf_counter() - start
+
+        store = HighScoreStore(os.path.join(tmp, "scores.json"), durable=durable)
+        for record in existing:
+            store.record(*record)
+        store.compact()
+        start = time.perf_counter()
+        for record in records:
+            store.record(*record)
+        batched = time.perf_counter() - start
+        store.compact()  # Every key in the snapshot, as after a long run
+        expected = {key: store.top(*key, 10) for key in keys}
+        player, category, difficulty, _ = records[-1]
+        expected_best = store.personal_best(player, category, difficulty)
+        store.close()
+
+        start = time.perf_counter()
+        reopened = HighScoreStore(os.path.join(tmp, "scores.json"))
+        load = time.perf_counter() - start
+        start = time.perf_counter()
+        tops = {key: reopened.top(*key, 10) for key in keys}
+        top = (time.perf_counter() - start) / len(keys)
+        start = time.perf_counter()
+        best = reopened.personal_best(player, category, difficulty)
+        first_key = time.perf_counter() - start
+        matches = tops == expected and best == expected_best
+        parsed = len(reopened.leaderboards)
+        reopened.close()
+
+    print(f"Full JSON rewrite per record: {legacy / num_records * 1e6:>10,.0f} us/record")
+    print(f"Batched append-only store:    {batched / num_records * 1e6:>10,.1f} us/record ({legacy / batched:,.0f}x)")
+    print(f"Store open: {load * 1000:,.1f} ms  top-10 query from the index: {top * 1e6:,.1f} us  "
+          f"first personal best in a key: {first_key * 1000:,.1f} ms")
+    print(f"Keys parsed: {parsed} of {len(keys)}  Results match before and after reopening: {matches}")
+
+# Sessions/sec and answer latency with num_players simulated players connected
+# at once to a quiz server running in its own process
+def bench_server(num_players, think_time, question_timeout):
+    from quiz_load import print_load_report, run_load
+
+    with tempfile.TemporaryDirectory() as tmp:
+        server = subprocess.Popen([sys.executable, os.path.join(HERE, "quiz_server.py"), "--port", "0",
+                                   "--timeout", str(question_timeout),
+                                   "--scores", os.path.join(tmp, "high_scores.json")],
+                                  stdout=subprocess.PIPE, text=True)
+        try:
+            port = int(server.stdout.readline().split()[-1])
+            print(f"Players: {num_players:,} concurrent  Think time: up to {think_time * 1000:.0f} ms per answer")
+            print_load_report(*asyncio.run(run_load("127.0.0.1", port, num_players, think_time)))
+        finally:
+            server.terminate()
+            server.wait()
+
+# Adaptive selection cost as the question list grows: build time, then
+# select + record per answer for simulated players of varying ability
+def bench_selection(sizes, answers):
+    print(f"{'questions':>10} {'build':>10} {'restore':>10} {'select':>10} {'record':>10} {'matches':>8}")
+    for size in sizes:
+        rng = random.Random(size)
+        stats = QuestionStats(size)
+        for index in range(size):  # Pre-existing answer history
+            attempts = rng.randrange(50)
+            stats.attempts[index] = attempts
+            stats.correct[index] = rng.randint(0, attempts)
+        start = time.perf_counter()
+        selector = AdaptiveSelector(stats, rng=rng)
+        build = time.perf_counter() - start
+
+        select_seconds = record_seconds = 0.0
+        player = PlayerModel(rng.gauss(0, 1))
+        asked = set()
+        for i in range(answers):
+            if i % 20 == 0:  # New player every 20 answers
+                player = PlayerModel(rng.gauss(0, 1))
+                asked = set()
+            start = time.perf_counter()
+            index = selector.select(player, asked)
+            select_seconds += time.perf_counter() - start
+            asked.add(index)
+            start = time.perf_counter()
+            selector.record(index, rng.random() < 0.6, rng.uniform(1, 20), player)
+            record_seconds += time.perf_counter() - start
+
+        # Save the stats and selector next to another large list, then time what a
+        # quiz start costs: opening the store and restoring this list's selector
+        with tempfile.TemporaryDirectory() as tmp:
+            store = QuestionStatsStore(os.path.join(tmp, "question_stats.bin"))
+            store.groups[("Science", "easy")] = stats
+            store.selectors[("Science", "easy")] = selector
+            store.get("Other", "hard", size)
+            store.save()
+            start = time.perf_counter()
+            restored = QuestionStatsStore(store.path).selector("Science", "easy", size)
+            restore = time.perf_counter() - start
+        matches = (restored.bin_of == selector.bin_of and restored.slot_of == selector.slot_of
+                   and restored.slots == selector.slots
+                   and all(a.values == b.values and a.tree == b.tree for a, b in zip(restored.trees, selector.trees)))
+        print(f"{size:>10,} {build * 1000:>7,.0f} ms {restore * 1000:>7,.1f} ms {select_seconds / answers * 1e6:>7.1f} us "
+              f"{record_seconds / answers * 1e6:>7.1f} us {str(matches):>8}")
+
+# Record num_sessions scripted quizzes (adaptive selection, simulated players)
+# to a session log, then replay the log through QuizSession against a fresh
+# high-score store with per-stage timings
+def bench_replay(num_sessions, num_questions, num_categories, durable):
+    from question_bank import QuestionBank
+    from quiz_session import (QuizSession, StageTimings, append_session_log, print_timings,
+                              read_session_log, replay_log)
+
+    rng = random.Random(4)
+    with tempfile.TemporaryDirectory() as tmp:
+        bank_path = os.path.join(tmp, "questions")
+        build_question_bank(synthetic_questions(num_questions, num_categories), bank_path)
+        bank = QuestionBank(bank_path)
+        groups = [(category, difficulty) for category in bank.categories() for difficulty in bank.difficulties(category)]
+        selectors = {}
+        log_path = os.path.join(tmp, "quiz_sessions.jsonl")
+        start = time.perf_counter()
+        for i in range(num_sessions):
+            category, difficulty = rng.choice(groups)
+            questions = bank.questions(category, difficulty)
+            if (category, difficulty) not in selectors:
+                selectors[category, difficulty] = AdaptiveSelector(QuestionStats(len(questions)), rng=rng)
+            session = QuizSession(questions, category, difficulty, f"Player{rng.randrange(num_sessions // 10 + 1)}",
+                                  selector=selectors[category, difficulty], player_model=PlayerModel(rng.gauss(0, 1)),
+                                  max_questions=10)
+            for _ in range(session.total_questions):
+                _, question = session.next_question()
+                choice = question["answer"] if rng.random() < 0.6 else rng.randrange(len(question["options"]))
+                session.answer(chr(65 + choice), rng.uniform(1, 20))
+            append_session_log(log_path, session)
+        print(f"Recorded {num_sessions:,} scripted sessions in {time.perf_counter() - start:.1f}s "
+              f"({os.path.getsize(log_path) / 2**20:,.1f} MiB log, {num_questions:,} questions)")
+
+        timings = StageTimings()
+        high_scores = HighScoreStore(os.path.join(tmp, "high_scores.json"), durable=durable)
+        try:
+            sessions, mismatches, seconds, per_session = replay_log(bank, read_session_log(log_path),
+                                                                    high_scores, timings)
+        finally:
+            high_scores.close()
+    print(f"Replayed {sessions:,} sessions in {seconds:.2f}s ({sessions / seconds:,.0f} sessions/sec, "
+          f"fsync={durable}); scores match the recording: {mismatches == 0}")
+    timings.stages["session"] = per_session
+    print_timings(timings)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Quiz master benchmarks")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+    coldstart = sub.add_parser("coldstart", help="Start-up time and memory: inline QUESTIONS_DB vs indexed bank")
+    coldstart.add_argument("--questions", type=int, default=300_000)
+    coldstart.add_argument("--categories", type=int, default=50)
+    coldstart.add_argument("--repeats", type=int, default=3)
+    scores = sub.add_parser("highscores", help="High-score write cost: full JSON rewrite vs batched store")
+    scores.add_argument("--existing", type=int, default=100_000)
+    scores.add_argument("--records", type=int, default=500)
+    scores.add_argument("--no-fsync", dest="durable", action="store_false")
+    server = sub.add_parser("server", help="Concurrent quiz server: sessions/sec and p99 answer latency")
+    server.add_argument("--players", type=int, default=1000)
+    server.add_argument("--think-time", type=float, default=0.05, help="Max seconds before each answer")
+    server.add_argument("--timeout", type=float, default=30.0, help="Server per-question timeout")
+    selection = sub.add_parser("selection", help="Adaptive question selection cost vs question count")
+    selection.add_argument("--sizes", type=int, nargs="+", default=[1_000, 10_000, 100_000, 1_000_000])
+    selection.add_argument("--answers", type=int, default=50_000)
+    replay = sub.add_parser("replay", help="Replay recorded sessions headlessly: throughput and stage latencies")
+    replay.add_argument("--sessions", type=int, default=100_000)
+    replay.add_argument("--questions", type=int, default=100_000)
+    replay.add_argument("--categories", type=int, default=20)
+    replay.add_argument("--no-fsync", dest="durable", action="store_false")
+    args = parser.parse_args()
+
+    if args.benchmark == "coldstart":
+        bench_coldstart(args.questions, args.categories, args.repeats)
+    elif args.benchmark == "highscores":
+        bench_highscores(args.existing, args.records, args.durable)
+    elif args.benchmark == "server":
+        bench_server(args.players, args.think_time, args.timeout)
+    elif args.benchmark == "selection":
+        bench_selection(args.sizes, args.answers)
+    elif args.benchmark == "replay":
+        bench_replay(args.sessions, args.questions, args.categories, args.durable)
@@ -0,0 +1,224 @@
+import json  # Snapshot index and sections, log records
+import os    # Atomic replace, fsync and file checks
+from bisect import bisect_left, insort
+
+# High scores are kept per player and per (category, difficulty).
+# - <path>:      compacted snapshot, only ever replaced atomically (temp file + rename).
+#                The first line is a JSON index {"version": 3, "keys": [[category,
+#                difficulty, offset, length, count, top], ...]}; after it comes one
+#                JSON section per key, [[player, score], ...] best first, at offset
+#                (length bytes) past the index line. top is the key's first
+#                TOP_INDEX_SIZE entries, so small top-N queries never read a section.
+# - <path>.log:  JSON lines appended since the snapshot, one record per new personal best
+# Opening reads the index line and the log only; a key's section is parsed the
+# first time one of its scores is needed. A torn last log line from a crash is
+# ignored on load; replaying a record twice is harmless because only the higher
+# score is kept.
+LOG_SUFFIX = ".log"
+BATCH_SIZE = 64  # Pending records written to the log in one append
+COMPACT_EVERY = 10_000  # Log records before the snapshot is rewritten
+TOP_INDEX_SIZE = 10  # Leaderboard entries per key kept in the snapshot index
+LEGACY_PLAYER = "(legacy)"  # Owner of scores migrated from the old {"Category_difficulty": score} file
+
+# Persistent, batched high-score store with per-key leaderboards
+class HighScoreStore:
+    def __init__(self, path, batch_size=BATCH_SIZE, compact_every=COMPACT_EVERY, durable=True):
+        self.path = path
+        self.log_path = path + LOG_SUFFIX
+        self.batch_size = batch_size
+        self.compact_every = compact_every
+        self.durable = durable  # fsync every flush
+        self.best = {}  # (player, category, difficulty) -> (score, seq), for loaded keys
+        self.leaderboards = {}  # (category, difficulty) -> sorted [(-score, seq, player)], for loaded keys
+        self.sections = {}  # (category, difficulty) -> (offset, length, count, top) of snapshot keys not loaded yet
+        self.tail = {}  # (category, difficulty) -> [(player, score)] log records for keys not loaded yet
+        self.body_start = 0  # Snapshot offset of the first section
+        self.pending = {}  # (player, category, difficulty) -> score, not yet in the log
+        self.seq = 0  # Arrival order; earlier scores win ties
+        self.log_records = 0
+        self._load()
+        self.log = open(self.log_path, "a")
+
+    def _load(self):
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                try:
+                    data = json.loads(f.readline())
+                except ValueError:
+                    f.seek(0)  # Old indented file
+                    data = json.load(f)
+                self.body_start = f.tell()
+            if "version" not in data:
+                # Old format: {"Category_difficulty": score} with no players
+                for key, score in data.items():
+                    category, _, difficulty = key.rpartition("_")
+                    self._apply(LEGACY_PLAYER, category, difficulty, score)
+            elif data["version"] == 2:
+                # Previous single-object snapshot, loaded in full and rewritten as v3 on compaction
+                for category, difficulty, board in data["leaderboards"]:
+                    for player, score in board:
+                        self._apply(player, category, difficulty, score)
+            else:
+                for category, difficulty, offset, length, count, top in data["keys"]:
+                    self.sections[(category, difficulty)] = (offset, length, count, top)
+        if os.path.exists(self.log_path):
+            good = 0  # Byte offset after the last complete record
+            with open(self.log_path, "rb") as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        record = None
+                    if record is None or not line.endswith(b"\n"):
+                        break  # Torn write at the end of the log
+                    key = (record["c"], record["d"])
+                    if key in self.sections:
+                        self.tail.setdefault(key, []).append((record["p"], record["s"]))
+                    else:
+                        self._apply(record["p"], record["c"], record["d"], record["s"])
+                    self.log_records += 1
+                    good += len(line)
+            if good != os.path.getsize(self.log_path):
+                os.truncate(self.log_path, good)  # So new records are not appended to the torn line
+
+    # Leaderboard of a key; on first use its snapshot section and buffered log
+    # records are applied, so only the keys actually used are ever parsed
+    def _board(self, category, difficulty):
+        key = (category, difficulty)
+        board = self.leaderboards.get(key)
+        if board is None:
+            board = self.leaderboards[key] = []
+            section = self.sections.pop(key, None)
+            if section is not None:
+                with open(self.path, "rb") as f:
+                    f.seek(self.body_start + section[0])
+                    for player, score in json.loads(f.read(section[1])):
+                        self._apply(player, category, difficulty, score)
+            for player, score in self.tail.pop(key, ()):
+                self._apply(player, category, difficulty, score)
+        return board
+
+    # Update memory only; returns True if score is a new personal best
+    def _apply(self, player, category, difficulty, score):
+        board = self._board(category, difficulty)
+        key = (player, category, difficulty)
+        old = self.best.get(key)
+        if old is not None and score <= old[0]:
+            return False
+        if old is not None:
+            del board[bisect_left(board, (-old[0], old[1], player))]
+        self.seq += 1
+        self.best[key] = (score, self.seq)
+        insort(board, (-score, self.seq, player))
+        return True
+
+    # Player's best score for a category/difficulty, or None
+    def personal_best(self, player, category, difficulty):
+        if (category, difficulty) in self.sections:
+            self._board(category, difficulty)
+        entry = self.best.get((player, category, difficulty))
+        return None if entry is None else entry[0]
+
+    # Record a finished quiz; returns True if it beat the player's previous best.
+    # Writes are coalesced per key and appended in batches.
+    def record(self, player, category, difficulty, score):
+        if not self._apply(player, category, difficulty, score):
+            return False
+        self.pending[(player, category, difficulty)] = score
+        if len(self.pending) >= self.batch_size:
+            self.flush()
+        return True
+
+    # Top n (player, score) pairs for a category/difficulty, best first. Served
+    # from the snapshot index when it covers n and the key has no newer records.
+    def top(self, category, difficulty, n=10):
+        key = (category, difficulty)
+        section = self.sections.get(key)
+        if section is not None and key not in self.tail:
+            _, _, count, top = section
+            if n <= len(top) or count == len(top):
+                return [(player, score) for player, score in top[:n]]
+        if section is None and key not in self.leaderboards:
+            return []
+        board = self._board(category, difficulty)
+        return [(player, -negative) for negative, _, player in board[:n]]
+
+    # Player's rank (1 = best) for a category/difficulty, or None
+    def rank(self, player, category, difficulty):
+        if (category, difficulty) in self.sections:
+            self._board(category, difficulty)
+        entry = self.best.get((player, category, difficulty))
+        if entry is None:
+            return None
+        board = self.leaderboards[(category, difficulty)]
+        return bisect_left(board, (-entry[0], entry[1], player)) + 1
+
+    # Every best score of one player as {(category, difficulty): score}
+    def player_scores(self, player):
+        for category, difficulty in list(self.sections):
+            self._board(category, difficulty)
+        return {(category, difficulty): entry[0]
+                for (name, category, difficulty), entry in self.best.items() if name == player}
+
+    # Append pending records to the log in one write
+    def flush(self):
+        if not self.pending:
+            return
+        lines = "".join(json.dumps({"p": player, "c": category, "d": difficulty, "s": score}) + "\n"
+                        for (player, category, difficulty), score in self.pending.items())
+        self.log.write(lines)
+        self.log.flush()
+        if self.durable:
+            os.fsync(self.log.fileno())
+        self.log_records += len(self.pending)
+        self.pending.clear()
+        if self.log_records >= self.compact_every:
+            self.compact()
+
+    # Rewrite the snapshot (temp file + rename), then empty the log. Loaded keys
+    # are written from memory; sections of keys never loaded are copied unparsed.
+    def compact(self):
+        for category, difficulty in list(self.tail):
+            self._board(category, difficulty)  # Keys with log records must be rewritten
+        keys, sections = [], []
+        offset = 0
+        old = open(self.path, "rb") if self.sections else None
+        try:
+            for key in list(self.sections) + [key for key, board in self.leaderboards.items() if board]:
+                if key in self.sections:
+                    old_offset, length, count, top = self.sections[key]
+                    old.seek(self.body_start + old_offset)
+                    section = old.read(length)
+                else:
+                    board = [[player, -negative] for negative, _, player in self.leaderboards[key]]
+                    section = json.dumps(board).encode("utf-8")
+                    count, top = len(board), board[:TOP_INDEX_SIZE]
+                keys.append([*key, offset, len(section), count, top])
+                sections.append(section)
+                offset += len(section)
+        finally:
+            if old is not None:
+                old.close()
+        index = json.dumps({"version": 3, "keys": keys}).encode("utf-8") + b"\n"
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(index)
+            f.writelines(sections)
+            f.flush()
+            if self.durable:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+        self.body_start = len(index)
+        self.sections = {(category, difficulty): (offset, length, count, top)
+                         for category, difficulty, offset, length, count, top in keys
+                         if (category, difficulty) not in self.leaderboards}
+        # Pending records are in the snapshot too; a crash before the truncate
+        # only means the old log is replayed onto it
+        self.pending.clear()
+        self.log.close()
+        self.log = open(self.log_path, "w")
+        self.log_records = 0
+
+    def close(self):
+        self.flush()
+        self.log.close()
@@ -0,0 +1,163 @@
+import json     # Question records and the index
+import mmap     # Lazy access to the question data file
+import os       # File checks and temp files
+import sys      # Command-line arguments
+import tempfile  # Per-group spill files while building
+from array import array
+
+# On-disk question bank
+# - <path>.jsonl:      one JSON question per line, grouped by category and difficulty
+# - <path>.index.json: {"categories": {category: {difficulty: [offset, length, count]}}}
+# Listing categories only reads the small index; a category/difficulty is
+# parsed from the memory-mapped data file the first time it is used.
+DATA_SUFFIX = ".jsonl"
+INDEX_SUFFIX = ".index.json"
+
+# Read-only question list backed by one slice of the mapped data file;
+# questions are decoded on access and cached
+class QuestionList:
+    def __init__(self, data, offset, length, count):
+        self.data = data  # mmap of the whole data file
+        self.offset = offset
+        self.end = offset + length
+        self.count = count
+        self.starts = None  # Line start offsets, built on first random access
+        self.cache = {}
+
+    def __len__(self):
+        return self.count
+
+    def _line_starts(self):
+        if self.starts is None:
+            starts = array("Q")
+            position = self.offset
+            while position < self.end:
+                starts.append(position)
+                position = self.data.find(b"\n", position, self.end) + 1
+            self.starts = starts
+        return self.starts
+
+    def __getitem__(self, index):
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("question index out of range")
+        question = self.cache.get(index)
+        if question is None:
+            start = self._line_starts()[index]
+            end = self.data.find(b"\n", start, self.end)
+            question = self.cache[index] = json.loads(self.data[start:end])
+        return question
+
+    def __iter__(self):
+        for index in range(self.count):
+            yield self[index]
+
+# Question bank stored as a data file plus a category/difficulty index
+class QuestionBank:
+    def __init__(self, path):
+        with open(path + INDEX_SUFFIX) as f:
+            self.index = json.load(f)["categories"]
+        self.data_path = path + DATA_SUFFIX
+        self.data = None  # Mapped on first question access
+        self.lists = {}
+
+    def categories(self):
+        return list(self.index)
+
+    def difficulties(self, category):
+        return list(self.index.get(category, {}))
+
+    def questions(self, category, difficulty):
+        key = (category, difficulty)
+        if key not in self.lists:
+            offset, length, count = self.index[category][difficulty]
+            if self.data is None:
+                with open(self.data_path, "rb") as f:
+                    self.data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            self.lists[key] = QuestionList(self.data, offset, length, count)
+        return self.lists[key]
+
+# Same interface over an in-memory {category: {difficulty: [questions]}} dict
+class DictQuestionBank:
+    def __init__(self, questions_db):
+        self.questions_db = questions_db
+
+    def categories(self):
+        return list(self.questions_db)
+
+    def difficulties(self, category):
+        return list(self.questions_db.get(category, {}))
+
+    def questions(self, category, difficulty):
+        return self.questions_db[category][difficulty]
+
+# Yield (category, difficulty, question) from a nested questions dict
+def iter_questions_db(questions_db):
+    for category, difficulties in questions_db.items():
+        for difficulty, questions in difficulties.items():
+            for question in questions:
+                yield category, difficulty, question
+
+# Yield (category, difficulty, question) from a JSON-lines file whose records
+# carry "category" and "difficulty" next to the question fields
+def iter_questions_jsonl(path):
+    with open(path) as f:
+        for line in f:
+            if line.strip():
+                record = json.loads(line)
+                yield record.pop("category"), record.pop("difficulty"), record
+
+# Build <path>.jsonl and <path>.index.json from (category, difficulty, question)
+# records in any order; groups are spilled to temp files so memory stays bounded
+def build_question_bank(records, path):
+    with tempfile.TemporaryDirectory() as tmp:
+        spills = {}  # (category, difficulty) -> [file, count]
+        try:
+            for category, difficulty, question in records:
+                key = (category, difficulty)
+                if key not in spills:
+                    spills[key] = [open(os.path.join(tmp, str(len(spills))), "w+b"), 0]
+                spills[key][0].write(json.dumps(question, separators=(",", ":")).encode("utf-8") + b"\n")
+                spills[key][1] += 1
+
+            index = {}
+            offset = 0
+            with open(path + DATA_SUFFIX + ".tmp", "wb") as out:
+                for (category, difficulty), (spill, count) in spills.items():
+                    length = spill.tell()
+                    spill.seek(0)
+                    while True:
+                        block = spill.read(1 << 20)
+                        if not block:
+                            break
+                        out.write(block)
+                    index.setdefault(category, {})[difficulty] = [offset, length, count]
+                    offset += length
+        finally:
+            for spill, _ in spills.values():
+                spill.close()
+
+    os.replace(path + DATA_SUFFIX + ".tmp", path + DATA_SUFFIX)
+    with open(path + INDEX_SUFFIX + ".tmp", "w") as f:
+        json.dump({"version": 1, "categories": index}, f)
+    os.replace(path + INDEX_SUFFIX + ".tmp", path + INDEX_SUFFIX)  # Index last: readers never see a partial bank
+    return sum(count for _, count in spills.values())
+
+# Open the on-disk bank at path if it exists, else wrap the inline dict
+def open_question_bank(path, fallback_db):
+    if os.path.exists(path + INDEX_SUFFIX):
+        return QuestionBank(path)
+    return DictQuestionBank(fallback_db)
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print("Usage: python question_bank.py <questions.jsonl | builtin> <bank path>")
+        sys.exit(1)
+    if sys.argv[1] == "builtin":
+        from quiz_master import QUESTIONS_DB  # Export the inline questions
+        records = iter_questions_db(QUESTIONS_DB)
+    else:
+        records = iter_questions_jsonl(sys.argv[1])
+    total = build_question_bank(records, sys.argv[2])
+    print(f"Wrote {total:,} questions to {sys.argv[2]}{DATA_SUFFIX}")
@@ -0,0 +1,73 @@
+import argparse  # Command-line options
+import asyncio   # Many simulated players in one process
+import json      # Line protocol messages
+import random    # Simulated answers and think time
+import time      # Latency measurements
+
+from quiz_server import DEFAULT_PORT
+
+# One simulated player: connects, plays a whole quiz, and appends the round
+# trip of every answer (answer sent -> result received) to latencies
+async def simulate_player(host, port, player, rng, think_time, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        welcome = json.loads(await reader.readline())
+        category = rng.choice(sorted(welcome["categories"]))
+        difficulty = rng.choice(welcome["categories"][category])
+        writer.write(json.dumps({"type": "start", "player": player, "category": category,
+                                 "difficulty": difficulty}).encode("utf-8") + b"\n")
+        while True:
+            message = json.loads(await reader.readline())
+            if message["type"] == "final":
+                return message["score"]
+            if message["type"] == "error":
+                raise RuntimeError(message["message"])
+            await asyncio.sleep(rng.uniform(0, think_time))
+            choice = chr(65 + rng.randrange(len(message["options"])))  # Random guess
+            writer.write(json.dumps({"type": "answer", "number": message["number"], "choice": choice}).encode("utf-8") + b"\n")
+            start = time.perf_counter()
+            result = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            if result["type"] != "result":
+                raise RuntimeError(f"unexpected {result['type']} message")
+    finally:
+        writer.close()
+
+# Run num_players concurrent players; returns (sessions, failures, seconds, latencies)
+async def run_load(host, port, num_players, think_time=0.05, seed=0):
+    rng = random.Random(seed)
+    latencies = []
+    start = time.perf_counter()
+    results = await asyncio.gather(*(simulate_player(host, port, f"Player{i}", random.Random(rng.random()),
+                                                     think_time, latencies)
+                                     for i in range(num_players)), return_exceptions=True)
+    seconds = time.perf_counter() - start
+    failures = [result for result in results if isinstance(result, BaseException)]
+    return num_players - len(failures), failures, seconds, latencies
+
+# Value at fraction p (0-1) of a sorted list
+def percentile(sorted_values, p):
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(p * len(sorted_values)))]
+
+def print_load_report(sessions, failures, seconds, latencies):
+    latencies = sorted(latencies)
+    print(f"Sessions completed: {sessions:,} in {seconds:.2f}s ({sessions / seconds:,.1f} sessions/sec)")
+    print(f"Failed sessions: {len(failures)}")
+    for failure in failures[:5]:
+        print(f"  {failure!r}")
+    print(f"Answers: {len(latencies):,}  latency p50 {percentile(latencies, 0.50) * 1000:.2f} ms"
+          f"  p99 {percentile(latencies, 0.99) * 1000:.2f} ms  max {percentile(latencies, 1.0) * 1000:.2f} ms")
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for quiz_server.py")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--players", type=int, default=1000, help="Concurrent simulated players")
+    parser.add_argument("--think-time", type=float, default=0.05, help="Max seconds before each answer")
+    args = parser.parse_args()
+    print_load_report(*asyncio.run(run_load(args.host, args.port, args.players, args.think_time)))
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
 import time  # For tracking time per question
-import json  # For saving high scores persistently
-import os    # To check if high score file exists
+
+from adaptive_selection import PlayerModel, QuestionStatsStore
+from high_scores import HighScoreStore
+from question_bank import open_question_bank
+from quiz_session import LEADERBOARD_SIZE, QuizSession, append_session_log  # Scoring without console I/O
 
 # Quiz Database structured as nested dictionaries by category and difficulty
 QUESTIONS_DB = {
@@ -23,21 +26,11 @@ QUESTIONS_DB = {
     # You can add "History" and "Sports" like Science
 }
 
-HIGH_SCORES_FILE = "high_scores.json"  # File to store persistent high scores
-
-# Load high scores from a JSON file
-def load_high_scores():
-    if not os.path.exists(HIGH_SCORES_FILE):
-        # If file doesn't exist, create an empty JSON file
-        with open(HIGH_SCORES_FILE, 'w') as f:
-            json.dump({}, f)
-    with open(HIGH_SCORES_FILE, 'r') as f:
-        return json.load(f)
-
-# Save high scores back to the JSON file
-def save_high_scores(high_scores):
-    with open(HIGH_SCORES_FILE, 'w') as f:
-        json.dump(high_scores, f, indent=4)
+HIGH_SCORES_FILE = "high_scores.json"  # Snapshot of persistent high scores (new records go to high_scores.json.log)
+QUESTION_STATS_FILE = "question_stats.bin"  # Per-question answer counts used for adaptive selection
+MAX_QUIZ_QUESTIONS = 10  # Questions asked per quiz (fewer if the list is shorter)
+QUESTION_BANK_PATH = "questions"  # questions.index.json + questions.jsonl; QUESTIONS_DB is used if absent
+SESSION_LOG_FILE = "quiz_sessions.jsonl"  # Every finished quiz, replayable with quiz_session.py
 
 # Function to visually show a text-based progress bar
 def show_progress(current, total):
@@ -48,29 +41,37 @@ def show_progress(current, total):
 
 # Main quiz function
 def quiz():
-    high_scores = load_high_scores()
+    # Categories come from the bank's index; only the chosen questions are loaded
+    bank = open_question_bank(QUESTION_BANK_PATH, QUESTIONS_DB)
 
     print("=== QUIZ MASTER ===")
-    categories = list(QUESTIONS_DB.keys())
+    categories = bank.categories()
     print("Categories:", ", ".join(categories))
 
     category = input("Select a category: ").strip()
-    if category not in QUESTIONS_DB:
+    if category not in categories:
         print("Invalid category selected.")
         return
 
     difficulty = input("Select difficulty (easy/hard): ").strip()
-    if difficulty not in QUESTIONS_DB[category]:
+    if difficulty not in bank.difficulties(category):
         print("Invalid difficulty selected.")
         return
 
-    questions = QUESTIONS_DB[category][difficulty]
-    total_questions = len(questions)
-    score = 0  # Initialize player score
-    wrong_answers = []  # Track questions answered incorrectly
+    player = input("Player name: ").strip() or "Player"
+
+    questions = bank.questions(category, difficulty)
 
-    # Iterate over all questions
-    for idx, q in enumerate(questions, 1):
+    # Pick each question adaptively from past answer stats and this player's results so far
+    # The selector's bins and trees are restored from the stats file, not rebuilt
+    question_stats = QuestionStatsStore(QUESTION_STATS_FILE)
+    selector = question_stats.selector(category, difficulty, len(questions))
+    session = QuizSession(questions, category, difficulty, player, selector=selector,
+                          player_model=PlayerModel(), max_questions=MAX_QUIZ_QUESTIONS)
+    total_questions = session.total_questions
+
+    for _ in range(total_questions):
+        idx, q = session.next_question()
         print(f"Question {idx}/{total_questions}: {q['question']}")
         show_progress(idx, total_questions)
 
@@ -79,41 +80,42 @@ def quiz():
             print(f"{chr(65 + i)}) {opt}", end="    ")
         print()
 
-        # Start timing the response
-        start_time = time.time()
-        user_answer = input("Your answer: ").strip().upper()
-        elapsed = time.time() - start_time  # Calculate time taken to answer
-
-        # Convert A-D to index (0-3)
-        answer_index = ord(user_answer) - 65
+        # Time only the wait for the answer
+        start_time = time.perf_counter()
+        user_answer = input("Your answer: ")
+        elapsed = time.perf_counter() - start_time
 
-        # Check if user answer is correct
-        if 0 <= answer_index < len(q["options"]) and answer_index == q["answer"]:
+        # The session converts A-D to an index, scores it and updates the selector
+        if session.answer(user_answer, elapsed)["correct"]:
             print("✅ Correct! (+10 points)")
-            score += 10
         else:
             correct_opt = q["options"][q["answer"]]
             print(f"❌ Wrong! Correct Answer: {correct_opt}")
-            # Save incorrect question for review
-            wrong_answers.append((q["question"], q["options"], q["answer"]))
-
         print(f"Time: {elapsed:.2f} seconds\n")
 
+    question_stats.save()
+    score = session.score
     print(f"FINAL SCORE: {score}/{total_questions * 10} ({score // 10}/{total_questions} correct)")
 
-    # Check if user beat their high score and update it
-    key = f"{category}_{difficulty}"
-    if key not in high_scores or score > high_scores[key]:
-        high_scores[key] = score
-        save_high_scores(high_scores)
-        print(f"🎉 New personal best in {category} ({difficulty})!")
-    else:
-        print(f"Your best score in {category} ({difficulty}) is: {high_scores[key]}")
+    # Check if the player beat their personal best and show the leaderboard
+    session.high_scores = HighScoreStore(HIGH_SCORES_FILE)
+    try:
+        result = session.finish(LEADERBOARD_SIZE)
+        if result["new_best"]:
+            print(f"🎉 New personal best in {category} ({difficulty})!")
+        else:
+            print(f"Your best score in {category} ({difficulty}) is: {result['best']}")
+        print(f"\nTop {LEADERBOARD_SIZE} in {category} ({difficulty}):")
+        for rank, (name, best) in enumerate(result["top"], 1):
+            print(f"{rank}. {name:<20} {best}")
+    finally:
+        session.high_scores.close()
+    append_session_log(SESSION_LOG_FILE, session)
 
     # Show review of wrong answers after quiz
-    if wrong_answers:
+    if session.wrong_answers:
         print("\nReview of incorrect answers:")
-        for q, options, correct_idx in wrong_answers:
+        for q, options, correct_idx in session.wrong_answers:
             print(f"Q: {q}")
             for i, opt in enumerate(options):
                 tag = "✅" if i == correct_idx else " "
@@ -0,0 +1,154 @@
+import argparse  # Command-line options
+import asyncio   # One task per connected player
+import json      # Line protocol messages
+import signal    # Flush high scores on SIGTERM
+
+from high_scores import HighScoreStore
+from question_bank import open_question_bank
+from quiz_master import HIGH_SCORES_FILE, QUESTION_BANK_PATH, QUESTIONS_DB
+from quiz_session import LEADERBOARD_SIZE, QuizSession
+
+# Line protocol: one JSON object per line in each direction
+#   server: {"type": "welcome", "categories": {category: [difficulties]}}
+#   client: {"type": "start", "player": name, "category": c, "difficulty": d}
+#   server: {"type": "question", "number": i, "total": n, "question": q, "options": [...], "timeout": s}
+#   client: {"type": "answer", "number": i, "choice": "A"}   (late answers to earlier questions are ignored)
+#   server: {"type": "result", "correct": bool, "answer": index, "elapsed": s, "timed_out": bool}
+#   ...one question/answer/result round per question...
+#   server: {"type": "final", "score": s, "max": m, "new_best": bool, "best": b, "top": [[player, score]]}
+# Errors are reported as {"type": "error", "message": text} before the connection closes.
+QUESTION_TIMEOUT = 30.0  # Seconds to answer before the question counts as wrong
+START_TIMEOUT = 60.0  # Seconds to send the start message
+FLUSH_INTERVAL = 1.0  # Seconds between high-score log flushes
+SERVER_BATCH_SIZE = 1_000_000  # Never flush on record(); the flush task does it
+DEFAULT_PORT = 8765
+
+class ProtocolError(Exception):
+    pass
+
+# Read one JSON message, waiting at most timeout seconds (None on timeout)
+async def read_message(reader, timeout):
+    try:
+        line = await asyncio.wait_for(reader.readline(), timeout)
+    except asyncio.TimeoutError:
+        return None
+    except ValueError:  # Line longer than the stream limit (LimitOverrunError)
+        raise ProtocolError("message too long") from None
+    if not line:
+        raise ProtocolError("connection closed")
+    try:
+        message = json.loads(line)
+    except ValueError:
+        message = None
+    if not isinstance(message, dict):
+        raise ProtocolError("messages must be one JSON object per line")
+    return message
+
+async def send_message(writer, message):
+    writer.write(json.dumps(message).encode("utf-8") + b"\n")
+    await writer.drain()
+
+# Runs one quiz session per connection on a single event loop. Sessions only
+# touch the shared high-score store between awaits, so updates never interleave.
+class QuizServer:
+    def __init__(self, bank, high_scores, question_timeout=QUESTION_TIMEOUT, timings=None):
+        self.bank = bank
+        self.high_scores = high_scores
+        self.question_timeout = question_timeout
+        self.timings = timings  # Optional StageTimings for the sessions' engine stages
+        self.active_sessions = 0
+        self.completed_sessions = 0
+
+    async def handle(self, reader, writer):
+        self.active_sessions += 1
+        try:
+            await self.run_session(reader, writer)
+            self.completed_sessions += 1
+        except ProtocolError as e:
+            try:
+                await send_message(writer, {"type": "error", "message": str(e)})
+            except ConnectionError:
+                pass
+        except ConnectionError:
+            pass  # Player disconnected mid-quiz; nothing is recorded
+        finally:
+            self.active_sessions -= 1
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def run_session(self, reader, writer):
+        categories = {category: self.bank.difficulties(category) for category in self.bank.categories()}
+        await send_message(writer, {"type": "welcome", "categories": categories})
+
+        start = await read_message(reader, START_TIMEOUT)
+        if start is None or start.get("type") != "start":
+            raise ProtocolError("expected a start message")
+        player = str(start.get("player") or "Player")
+        category, difficulty = start.get("category"), start.get("difficulty")
+        if category not in categories:
+            raise ProtocolError("Invalid category selected.")
+        if difficulty not in categories[category]:
+            raise ProtocolError("Invalid difficulty selected.")
+
+        loop = asyncio.get_running_loop()
+        session = QuizSession(self.bank.questions(category, difficulty), category, difficulty, player,
+                              self.high_scores, timings=self.timings)
+        for _ in range(session.total_questions):
+            idx, q = session.next_question()
+            await send_message(writer, {"type": "question", "number": idx, "total": session.total_questions,
+                                        "question": q["question"], "options": q["options"],
+                                        "timeout": self.question_timeout})
+            start_time = loop.time()
+            deadline = start_time + self.question_timeout
+            while True:
+                answer = await read_message(reader, max(0.0, deadline - loop.time()))
+                if answer is None or answer.get("number", idx) == idx:
+                    break  # Skip answers that arrived after their question timed out
+            elapsed = loop.time() - start_time
+
+            # A timeout or malformed answer counts as wrong
+            result = session.answer(answer.get("choice") if answer else None, elapsed)
+            await send_message(writer, {"type": "result", "correct": result["correct"], "answer": q["answer"],
+                                        "elapsed": round(elapsed, 3), "timed_out": answer is None})
+
+        await send_message(writer, {"type": "final", **session.finish(LEADERBOARD_SIZE)})
+
+    # Append new records to the high-score log once per interval
+    async def flush_periodically(self, interval=FLUSH_INTERVAL):
+        while True:
+            await asyncio.sleep(interval)
+            self.high_scores.flush()
+
+async def serve(host, port, bank_path=QUESTION_BANK_PATH, scores_path=HIGH_SCORES_FILE,
+                question_timeout=QUESTION_TIMEOUT, backlog=4096):
+    bank = open_question_bank(bank_path, QUESTIONS_DB)
+    high_scores = HighScoreStore(scores_path, batch_size=SERVER_BATCH_SIZE)
+    quiz_server = QuizServer(bank, high_scores, question_timeout)
+    server = await asyncio.start_server(quiz_server.handle, host, port, backlog=backlog)
+    flusher = asyncio.create_task(quiz_server.flush_periodically())
+    asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    print(f"Quiz server listening on port {server.sockets[0].getsockname()[1]}", flush=True)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        flusher.cancel()
+        high_scores.close()
+
+def main():
+    parser = argparse.ArgumentParser(description="Multi-player quiz server (JSON line protocol over TCP)")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help="0 picks a free port")
+    parser.add_argument("--timeout", type=float, default=QUESTION_TIMEOUT, help="Seconds per question")
+    parser.add_argument("--scores", default=HIGH_SCORES_FILE, help="High-score snapshot path")
+    args = parser.parse_args()
+    try:
+        asyncio.run(serve(args.host, args.port, scores_path=args.scores, question_timeout=args.timeout))
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        pass  # High scores were flushed by serve()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,226 @@
+import json  # Recorded session logs
+import math  # Histogram bucket boundaries
+import os    # Scratch high-score path for replays
+import sys   # Log path for the replay command
+import tempfile  # Replays never touch the real high scores
+import time  # perf_counter stage timings
+from array import array
+
+POINTS_PER_QUESTION = 10
+LEADERBOARD_SIZE = 5  # Entries returned by finish()
+BUCKETS_PER_DOUBLING = 8  # Histogram resolution: bucket bounds grow by 2**(1/8), about 9%
+NUM_BUCKETS = 40 * BUCKETS_PER_DOUBLING  # 1 ns up to 2**40 ns (~18 minutes)
+STAGES = ("fetch", "score", "high_score")  # Question fetch/selection, answer scoring, high-score update
+
+# Fixed-size log-bucketed histogram of durations in seconds: O(1) to record,
+# mergeable, and percentiles within one bucket (~9%) of the true value
+class LatencyHistogram:
+    def __init__(self):
+        self.buckets = array("Q", bytes(8 * NUM_BUCKETS))
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def record(self, seconds):
+        nanoseconds = seconds * 1e9
+        bucket = int(math.log2(nanoseconds) * BUCKETS_PER_DOUBLING) + 1 if nanoseconds >= 1 else 0
+        self.buckets[min(bucket, NUM_BUCKETS - 1)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other):
+        for bucket, count in enumerate(other.buckets):
+            self.buckets[bucket] += count
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    @property
+    def mean(self):
+        return self.total / self.count if self.count else 0.0
+
+    # Upper bound of the bucket holding the p-th fraction of samples (never above the max)
+    def percentile(self, p):
+        if not self.count:
+            return 0.0
+        rank = max(1, math.ceil(p * self.count))
+        seen = 0
+        for bucket, count in enumerate(self.buckets):
+            seen += count
+            if seen >= rank:
+                return min(2 ** (bucket / BUCKETS_PER_DOUBLING) / 1e9, self.max)
+        return self.max
+
+# One histogram per engine stage; pass to QuizSession to time it
+class StageTimings:
+    def __init__(self, stages=STAGES):
+        self.stages = {stage: LatencyHistogram() for stage in stages}
+
+    def record(self, stage, seconds):
+        self.stages[stage].record(seconds)
+
+    def merge(self, other):
+        for stage, histogram in other.stages.items():
+            self.stages.setdefault(stage, LatencyHistogram()).merge(histogram)
+
+def print_timings(timings):
+    print(f"{'stage':<12} {'count':>10} {'mean':>10} {'p50':>10} {'p90':>10} {'p99':>10} {'max':>10}")
+    for stage, histogram in timings.stages.items():
+        values = [histogram.mean, histogram.percentile(0.5), histogram.percentile(0.9),
+                  histogram.percentile(0.99), histogram.max]
+        print(f"{stage:<12} {histogram.count:>10,} " + " ".join(f"{value * 1e6:>8.1f}us" for value in values))
+
+# "B", " b " -> 1; "Banana", empty or missing -> -1 (always wrong)
+def choice_index(choice):
+    choice = str(choice or "").strip().upper()
+    return ord(choice) - 65 if len(choice) == 1 and "A" <= choice <= "Z" else -1
+
+# One quiz attempt with no I/O: the caller shows questions and collects answers
+# (from a terminal, a socket, a script or a recorded log) and passes in how long
+# each answer took. With a selector questions are picked adaptively, otherwise
+# in bank order. With timings, each engine stage is timed with perf_counter.
+class QuizSession:
+    def __init__(self, questions, category, difficulty, player="Player", high_scores=None,
+                 selector=None, player_model=None, max_questions=None, timings=None):
+        self.category = category
+        self.difficulty = difficulty
+        self.player = player
+        self.high_scores = high_scores
+        self.selector = selector
+        self.player_model = player_model
+        self.timings = timings
+        self.questions = questions  # The bank's list for category and difficulty
+        self.total_questions = len(self.questions) if max_questions is None else min(len(self.questions), max_questions)
+        self.number = 0  # Questions asked so far
+        self.score = 0
+        self.asked = set()
+        self.current = None  # (question index, question) awaiting an answer
+        self.wrong_answers = []  # (question, options, answer index) for the review
+        self.log = []  # [question index, choice, elapsed] per answer, for replays
+
+    @property
+    def finished(self):
+        return self.number >= self.total_questions and self.current is None
+
+    @property
+    def max_score(self):
+        return self.total_questions * POINTS_PER_QUESTION
+
+    # The next (number, question dict), or None once every question was asked.
+    # index forces a particular question, e.g. when replaying a recorded session.
+    def next_question(self, index=None):
+        if self.number >= self.total_questions:
+            return None
+        start = time.perf_counter()
+        if index is None:
+            if self.selector is not None:
+                index = self.selector.select(self.player_model, self.asked)
+            else:
+                index = self.number
+        self.asked.add(index)
+        question = self.questions[index]
+        self.current = (index, question)
+        self.number += 1
+        if self.timings is not None:
+            self.timings.record("fetch", time.perf_counter() - start)
+        return self.number, question
+
+    # Score the answer to the current question; choice is a letter (or None for
+    # no answer) and elapsed the seconds the player took
+    def answer(self, choice, elapsed):
+        start = time.perf_counter()
+        index, question = self.current
+        answer_index = choice_index(choice)
+        correct = 0 <= answer_index < len(question["options"]) and answer_index == question["answer"]
+        if correct:
+            self.score += POINTS_PER_QUESTION
+        else:
+            self.wrong_answers.append((question["question"], question["options"], question["answer"]))
+        if self.selector is not None:
+            self.selector.record(index, correct, elapsed, self.player_model)
+        self.log.append([index, choice, elapsed])
+        self.current = None
+        if self.timings is not None:
+            self.timings.record("score", time.perf_counter() - start)
+        return {"correct": correct, "answer": question["answer"], "elapsed": elapsed}
+
+    # Record the score and return the final result with the leaderboard
+    def finish(self, leaderboard_size=LEADERBOARD_SIZE):
+        result = {"score": self.score, "max": self.max_score}
+        if self.high_scores is not None:
+            start = time.perf_counter()
+            result["new_best"] = self.high_scores.record(self.player, self.category, self.difficulty, self.score)
+            result["best"] = self.high_scores.personal_best(self.player, self.category, self.difficulty)
+            result["top"] = self.high_scores.top(self.category, self.difficulty, leaderboard_size)
+            if self.timings is not None:
+                self.timings.record("high_score", time.perf_counter() - start)
+        return result
+
+    # JSON-serializable record of this session, replayable with replay_session
+    def record(self):
+        return {"player": self.player, "category": self.category, "difficulty": self.difficulty,
+                "answers": self.log, "score": self.score}
+
+# Append a finished session to a JSON-lines session log
+def append_session_log(path, session):
+    with open(path, "a", encoding="utf-8") as f:
+        f.write(json.dumps(session.record()) + "\n")
+
+def read_session_log(path):
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if line.strip():
+                yield json.loads(line)
+
+# Run a recorded session again: the same questions in the same order with the
+# same answers. Returns the finished session.
+def replay_session(bank, record, high_scores=None, timings=None):
+    session = QuizSession(bank.questions(record["category"], record["difficulty"]),
+                          record["category"], record["difficulty"], record["player"],
+                          high_scores, max_questions=len(record["answers"]), timings=timings)
+    for index, choice, elapsed in record["answers"]:
+        session.next_question(index)
+        session.answer(choice, elapsed)
+    session.finish()
+    return session
+
+# Replay every session in a log against a bank and a high-score store; returns
+# (sessions, sessions whose score differs from the recorded one, seconds, per-session histogram)
+def replay_log(bank, records, high_scores=None, timings=None):
+    sessions = mismatches = 0
+    per_session = LatencyHistogram()
+    start = time.perf_counter()
+    for record in records:
+        session_start = time.perf_counter()
+        session = replay_session(bank, record, high_scores, timings)
+        per_session.record(time.perf_counter() - session_start)
+        sessions += 1
+        mismatches += "score" in record and session.score != record["score"]
+    return sessions, mismatches, time.perf_counter() - start, per_session
+
+def main():
+    from high_scores import HighScoreStore
+    from question_bank import open_question_bank
+    from quiz_master import QUESTION_BANK_PATH, QUESTIONS_DB
+
+    if len(sys.argv) != 2:
+        print("Usage: python quiz_session.py <session log>")
+        sys.exit(1)
+    bank = open_question_bank(QUESTION_BANK_PATH, QUESTIONS_DB)
+    timings = StageTimings()
+    with tempfile.TemporaryDirectory() as tmp:
+        high_scores = HighScoreStore(os.path.join(tmp, "high_scores.json"), durable=False)
+        try:
+            sessions, mismatches, seconds, per_session = replay_log(bank, read_session_log(sys.argv[1]),
+                                                                    high_scores, timings)
+        finally:
+            high_scores.close()
+    print(f"Replayed {sessions:,} sessions in {seconds:.2f}s ({sessions / seconds if seconds else 0:,.0f} sessions/sec), "
+          f"{mismatches} score mismatches")
+    timings.stages["session"] = per_session
+    print_timings(timings)
+
+if __name__ == "__main__":
+    main()
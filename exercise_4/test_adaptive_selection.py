@@ -0,0 +1,92 @@
+import os        # Stats file path
+import random    # Deterministic answers and selection
+import tempfile  # Scratch stats file
+import unittest
+
+from adaptive_selection import PlayerModel, QuestionStatsStore
+from quiz_session import QuizSession
+
+LARGE = 1000  # Questions in the on-disk bank
+SMALL = 5     # Built-in fallback list
+
+# Every question index appears in exactly one bin slot, and nothing else does
+def assert_consistent(test, selector):
+    num_questions = len(selector.stats)
+    test.assertEqual(len(selector.bin_of), num_questions)
+    test.assertEqual(sorted(index for slots in selector.slots for index in slots), list(range(num_questions)))
+    for index in range(num_questions):
+        test.assertEqual(selector.slots[selector.bin_of[index]][selector.slot_of[index]], index)
+    for slots, tree in zip(selector.slots, selector.trees):
+        test.assertEqual(len(tree), len(slots))
+        test.assertAlmostEqual(tree.total, tree.prefix_sum(len(tree)))
+
+def answer_randomly(selector, rng, count):
+    player = PlayerModel()
+    for _ in range(count):
+        index = selector.select(player)
+        selector.record(index, rng.random() < 0.6, rng.uniform(1, 20), player)
+
+# A list that gets shorter (the bank file is removed and the built-in questions
+# are used) must never yield an index past its end, whether the selector is
+# restored from the stats file or still cached by the store
+class ShrinkingBankTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "question_stats.bin")
+        self.rng = random.Random(0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def check_small(self, store):
+        selector = store.selector("Science", "easy", SMALL, rng=random.Random(1))
+        self.assertEqual(len(selector.stats), SMALL)
+        assert_consistent(self, selector)
+        player = PlayerModel()
+        for _ in range(200):
+            self.assertLess(selector.select(player), SMALL)
+        asked = set()
+        for _ in range(SMALL):
+            asked.add(selector.select(player, asked))
+        self.assertEqual(asked, set(range(SMALL)))
+        self.assertIsNone(selector.select(player, asked))
+        return selector
+
+    def test_restored_selector_shrinks(self):
+        store = QuestionStatsStore(self.path)
+        answer_randomly(store.selector("Science", "easy", LARGE, rng=self.rng), self.rng, 2000)
+        store.save()
+
+        store = QuestionStatsStore(self.path)
+        self.check_small(store)
+        store.save()
+        store = QuestionStatsStore(self.path)
+        self.check_small(store)  # Saved at the smaller size
+
+        grown = store.selector("Science", "easy", LARGE)  # Bank restored
+        assert_consistent(self, grown)
+
+    def test_cached_selector_shrinks(self):
+        store = QuestionStatsStore(self.path)
+        answer_randomly(store.selector("Science", "easy", LARGE, rng=self.rng), self.rng, 2000)
+        selector = self.check_small(store)
+        answer_randomly(selector, self.rng, 50)
+        store.save()
+        self.check_small(QuestionStatsStore(self.path))
+
+    def test_quiz_runs_on_shorter_list(self):
+        store = QuestionStatsStore(self.path)
+        answer_randomly(store.selector("Science", "easy", LARGE, rng=self.rng), self.rng, 2000)
+        store.save()
+
+        questions = [{"question": f"Q{i}", "options": ["a", "b", "c", "d"], "answer": i % 4} for i in range(SMALL)]
+        selector = QuestionStatsStore(self.path).selector("Science", "easy", len(questions))
+        session = QuizSession(questions, "Science", "easy", selector=selector, player_model=PlayerModel(),
+                              max_questions=10)
+        while not session.finished:
+            session.next_question()
+            session.answer("A", 1.0)
+        self.assertEqual(session.number, SMALL)
+
+if __name__ == "__main__":
+    unittest.main()
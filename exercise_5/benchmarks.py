@@ -0,0 +1,446 @@
+import argparse  # For choosing which benchmark to run
+import contextlib  # For silencing report output while timing
+import io        # In-memory sink for report output
+import json      # For the old JSON data file
+import os        # For scratch file paths
+import random    # For synthetic transactions
+import signal    # For killing the writer mid-run
+import subprocess  # For crash-recovery runs in a separate process
+import sys       # Path of the current interpreter
+import tempfile  # For scratch files
+import time      # For wall-clock measurements
+from array import array
+
+from budget_storage import BudgetStorage
+from budget_tracker import show_summary
+from ledger import Ledger, date_key
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Months "YYYY-MM" covering num_years starting at start_year
+def month_range(start_year, num_years):
+    return [f"{year:04d}-{month:02d}" for year in range(start_year, start_year + num_years) for month in range(1, 13)]
+
+# Ledger with num_transactions random transactions spread over the given months
+def synthetic_ledger(num_transactions, months, num_categories, seed=0):
+    rng = random.Random(seed)
+    ledger = Ledger()
+    categories = [f"Category{i}" for i in range(num_categories)]
+    for category in categories:
+        ledger.category_id(category)
+    # Build the columns directly (sorted by date), then the aggregates in one pass
+    dates = sorted(date_key(rng.choice(months), rng.randint(1, 28)) for _ in range(num_transactions))
+    ledger.dates = array("I", dates)
+    ledger.types = array("B", (0 if rng.random() < 0.1 else 1 for _ in range(num_transactions)))
+    ledger.category_ids = array("I", (rng.randrange(num_categories) for _ in range(num_transactions)))
+    ledger.amounts = array("q", (rng.randint(100, 50_000) for _ in range(num_transactions)))
+    ledger.rebuild_aggregates()
+    for month in months:
+        for category in categories[:10]:
+            ledger.set_limit(month, category, rng.randint(10_000, 2_000_000))
+    return ledger
+
+# Load time and time to summarize every month: ledger file vs the old JSON totals
+def bench_ledger(num_transactions, num_years, num_categories):
+    months = month_range(2020, num_years)
+    start = time.perf_counter()
+    ledger = synthetic_ledger(num_transactions, months, num_categories)
+    print(f"Transactions: {num_transactions:,} over {len(months)} months, {num_categories} categories "
+          f"(generated in {time.perf_counter() - start:.1f}s)")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "budget_ledger.bin")
+        start = time.perf_counter()
+        ledger.save(path)
+        save = time.perf_counter() - start
+
+        legacy_path = os.path.join(tmp, "budget_data.json")
+        with open(legacy_path, "w") as f:
+            json.dump({month: ledger[month] for month in months}, f, indent=4)
+
+        start = time.perf_counter()
+        loaded = Ledger.load(path)
+        load = time.perf_counter() - start
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for month in months:
+                show_summary(loaded, month)
+        summarize = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with open(legacy_path) as f:
+            legacy = json.load(f)
+        legacy_load = time.perf_counter() - start
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            for month in months:
+                show_summary(legacy, month)
+        legacy_summarize = time.perf_counter() - start
+
+        size = os.path.getsize(path)
+
+    start = time.perf_counter()
+    loaded.rebuild_aggregates()
+    rebuild = time.perf_counter() - start
+    same = all(loaded[month] == ledger[month] for month in months)
+
+    print(f"Ledger file: {size / 2**20:,.1f} MiB, saved in {save:.2f}s")
+    print(f"Load ledger:                {load * 1000:>8,.0f} ms")
+    print(f"Summarize all months:       {summarize * 1000:>8,.0f} ms")
+    print(f"Old JSON totals (no transactions): load {legacy_load * 1000:,.0f} ms, "
+          f"summarize {legacy_summarize * 1000:,.0f} ms")
+    print(f"Rebuild aggregates from transactions: {rebuild:.2f}s (matches stored aggregates: {same})")
+
+# Deterministic mutation number i: mostly transactions, every 50th a budget limit
+def synthetic_op(i):
+    rng = random.Random(i)
+    month = f"{2020 + rng.randrange(3)}-{rng.randint(1, 12):02d}"
+    category = f"Category{rng.randrange(40)}"
+    if i % 50 == 49:
+        return ("limit", month, category, rng.randint(10_000, 500_000))
+    return ("add", date_key(month, rng.randint(1, 28)), rng.choice(["income", "expenses"]), category,
+            rng.randint(100, 50_000))
+
+def apply_op(ledger, op):
+    if op[0] == "limit":
+        ledger.set_limit(*op[1:])
+    else:
+        ledger.add(*op[1:])
+
+# Child process for the crash test: apply ops from start onwards until killed
+CRASH_WRITER = """
+import sys
+sys.path.insert(0, {here!r})
+from benchmarks import apply_op, synthetic_op
+from budget_storage import BudgetStorage
+from ledger import Ledger
+ledger = BudgetStorage({path!r}, snapshot_every={snapshot_every}).load_into(Ledger())
+print("ready", flush=True)
+i = {start}
+while True:
+    apply_op(ledger, synthetic_op(i))
+    i += 1
+"""
+
+# Full comparable state: columns plus every month by category name
+def _ledger_state(ledger):
+    return (ledger.dates.tolist(), ledger.types.tolist(), [ledger.categories[i] for i in ledger.category_ids],
+            ledger.amounts.tolist(), {month: ledger[month] for month in ledger.months})
+
+# Kill a writer process at random moments (including mid-snapshot) and check
+# that every recovery equals some prefix of the applied mutations
+def crash_test(rounds, snapshot_every):
+    rng = random.Random(7)
+    failures = 0
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "budget_ledger.bin")
+        reference = Ledger()
+        applied = 0  # Ops known to be in the recovered state
+        for _ in range(rounds):
+            writer = subprocess.Popen([sys.executable, "-c", CRASH_WRITER.format(
+                here=HERE, path=path, snapshot_every=snapshot_every, start=applied)],
+                stdout=subprocess.PIPE, text=True)
+            writer.stdout.readline()
+            time.sleep(rng.uniform(0.05, 0.5))
+            writer.send_signal(signal.SIGKILL)
+            writer.wait()
+
+            storage = BudgetStorage(path)
+            recovered = storage.load_into(Ledger())
+            storage.close()
+            # Advance the reference until it has as many transactions, then
+            # allow for limits logged right after the last transaction
+            while len(reference) < len(recovered):
+                apply_op(reference, synthetic_op(applied))
+                applied += 1
+            state = _ledger_state(recovered)
+            while _ledger_state(reference) != state and synthetic_op(applied)[0] == "limit":
+                apply_op(reference, synthetic_op(applied))
+                applied += 1
+            ok = _ledger_state(reference) == state
+            rebuilt = recovered.copy()
+            rebuilt.rebuild_aggregates()
+            ok = ok and _ledger_state(rebuilt) == state
+            failures += not ok
+        print(f"Crash recovery: {rounds} kills, {applied:,} mutations recovered, {failures} mismatches")
+
+# Start-up time and cost per logged entry, plus the crash-recovery check
+def bench_storage(num_transactions, log_records, entries, rounds):
+    months = month_range(2020, 5)
+    ledger = synthetic_ledger(num_transactions, months, 40)
+    with tempfile.TemporaryDirectory() as tmp:
+        for durable in (True, False):
+            path = os.path.join(tmp, f"ledger{durable}.bin")
+            storage = BudgetStorage(path, snapshot_every=10**9, durable=durable)
+            live = storage.load_into(ledger.copy())
+            storage.snapshot(wait=True)
+            start = time.perf_counter()
+            for i in range(entries):
+                apply_op(live, synthetic_op(i))
+            per_entry = (time.perf_counter() - start) / entries
+            storage.close()
+            print(f"Logged entry (fsync={durable}): {per_entry * 1e6:,.1f} us")
+
+        legacy_path = os.path.join(tmp, "budget_data.json")
+        legacy = {month: ledger[month] for month in months}
+        start = time.perf_counter()
+        for _ in range(20):
+            with open(legacy_path, "w") as f:
+                json.dump(legacy, f, indent=4)
+        print(f"Old save_data (whole JSON file, no fsync): {(time.perf_counter() - start) / 20 * 1e6:,.0f} us")
+
+        path = os.path.join(tmp, "startup.bin")
+        storage = BudgetStorage(path, snapshot_every=10**9, durable=False)
+        live = storage.load_into(ledger.copy())
+        storage.snapshot(wait=True)
+        for i in range(log_records):
+            apply_op(live, synthetic_op(i))
+        storage.close()
+        start = time.perf_counter()
+        storage = BudgetStorage(path)
+        restored = storage.load_into(Ledger())
+        startup = time.perf_counter() - start
+        storage.close()
+        print(f"Start-up with {num_transactions:,} transactions in the snapshot and {log_records:,} logged "
+              f"changes: {startup * 1000:,.0f} ms (matches: {_ledger_state(restored) == _ledger_state(live)})")
+
+    crash_test(rounds, snapshot_every=2_000)
+
+# Month x category matrix build and range queries vs summing the per-month dicts
+def bench_trends(num_transactions, num_years, num_categories, queries):
+    from trend_analytics import TrendMatrix
+
+    months = month_range(2010, num_years)
+    ledger = synthetic_ledger(num_transactions, months, num_categories)
+    print(f"Transactions: {num_transactions:,} over {len(months)} months, {num_categories} categories")
+
+    start = time.perf_counter()
+    trends = TrendMatrix(ledger)
+    build = time.perf_counter() - start
+    start = time.perf_counter()
+    trends.prefix
+    trends.prefix_squares
+    prefix = time.perf_counter() - start
+    start = time.perf_counter()
+    trends.rolling_average(), trends.month_over_month(), trends.year_over_year(), trends.anomaly_flags()
+    derived = time.perf_counter() - start
+
+    rng = random.Random(3)
+    ranges = [sorted(rng.sample(months, 2)) for _ in range(queries)]
+    start = time.perf_counter()
+    fast = [trends.range_total(first, last) for first, last in ranges]
+    fast_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    slow = []
+    for first, last in ranges[:max(queries // 100, 1)]:
+        totals = {}
+        for month in months[months.index(first):months.index(last) + 1]:
+            for category, amount in ledger.get(month, {}).get("expenses", {}).items():
+                totals[category] = totals.get(category, 0) + round(amount * 100)
+        slow.append(totals)
+    slow_seconds = (time.perf_counter() - start) / len(slow)
+    same = all(int(fast[i][trends.category_index(category)]) == cents
+               for i, totals in enumerate(slow) for category, cents in totals.items())
+
+    print(f"Build matrix (one vectorized pass): {build * 1000:,.0f} ms")
+    print(f"Prefix sums (once):                 {prefix * 1000:,.1f} ms")
+    print(f"Rolling, MoM, YoY, anomaly flags:   {derived * 1000:,.1f} ms")
+    print(f"Range total query: {fast_seconds / queries * 1e6:,.1f} us "
+          f"vs {slow_seconds * 1e6:,.0f} us summing month dicts (results match: {same})")
+
+# Exporting every month: export_summary in a loop vs export_all, serial and pooled
+def bench_export(num_months, num_transactions, workers):
+    from budget_tracker import export_summary
+    from month_summary import export_all
+
+    months = month_range(1000, (num_months + 11) // 12)[:num_months]
+    ledger = synthetic_ledger(num_transactions, months, 40)
+    print(f"Months: {len(months):,}, {num_transactions:,} transactions, 40 categories, {workers} pool workers")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        loop_dir = os.path.join(tmp, "loop")
+        os.mkdir(loop_dir)
+        cwd = os.getcwd()
+        os.chdir(loop_dir)  # export_summary writes to the current directory
+        try:
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                for month in months:
+                    export_summary(ledger, month)
+            loop = time.perf_counter() - start
+        finally:
+            os.chdir(cwd)
+        print(f"{'export_summary loop:':<28} {loop:>6.2f}s")
+
+        for label, kwargs in (("serial", {"workers": 1}), ("process pool", {"workers": workers}),
+                              ("thread pool", {"workers": workers, "use_threads": True})):
+            out_dir = os.path.join(tmp, label.replace(" ", "_"))
+            start = time.perf_counter()
+            count = export_all(ledger, out_dir, **kwargs)
+            seconds = time.perf_counter() - start
+            same = count == len(months) and all(
+                open(os.path.join(loop_dir, name)).read() == open(os.path.join(out_dir, name)).read()
+                for name in os.listdir(loop_dir))
+            print(f"{'export_all (' + label + '):':<28} {seconds:>6.2f}s (files match: {same})")
+
+# Over-budget (month, category) -> cents by scanning every limit, as the summaries do
+def _scan_over_budget(ledger):
+    over = {}
+    for month, totals in ledger.months.items():
+        for category_id, limit in totals["limits"].items():
+            spent = totals["expenses"].get(category_id, 0)
+            if spent > limit:
+                over[month, ledger.categories[category_id]] = spent - limit
+    return over
+
+# Stream of expenses against many limits: cost per entry with and without
+# incremental alerting, and the over-budget query vs scanning every limit
+def bench_alerts(num_entries, num_years, num_categories, batch_size):
+    from budget_alerts import BudgetAlerts
+
+    months = month_range(2000, num_years)
+    rng = random.Random(5)
+    categories = [f"Category{i}" for i in range(num_categories)]
+    limits = [(month, category, rng.randint(50_000, 2_000_000)) for month in months for category in categories]
+    stream = [(date_key(rng.choice(months), rng.randint(1, 28)), "expenses", rng.choice(categories),
+               rng.randint(100, 50_000)) for _ in range(num_entries)]
+    print(f"Limits: {len(limits):,} ({len(months)} months x {num_categories} categories), "
+          f"expense stream: {num_entries:,} entries")
+
+    results = {}
+    crossed = {}  # Label -> sorted (month, category, threshold) of every alert fired
+    for label in ("no alerts", "alerts", f"alerts, batches of {batch_size:,}"):
+        ledger = Ledger()
+        for limit in limits:
+            ledger.set_limit(*limit)
+        fired = []
+        if label != "no alerts":
+            BudgetAlerts(ledger, sinks=[fired.append])
+        start = time.perf_counter()
+        if label.startswith("alerts, batches"):
+            for i in range(0, len(stream), batch_size):
+                ledger.add_batch(stream[i:i + batch_size])
+        else:
+            for entry in stream:
+                ledger.add(*entry)
+        seconds = time.perf_counter() - start
+        results[label] = ledger
+        crossed[label] = sorted((alert["month"], alert["category"], alert["threshold"]) for alert in fired)
+        print(f"{label + ':':<28} {seconds / num_entries * 1e6:>6.2f} us per entry, {len(fired):,} alerts")
+
+    ledger = results["alerts"]
+    start = time.perf_counter()
+    scanned = _scan_over_budget(ledger)
+    scan = time.perf_counter() - start
+    start = time.perf_counter()
+    over = ledger.alerts.over_budget()
+    query = time.perf_counter() - start
+    same = over == scanned and results[f"alerts, batches of {batch_size:,}"].alerts.over_budget() == scanned
+    print(f"Over budget: {len(over):,} categories; query {query * 1e6:,.1f} us "
+          f"vs {scan * 1000:,.1f} ms scanning every limit (matches: {same})")
+    same_alerts = crossed["alerts"] == crossed[f"alerts, batches of {batch_size:,}"]
+    print(f"Batched entries fire the same thresholds as single entries: {same_alerts}")
+
+MERCHANTS = ["ACME PAYROLL", "Whole Foods Market", "Blue Bottle Coffee", "Uber Trip", "Shell Fuel 123",
+             "Netflix.com", "City Water Dept", "CVS Pharmacy", "Landlord Rent", "Hardware Store", "Bank Interest"]
+
+# Child process for the import benchmark: import one statement, report peak memory
+IMPORT_RUNNER = """
+import sys, time
+sys.path.insert(0, {here!r})
+from budget_storage import BudgetStorage
+from ledger import Ledger
+from statement_import import import_statement
+storage = BudgetStorage({path!r})
+ledger = storage.load_into(Ledger())
+start = time.perf_counter()
+report = import_statement(ledger, {statement!r})
+storage.snapshot(wait=True)
+storage.close()
+seconds = time.perf_counter() - start
+with open("/proc/self/status") as f:
+    peak = next(int(line.split()[1]) for line in f if line.startswith("VmHWM"))
+print(report["rows"], report["imported"], report["income_cents"] - report["expense_cents"], seconds, peak)
+"""
+
+# Write a synthetic date-ordered statement CSV; returns the net of its amounts in cents
+def write_statement(path, num_rows, seed=0):
+    rng = random.Random(seed)
+    months = month_range(2015, 10)
+    net = 0
+    with open(path, "w") as f:
+        f.write("Date,Description,Amount\n")
+        for i in range(num_rows):
+            month = months[i * len(months) // num_rows]
+            day = i * len(months) * 28 // num_rows % 28 + 1
+            merchant = rng.choice(MERCHANTS)
+            cents = rng.randint(100, 300_000) * (1 if merchant in ("ACME PAYROLL", "Bank Interest") else -1)
+            net += cents
+            f.write(f"{month}-{day:02d},{merchant} #{rng.randrange(500)},{cents / 100:.2f}\n")
+    return net
+
+# Throughput and peak memory of a streaming import, then a re-import that must add nothing
+def bench_statements(num_rows):
+    with tempfile.TemporaryDirectory() as tmp:
+        statement = os.path.join(tmp, "statement.csv")
+        net = write_statement(statement, num_rows)
+        print(f"Statement: {num_rows:,} rows, {os.path.getsize(statement) / 2**20:,.0f} MiB")
+        path = os.path.join(tmp, "budget_ledger.bin")
+        for label in ("First import", "Re-import"):
+            output = subprocess.run([sys.executable, "-c", IMPORT_RUNNER.format(here=HERE, path=path, statement=statement)],
+                                    capture_output=True, text=True, check=True).stdout.split()
+            rows, imported, imported_net, seconds, peak = int(output[0]), int(output[1]), int(output[2]), float(output[3]), int(output[4])
+            print(f"{label}: {rows / seconds:,.0f} rows/sec, {imported:,} new rows, peak memory {peak / 1024:,.0f} MiB")
+            if label == "First import":
+                print(f"Imported net matches the statement: {imported_net == net}")
+
+        storage = BudgetStorage(path)
+        ledger = storage.load_into(Ledger())
+        storage.close()
+        totals = [ledger.month_totals(month) for month in ledger.months]
+        print(f"Ledger after both imports: {len(ledger):,} transactions "
+              f"(matches: {len(ledger) == num_rows and sum(i - e for i, e in totals) == net})")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Budget tracker benchmarks")
+    sub = parser.add_subparsers(dest="benchmark", required=True)
+    ledger = sub.add_parser("ledger", help="Ledger load and summary time with millions of transactions")
+    ledger.add_argument("--transactions", type=int, default=5_000_000)
+    ledger.add_argument("--years", type=int, default=5)
+    ledger.add_argument("--categories", type=int, default=40)
+    storage = sub.add_parser("storage", help="Write-ahead log: start-up time, cost per entry, crash recovery")
+    storage.add_argument("--transactions", type=int, default=1_000_000)
+    storage.add_argument("--log-records", type=int, default=50_000)
+    storage.add_argument("--entries", type=int, default=2_000)
+    storage.add_argument("--rounds", type=int, default=20, help="Crash-recovery kill rounds")
+    trends = sub.add_parser("trends", help="Trend matrix build and range-query cost")
+    trends.add_argument("--transactions", type=int, default=5_000_000)
+    trends.add_argument("--years", type=int, default=10)
+    trends.add_argument("--categories", type=int, default=40)
+    trends.add_argument("--queries", type=int, default=10_000)
+    export = sub.add_parser("export", help="Exporting every month: export_summary loop vs export_all")
+    export.add_argument("--months", type=int, default=10_000)
+    export.add_argument("--transactions", type=int, default=1_000_000)
+    export.add_argument("--workers", type=int, default=4)
+    alerts = sub.add_parser("alerts", help="Budget alerts: cost per entry and over-budget query vs a full scan")
+    alerts.add_argument("--entries", type=int, default=1_000_000)
+    alerts.add_argument("--years", type=int, default=10)
+    alerts.add_argument("--categories", type=int, default=1_000)
+    alerts.add_argument("--batch-size", type=int, default=10_000)
+    statements = sub.add_parser("statements", help="Streaming statement import: rows/sec, peak memory, re-import")
+    statements.add_argument("--rows", type=int, default=5_000_000)
+    args = parser.parse_args()
+
+    if args.benchmark == "ledger":
+        bench_ledger(args.transactions, args.years, args.categories)
+    elif args.benchmark == "storage":
+        bench_storage(args.transactions, args.log_records, args.entries, args.rounds)
+    elif args.benchmark == "trends":
+        bench_trends(args.transactions, args.years, args.categories, args.queries)
+    elif args.benchmark == "export":
+        bench_export(args.months, args.transactions, args.workers)
+    elif args.benchmark == "alerts":
+        bench_alerts(args.entries, args.years, args.categories, args.batch_size)
+    elif args.benchmark == "statements":
+        bench_statements(args.rows)
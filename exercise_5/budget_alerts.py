@@ -0,0 +1,75 @@
+from bisect import bisect_left  # Thresholds crossed by a spent/limit ratio
+from types import MappingProxyType  # Read-only view of the over-budget dict
+
+THRESHOLDS = (80, 100)  # Percent of a limit; an alert fires when spending first goes past each
+
+# Default sink: print the alert under the menu action that caused it
+def print_alert(alert):
+    spent, limit = alert["spent"] / 100, alert["limit"] / 100
+    if alert["threshold"] >= 100 and alert["spent"] > alert["limit"]:
+        print(f"🚨 {alert['category']} is ${spent - limit:.2f} over its {alert['month']} budget "
+              f"(${spent:.2f} of ${limit:.2f})")
+    else:
+        print(f"⚠️ {alert['category']} has passed {alert['threshold']}% of its {alert['month']} budget "
+              f"(${spent:.2f} of ${limit:.2f})")
+
+# Budget limits checked incrementally as a Ledger changes. The ledger calls
+# check() for each (month, category) an expense or limit touches, so headroom and
+# threshold levels are updated in O(1) from its running totals, and the set of
+# over-budget categories is maintained instead of recomputed. Alerts are dicts
+# passed to every sink (any callable); a change that jumps past several
+# thresholds sends one alert per threshold, lowest first, so sinks see the same
+# alerts whether expenses arrive one at a time or in batches.
+class BudgetAlerts:
+    def __init__(self, ledger, thresholds=THRESHOLDS, sinks=None):
+        self.ledger = ledger
+        self.thresholds = sorted(thresholds)
+        self.sinks = list(sinks or [])
+        self.levels = {}  # (month, category id) -> number of thresholds passed
+        self.over = {}  # (month, category) -> cents over the limit, for every overspent limit
+        self.over_view = MappingProxyType(self.over)
+        for month, totals in ledger.months.items():  # Existing limits start armed, silently
+            for category_id in totals["limits"]:
+                self.check(month, category_id, notify=False)
+        ledger.alerts = self
+
+    # Number of thresholds that spent has gone past
+    def _level(self, spent, limit):
+        if limit <= 0:
+            return len(self.thresholds) if spent > 0 else 0
+        return bisect_left(self.thresholds, spent * 100 / limit)
+
+    # Re-evaluate one limit after its month's expenses or limit changed
+    def check(self, month, category_id, notify=True):
+        totals = self.ledger.months[month]
+        limit = totals["limits"].get(category_id)
+        if limit is None:
+            return
+        spent = totals["expenses"].get(category_id, 0)
+        key = (month, self.ledger.categories[category_id])
+        if spent > limit:
+            self.over[key] = spent - limit
+        else:
+            self.over.pop(key, None)
+
+        level = self._level(spent, limit)
+        previous = self.levels.get((month, category_id), 0)
+        self.levels[(month, category_id)] = level  # A raised limit lowers the level and re-arms its alerts
+        if notify:
+            for threshold in self.thresholds[previous:level]:
+                alert = {"month": month, "category": key[1], "threshold": threshold, "spent": spent, "limit": limit}
+                for sink in self.sinks:
+                    sink(alert)
+
+    # Cents left before the limit (negative when over), or None without a limit
+    def headroom(self, month, category):
+        totals = self.ledger.months.get(month)
+        category_id = self.ledger.category_index.get(category)
+        if totals is None or category_id not in totals["limits"]:
+            return None
+        return totals["limits"][category_id] - totals["expenses"].get(category_id, 0)
+
+    # {(month, category): cents over} for every category currently over budget; a
+    # read-only live view (copy it with dict() to keep a point-in-time result)
+    def over_budget(self):
+        return self.over_view
@@ -0,0 +1,179 @@
+import glob       # Finding write-ahead log files
+import os         # Atomic replace, fsync and file removal
+import struct     # Binary log records
+import threading  # Background snapshots
+
+from ledger import ENTRY_TYPES, Ledger, month_of
+
+# File layout
+# - <path>:            Ledger snapshot (see ledger.py) tagged with generation G
+# - <path>.wal.<gen>:  header (magic, generation) followed by mutation records
+#                      b"T" + date, type, cents + category   add transaction
+#                      b"L" + YYYYMM, cents + category       set budget limit
+# The snapshot with generation G contains every record from logs with a lower
+# generation. Starting a snapshot switches appends to a new log first, so the
+# snapshot can be written in the background; until it is safely renamed into
+# place, recovery simply replays the older log as well.
+LOG_MAGIC = b"BGW1"
+LOG_HEADER = struct.Struct("<4sI")  # magic, generation
+TRANSACTION = struct.Struct("<IBq")  # YYYYMMDD, type index, cents
+LIMIT = struct.Struct("<Iq")  # YYYYMM, cents
+NAME_LEN = struct.Struct("<H")
+
+SNAPSHOT_EVERY = 100_000  # Log records between automatic background snapshots
+
+# Write-ahead log plus background snapshots backing a Ledger
+class BudgetStorage:
+    def __init__(self, path, snapshot_every=SNAPSHOT_EVERY, durable=True):
+        self.path = path
+        self.snapshot_every = snapshot_every
+        self.durable = durable  # fsync every record, not just flush it to the OS
+        self.generation = 0  # Generation of the log being appended to
+        self.pending = 0  # Records logged since the last snapshot started
+        self.ledger = None
+        self.log = None
+        self.snapshot_thread = None
+
+    def _log_path(self, generation):
+        return f"{self.path}.wal.{generation}"
+
+    def _log_generations(self):
+        generations = []
+        for log_path in glob.glob(glob.escape(self.path) + ".wal.*"):
+            suffix = log_path.rsplit(".", 1)[1]
+            if suffix.isdigit():
+                generations.append(int(suffix))
+        return sorted(generations)
+
+    # Restore the ledger from the snapshot and the log tail, then start logging
+    def load_into(self, ledger):
+        if os.path.exists(self.path):
+            ledger = Ledger.load(self.path)
+        self.generation = ledger.generation
+        for generation in self._log_generations():
+            if generation < ledger.generation:
+                os.remove(self._log_path(generation))  # Already in the snapshot
+                continue
+            valid_end = self._replay_log(ledger, generation)
+            self.generation = generation
+            if valid_end is not None:
+                os.truncate(self._log_path(generation), valid_end)  # Drop a half-written trailing record
+
+        self.ledger = ledger
+        if os.path.exists(self._log_path(self.generation)) and self._log_is_valid(self.generation):
+            self.log = open(self._log_path(self.generation), "ab")
+        else:
+            self._start_log(self.generation)
+        ledger.storage = self
+        return ledger
+
+    def _log_is_valid(self, generation):
+        with open(self._log_path(generation), "rb") as f:
+            header = f.read(LOG_HEADER.size)
+        return len(header) == LOG_HEADER.size and LOG_HEADER.unpack(header) == (LOG_MAGIC, generation)
+
+    # Apply one log's records; returns the offset after the last complete record,
+    # or None if the log has no valid header
+    def _replay_log(self, ledger, generation):
+        with open(self._log_path(generation), "rb") as f:
+            data = f.read()
+        if len(data) < LOG_HEADER.size or LOG_HEADER.unpack_from(data) != (LOG_MAGIC, generation):
+            return None
+
+        offset = LOG_HEADER.size
+        batch = []  # Consecutive transactions, applied together
+        while offset < len(data):
+            try:
+                op = data[offset:offset + 1]
+                if op == b"T":
+                    date, kind, cents = TRANSACTION.unpack_from(data, offset + 1)
+                    category, end = _unpack_name(data, offset + 1 + TRANSACTION.size)
+                    batch.append((date, ENTRY_TYPES[kind], category, cents))
+                elif op == b"L":
+                    month, cents = LIMIT.unpack_from(data, offset + 1)
+                    category, end = _unpack_name(data, offset + 1 + LIMIT.size)
+                    ledger.add_batch(batch)
+                    batch = []
+                    ledger.set_limit(month_of(month * 100), category, cents)
+                else:
+                    break
+            except (struct.error, UnicodeDecodeError):
+                break  # Truncated tail from an interrupted write
+            offset = end
+            self.pending += 1
+        ledger.add_batch(batch)
+        return offset
+
+    def _start_log(self, generation):
+        if self.log is not None:
+            self.log.close()
+        self.generation = generation
+        self.log = open(self._log_path(generation), "wb")
+        self.log.write(LOG_HEADER.pack(LOG_MAGIC, generation))
+        self._sync()
+
+    def _sync(self):
+        self.log.flush()
+        if self.durable:
+            os.fsync(self.log.fileno())
+
+    def _append(self, record):
+        self.log.write(record)
+        self._sync()
+        self.pending += 1
+        if self.pending >= self.snapshot_every:
+            self.snapshot()
+
+    # Mutation hooks called by Ledger
+    def record_transaction(self, date, entry_type, category, cents):
+        self._append(b"T" + TRANSACTION.pack(date, ENTRY_TYPES.index(entry_type), cents) + _pack_name(category))
+
+    # One write and one fsync for a whole batch; bulk loaders snapshot when they finish
+    def record_transactions(self, transactions):
+        self.log.write(b"".join(b"T" + TRANSACTION.pack(date, ENTRY_TYPES.index(entry_type), cents) + _pack_name(category)
+                                for date, entry_type, category, cents in transactions))
+        self._sync()
+        self.pending += len(transactions)
+
+    def record_limit(self, month, category, cents):
+        self._append(b"L" + LIMIT.pack(int(month[:4]) * 100 + int(month[5:7]), cents) + _pack_name(category))
+
+    # Start writing a snapshot of the current ledger on a background thread;
+    # new records go to a fresh log meanwhile. wait=True blocks until it is written.
+    def snapshot(self, wait=False):
+        if self.snapshot_thread is not None:
+            self.snapshot_thread.join()  # One snapshot at a time
+        copy = self.ledger.copy()  # Array copies; cheap next to serializing them
+        copy.generation = self.generation + 1
+        self._start_log(copy.generation)
+        self.pending = 0
+        self.snapshot_thread = threading.Thread(target=self._write_snapshot, args=(copy,), daemon=True)
+        self.snapshot_thread.start()
+        if wait:
+            self.snapshot_thread.join()
+
+    def _write_snapshot(self, copy):
+        copy.save(self.path, fsync=self.durable)  # Atomic: the old snapshot stays valid until the rename
+        self.ledger.generation = copy.generation
+        for generation in self._log_generations():
+            if generation < copy.generation:
+                os.remove(self._log_path(generation))
+
+    def close(self):
+        if self.snapshot_thread is not None:
+            self.snapshot_thread.join()
+            self.snapshot_thread = None
+        if self.log is not None:
+            self.log.close()
+            self.log = None
+
+def _pack_name(name):
+    encoded = name.encode("utf-8")
+    return NAME_LEN.pack(len(encoded)) + encoded
+
+def _unpack_name(data, offset):
+    (length,) = NAME_LEN.unpack_from(data, offset)
+    start = offset + NAME_LEN.size
+    if start + length > len(data):
+        raise struct.error("truncated name")
+    return data[start:start + length].decode("utf-8"), start + length
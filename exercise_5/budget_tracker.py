@@ -1,33 +1,47 @@
-import json   # For saving/loading data persistently
+import json   # For reading the old JSON data file
+import math   # For skipping months without enough history
 import os     # For file existence checks
 from datetime import datetime  # To validate date inputs
 
-DATA_FILE = "budget_data.json"  # File to store budget data
+from budget_alerts import BudgetAlerts, print_alert  # Limit warnings as entries are added
+from budget_storage import BudgetStorage  # Write-ahead log + background snapshots
+from ledger import Ledger, date_key, to_cents
+from month_summary import MonthSummary, render_console, render_text, summary_filename  # Shared by console and file output
 
-# Load data from JSON file or create a new one if not exists
-def load_data():
-    if not os.path.exists(DATA_FILE):
-        with open(DATA_FILE, 'w') as f:
-            json.dump({}, f)
-    with open(DATA_FILE, 'r') as f:
-        return json.load(f)
+DATA_FILE = "budget_ledger.bin"  # Ledger snapshot; changes since then are in budget_ledger.bin.wal.*
+LEGACY_DATA_FILE = "budget_data.json"  # Old per-month totals file, imported on first run
+ALERT_THRESHOLDS = (80, 100)  # Percent of a budget limit at which the menu warns
 
-# Save current data back into JSON file
+# Restore the ledger (snapshot + log) with every change logged from now on;
+# the old JSON totals are imported if there is no ledger yet
+def load_data():
+    data = Ledger()
+    imported = not os.path.exists(DATA_FILE) and os.path.exists(LEGACY_DATA_FILE)
+    if imported:
+        with open(LEGACY_DATA_FILE, 'r') as f:
+            data = Ledger.from_legacy(json.load(f))
+    data = BudgetStorage(DATA_FILE).load_into(data)
+    if imported:
+        data.storage.snapshot(wait=True)
+    return data
+
+# Every change is already logged; write a snapshot so the next start-up has no log to replay
 def save_data(data):
-    with open(DATA_FILE, 'w') as f:
-        json.dump(data, f, indent=4)
+    data.storage.snapshot(wait=True)
+    data.storage.close()
 
-# Validate user date input in format YYYY-MM
+# Validate user date input in format YYYY-MM; returns the canonical zero-padded
+# key ("2024-1" -> "2024-01") that entries, limits and summaries all use
 def get_valid_month():
     while True:
         user_input = input("Enter month (YYYY-MM): ").strip()
         try:
-            datetime.strptime(user_input, "%Y-%m")  # Validate format
-            return user_input
+            month = datetime.strptime(user_input, "%Y-%m")  # Validate format
+            return f"{month.year:04d}-{month.month:02d}"
         except ValueError:
             print("Invalid date format. Please use YYYY-MM.")
 
-# Add income or expense entry into the budget data
+# Add income or expense entry into the budget data (dated the first of the month)
 def add_entry(data, month, entry_type):
     category = input(f"Enter {entry_type} category: ").strip()
     try:
@@ -35,17 +49,12 @@ def add_entry(data, month, entry_type):
         if amount < 0:
             print("Amount must be positive.")
             return
-    except ValueError:
+        cents = to_cents(amount)
+    except (ValueError, ArithmeticError):
         print("Invalid amount.")
         return
 
-    # Initialize structures if month or entry type is new
-    if month not in data:
-        data[month] = {"income": {}, "expenses": {}, "limits": {}}
-    if category not in data[month][entry_type]:
-        data[month][entry_type][category] = 0
-
-    data[month][entry_type][category] += amount  # Add amount to category
+    data.add(date_key(month), entry_type, category, cents)  # Also updates the month's totals
     print(f"{entry_type.capitalize()} added: {category} - ${amount:.2f}")
 
 # Set budget limit for specific expense categories
@@ -56,53 +65,27 @@ def set_budget_limit(data, month):
         if limit < 0:
             print("Limit must be positive.")
             return
-    except ValueError:
+        cents = to_cents(limit)
+    except (ValueError, ArithmeticError):
         print("Invalid limit.")
         return
 
-    if month not in data:
-        data[month] = {"income": {}, "expenses": {}, "limits": {}}
-
-    data[month]["limits"][category] = limit  # Store limit in the data structure
+    data.set_limit(month, category, cents)  # Store limit in the data structure
     print(f"Budget limit set: {category} - ${limit:.2f}")
 
 # Display detailed monthly financial summary
 def show_summary(data, month):
-    if month not in data:
+    summary = MonthSummary.of(data, month)
+    if summary is None:
         print("No data found for this month.")
         return
+    print(render_console(summary))
 
-    month_data = data[month]
-    income_total = sum(month_data.get("income", {}).values())
-    expense_total = sum(month_data.get("expenses", {}).values())
-    net_savings = income_total - expense_total
-    savings_percent = (net_savings / income_total * 100) if income_total else 0
-
-    print("\n💰 FINANCIAL SUMMARY")
-    print(f"Total Income: ${income_total:.2f}")
-    print(f"Total Expenses: ${expense_total:.2f}")
-    print(f"Net Savings: ${net_savings:.2f} ({savings_percent:.1f}%)")
-
-    print("\n📊 EXPENSE BREAKDOWN")
-    for category, amount in month_data.get("expenses", {}).items():
-        percent = (amount / expense_total * 100) if expense_total else 0
-        bars = '█' * int(percent // 5) + '░' * (20 - int(percent // 5))  # Text-based bar visualization
-        print(f"{category:<12} {bars} ${amount:.0f} ({percent:.1f}%)")
-
-    print("\n⚠️ BUDGET ALERTS:")
-    alerts = False
-    for category, limit in month_data.get("limits", {}).items():
-        spent = month_data["expenses"].get(category, 0)
-        if spent > limit:
-            alerts = True
-            over_budget = spent - limit
-            percent_spent = (spent / limit) * 100
-            print(f"{category}: ${over_budget:.0f} over budget ({percent_spent:.1f}% of limit)")
-    if not alerts:
-        print("No budget overruns.")
-
-# Compare two months to see spending trends in categories
+# Compare two months to see spending trends in categories, then show totals,
+# rolling averages, year-over-year changes and unusual months for the range between them
 def analyze_trends(data):
+    from trend_analytics import trends_for  # NumPy is only needed for this report
+
     month1 = get_valid_month()
     month2 = get_valid_month()
 
@@ -110,51 +93,56 @@ def analyze_trends(data):
         print("One or both months not found.")
         return
 
-    print(f"\n📈 SPENDING TREND: {month1} ➔ {month2}")
-    categories = set(data[month1].get("expenses", {}).keys()) | set(data[month2].get("expenses", {}).keys())
+    trends = trends_for(data)  # Cached; rebuilt only after new entries
+    row1, row2 = trends.matrix[trends.month_index(month1)], trends.matrix[trends.month_index(month2)]
 
-    for category in categories:
-        spent1 = data[month1].get("expenses", {}).get(category, 0)
-        spent2 = data[month2].get("expenses", {}).get(category, 0)
+    print(f"\n📈 SPENDING TREND: {month1} ➔ {month2}")
+    for column, category in enumerate(trends.categories):
+        spent1, spent2 = row1[column], row2[column]
+        if not spent1 and not spent2:
+            continue
         trend = "Increased" if spent2 > spent1 else "Decreased" if spent2 < spent1 else "No Change"
-        diff = abs(spent2 - spent1)
+        diff = abs(int(spent2) - int(spent1)) / 100
         print(f"{category}: {trend} by ${diff:.2f}")
 
+    start, end = sorted([month1, month2])
+    totals = trends.range_total(start, end)
+    averages = trends.range_average(start, end)
+    rolling = trends.rolling_average()[trends.month_index(end)]
+    yoy = trends.year_over_year()[trends.month_index(end)]
+    print(f"\n📅 RANGE {start} ➔ {end}")
+    print(f"{'Category':<12} {'Total':>12} {'Avg/month':>12} {'3-mo avg':>12} {'vs last yr':>12}")
+    for column, category in enumerate(trends.categories):
+        if not totals[column]:
+            continue
+        rolling_text = "-" if math.isnan(rolling[column]) else f"${rolling[column] / 100:.2f}"
+        yoy_text = "-" if math.isnan(yoy[column]) else f"{yoy[column] / 100:+.2f}"
+        print(f"{category:<12} {'$' + format(totals[column] / 100, '.2f'):>12} "
+              f"{'$' + format(averages[column] / 100, '.2f'):>12} {rolling_text:>12} {yoy_text:>12}")
+
+    print("\n🚨 UNUSUAL MONTHS:")
+    anomalies = trends.anomalies(start, end)
+    for month, category, cents, mean in anomalies:
+        print(f"{month} {category}: ${cents / 100:.2f} vs ${mean / 100:.2f} average of the previous months")
+    if not anomalies:
+        print("None found.")
+
 # Export monthly summary into a text file
 def export_summary(data, month):
-    if month not in data:
+    summary = MonthSummary.of(data, month)
+    if summary is None:
         print("No data found for this month.")
         return
 
-    filename = f"{month}_summary.txt"
+    filename = summary_filename(month)
     with open(filename, 'w') as f:
-        income_total = sum(data[month].get("income", {}).values())
-        expense_total = sum(data[month].get("expenses", {}).values())
-        net_savings = income_total - expense_total
-        savings_percent = (net_savings / income_total * 100) if income_total else 0
-
-        f.write(f"=== BUDGET SUMMARY: {month} ===\n")
-        f.write(f"Total Income: ${income_total:.2f}\n")
-        f.write(f"Total Expenses: ${expense_total:.2f}\n")
-        f.write(f"Net Savings: ${net_savings:.2f} ({savings_percent:.1f}%)\n\n")
-
-        f.write("Expense Breakdown:\n")
-        for category, amount in data[month].get("expenses", {}).items():
-            percent = (amount / expense_total * 100) if expense_total else 0
-            f.write(f"{category}: ${amount:.2f} ({percent:.1f}%)\n")
-
-        f.write("\nBudget Alerts:\n")
-        for category, limit in data[month].get("limits", {}).items():
-            spent = data[month]["expenses"].get(category, 0)
-            if spent > limit:
-                over_budget = spent - limit
-                percent_spent = (spent / limit) * 100
-                f.write(f"{category}: ${over_budget:.0f} over budget ({percent_spent:.1f}% of limit)\n")
+        f.write(render_text(summary))
     print(f"Summary exported to {filename}")
 
 # Main menu loop to navigate through budget functionalities
 def main():
     data = load_data()
+    BudgetAlerts(data, ALERT_THRESHOLDS, sinks=[print_alert])  # Checked on every expense and limit
     while True:
         print("\n=== PERSONAL BUDGET TRACKER ===")
         print("1. Add Income")
@@ -0,0 +1,203 @@
+import json    # Snapshot metadata and legacy data
+import os      # File checks and atomic replace
+import struct  # Snapshot header
+from array import array
+from decimal import ROUND_HALF_UP, Decimal  # Exact dollars -> cents conversion
+
+ENTRY_TYPES = ["income", "expenses"]  # Index stored in the type column
+
+# Snapshot layout: header, JSON metadata (category names and the materialized
+# monthly aggregates), then the four transaction columns as raw arrays
+SNAPSHOT_MAGIC = b"BGL1"
+SNAPSHOT_HEADER = struct.Struct("<4sQQ")  # magic, transaction count, metadata bytes
+
+# Convert a dollar amount to integer cents, rounding half-cents up (away from
+# zero) on the decimal text, so 1.005 -> 101 although the float is 1.00499...
+def to_cents(amount):
+    return int((Decimal(str(amount)) * 100).quantize(Decimal(1), rounding=ROUND_HALF_UP))
+
+# "YYYY-MM" and day -> YYYYMMDD
+def date_key(month, day=1):
+    return int(month[:4]) * 10000 + int(month[5:7]) * 100 + day
+
+# YYYYMMDD -> "YYYY-MM"
+def month_of(date):
+    return f"{date // 10000:04d}-{date // 100 % 100:02d}"
+
+# Transactions stored column-wise (date, type, category id, cents) with interned
+# category names. Per-month totals per category are kept up to date on every
+# append, so summaries never scan the transactions.
+class Ledger:
+    def __init__(self):
+        self.dates = array("I")  # YYYYMMDD
+        self.types = array("B")  # Index into ENTRY_TYPES
+        self.category_ids = array("I")
+        self.amounts = array("q")  # Cents
+        self.categories = []  # Category id -> name
+        self.category_index = {}  # Name -> category id
+        # Month -> {"income": {id: cents}, "expenses": {id: cents}, "limits": {id: cents}},
+        # each in first-seen order like the original per-month dicts
+        self.months = {}
+        self.generation = 0  # Snapshot generation, maintained by BudgetStorage
+        self.storage = None  # Optional BudgetStorage that logs every mutation
+        self.alerts = None  # Optional BudgetAlerts checked after every expense and limit change
+
+    def __len__(self):
+        return len(self.amounts)
+
+    def __contains__(self, month):
+        return month in self.months
+
+    # Category name -> id, assigning a new id the first time a name is seen
+    def category_id(self, name):
+        category_id = self.category_index.get(name)
+        if category_id is None:
+            category_id = self.category_index[name] = len(self.categories)
+            self.categories.append(name)
+        return category_id
+
+    def _month(self, month):
+        if month not in self.months:
+            self.months[month] = {"income": {}, "expenses": {}, "limits": {}}
+        return self.months[month]
+
+    # Record one income or expense transaction of cents on YYYYMMDD date
+    def add(self, date, entry_type, category, cents):
+        category_id = self.category_id(category)
+        self.dates.append(date)
+        self.types.append(ENTRY_TYPES.index(entry_type))
+        self.category_ids.append(category_id)
+        self.amounts.append(cents)
+        month = month_of(date)
+        totals = self._month(month)[entry_type]
+        totals[category_id] = totals.get(category_id, 0) + cents
+        if self.storage is not None:
+            self.storage.record_transaction(date, entry_type, category, cents)
+        if self.alerts is not None and entry_type == "expenses":
+            self.alerts.check(month, category_id)
+
+    # Record many (date, entry type, category, cents) transactions; logged as one batch
+    def add_batch(self, transactions):
+        transactions = list(transactions)  # Iterated twice: applied here, then logged
+        month_names = {}  # YYYYMM -> "YYYY-MM"
+        touched = {}  # (month, category id) with new expenses, in first-seen order
+        for date, entry_type, category, cents in transactions:
+            category_id = self.category_index.get(category)
+            if category_id is None:
+                category_id = self.category_id(category)
+            self.dates.append(date)
+            self.types.append(ENTRY_TYPES.index(entry_type))
+            self.category_ids.append(category_id)
+            self.amounts.append(cents)
+            month = month_names.get(date // 100)
+            if month is None:
+                month = month_names[date // 100] = month_of(date)
+            totals = self._month(month)[entry_type]
+            totals[category_id] = totals.get(category_id, 0) + cents
+            if entry_type == "expenses":
+                touched[month, category_id] = None
+        if self.storage is not None:
+            self.storage.record_transactions(transactions)
+        if self.alerts is not None:
+            for month, category_id in touched:  # Once per limit, after the whole batch
+                self.alerts.check(month, category_id)
+
+    def set_limit(self, month, category, cents):
+        category_id = self.category_id(category)
+        self._month(month)["limits"][category_id] = cents
+        if self.storage is not None:
+            self.storage.record_limit(month, category, cents)
+        if self.alerts is not None:
+            self.alerts.check(month, category_id)
+
+    # The month in the original {"income": {name: dollars}, "expenses": ..., "limits": ...}
+    # shape, built from the aggregates in O(categories)
+    def __getitem__(self, month):
+        names = self.categories
+        return {kind: {names[category_id]: cents / 100 for category_id, cents in totals.items()}
+                for kind, totals in self.months[month].items()}
+
+    def get(self, month, default=None):
+        return self[month] if month in self.months else default
+
+    # Income and expense totals for a month in cents
+    def month_totals(self, month):
+        totals = self.months[month]
+        return sum(totals["income"].values()), sum(totals["expenses"].values())
+
+    # Recompute the monthly totals from the transaction columns (limits are kept)
+    def rebuild_aggregates(self):
+        limits = {month: totals["limits"] for month, totals in self.months.items()}
+        self.months = {}
+        month_names = {}  # YYYYMM -> "YYYY-MM"
+        for date, kind, category_id, cents in zip(self.dates, self.types, self.category_ids, self.amounts):
+            month = month_names.get(date // 100)
+            if month is None:
+                month = month_names[date // 100] = month_of(date)
+            totals = self._month(month)[ENTRY_TYPES[kind]]
+            totals[category_id] = totals.get(category_id, 0) + cents
+        for month, month_limits in limits.items():
+            self._month(month)["limits"] = month_limits
+
+    # Independent copy of the data (not the storage), e.g. for a background snapshot
+    def copy(self):
+        ledger = Ledger()
+        for column in ("dates", "types", "category_ids", "amounts"):
+            setattr(ledger, column, getattr(self, column)[:])
+        ledger.categories = list(self.categories)
+        ledger.category_index = dict(self.category_index)
+        ledger.months = {month: {kind: dict(totals) for kind, totals in month_totals.items()}
+                         for month, month_totals in self.months.items()}
+        ledger.generation = self.generation
+        return ledger
+
+    def save(self, path, fsync=False):
+        metadata = json.dumps({
+            "generation": self.generation,
+            "categories": self.categories,
+            "months": {month: {kind: list(totals.items()) for kind, totals in month_totals.items()}
+                       for month, month_totals in self.months.items()},
+        }).encode("utf-8")
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, len(self), len(metadata)))
+            f.write(metadata)
+            for column in (self.dates, self.types, self.category_ids, self.amounts):
+                column.tofile(f)
+            if fsync:
+                f.flush()
+                os.fsync(f.fileno())
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path):
+        ledger = cls()
+        with open(path, "rb") as f:
+            magic, count, metadata_size = SNAPSHOT_HEADER.unpack(f.read(SNAPSHOT_HEADER.size))
+            if magic != SNAPSHOT_MAGIC:
+                raise ValueError(f"{path} is not a budget ledger")
+            metadata = json.loads(f.read(metadata_size))
+            for column in (ledger.dates, ledger.types, ledger.category_ids, ledger.amounts):
+                column.fromfile(f, count)
+        ledger.generation = metadata.get("generation", 0)
+        ledger.categories = metadata["categories"]
+        ledger.category_index = {name: category_id for category_id, name in enumerate(ledger.categories)}
+        ledger.months = {month: {kind: dict(totals) for kind, totals in month_totals.items()}
+                         for month, month_totals in metadata["months"].items()}
+        return ledger
+
+    # Import the old {month: {"income": {...}, "expenses": {...}, "limits": {...}}} totals,
+    # one transaction per month and category dated the first of the month. Old
+    # files may hold unpadded months ("2024-1"); they are stored as "2024-01".
+    @classmethod
+    def from_legacy(cls, data):
+        ledger = cls()
+        for month, month_data in data.items():
+            month = month_of(date_key(month))
+            ledger._month(month)
+            for entry_type in ENTRY_TYPES:
+                for category, amount in month_data.get(entry_type, {}).items():
+                    ledger.add(date_key(month), entry_type, category, to_cents(amount))
+            for category, limit in month_data.get("limits", {}).items():
+                ledger.set_limit(month, category, to_cents(limit))
+        return ledger
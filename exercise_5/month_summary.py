@@ -0,0 +1,110 @@
+import argparse  # Command-line options for the batch export
+import os        # Output paths and CPU count
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+EXPORT_BATCH = 256  # Months rendered and written per pool task
+
+# Everything the console summary and the exported file show for one month,
+# computed once from the ledger's per-month totals
+class MonthSummary:
+    def __init__(self, month, month_data):
+        self.month = month
+        income = month_data.get("income", {})
+        expenses = month_data.get("expenses", {})
+        self.income_total = sum(income.values())
+        self.expense_total = sum(expenses.values())
+        self.net_savings = self.income_total - self.expense_total
+        self.savings_percent = (self.net_savings / self.income_total * 100) if self.income_total else 0
+        # (category, amount, percent of expenses) in the ledger's category order
+        self.expenses = [(category, amount, (amount / self.expense_total * 100) if self.expense_total else 0)
+                         for category, amount in expenses.items()]
+        # (category, amount over the limit, percent of the limit spent) for overspent categories
+        self.overruns = []
+        for category, limit in month_data.get("limits", {}).items():
+            spent = expenses.get(category, 0)
+            if spent > limit:
+                self.overruns.append((category, spent - limit, spent / limit * 100))
+
+    # Summary of a month in a Ledger (or the old dict of months); None if there is no data
+    @classmethod
+    def of(cls, data, month):
+        return cls(month, data[month]) if month in data else None
+
+# Text printed by show_summary
+def render_console(summary):
+    lines = ["\n💰 FINANCIAL SUMMARY",
+             f"Total Income: ${summary.income_total:.2f}",
+             f"Total Expenses: ${summary.expense_total:.2f}",
+             f"Net Savings: ${summary.net_savings:.2f} ({summary.savings_percent:.1f}%)",
+             "\n📊 EXPENSE BREAKDOWN"]
+    for category, amount, percent in summary.expenses:
+        bars = '█' * int(percent // 5) + '░' * (20 - int(percent // 5))  # Text-based bar visualization
+        lines.append(f"{category:<12} {bars} ${amount:.0f} ({percent:.1f}%)")
+    lines.append("\n⚠️ BUDGET ALERTS:")
+    for category, over_budget, percent_spent in summary.overruns:
+        lines.append(f"{category}: ${over_budget:.0f} over budget ({percent_spent:.1f}% of limit)")
+    if not summary.overruns:
+        lines.append("No budget overruns.")
+    return "\n".join(lines)
+
+# Contents of the <month>_summary.txt file written by export_summary
+def render_text(summary):
+    lines = [f"=== BUDGET SUMMARY: {summary.month} ===",
+             f"Total Income: ${summary.income_total:.2f}",
+             f"Total Expenses: ${summary.expense_total:.2f}",
+             f"Net Savings: ${summary.net_savings:.2f} ({summary.savings_percent:.1f}%)",
+             "",
+             "Expense Breakdown:"]
+    for category, amount, percent in summary.expenses:
+        lines.append(f"{category}: ${amount:.2f} ({percent:.1f}%)")
+    lines.append("\nBudget Alerts:")
+    for category, over_budget, percent_spent in summary.overruns:
+        lines.append(f"{category}: ${over_budget:.0f} over budget ({percent_spent:.1f}% of limit)")
+    return "\n".join(lines) + "\n"
+
+def summary_filename(month, directory=""):
+    return os.path.join(directory, f"{month}_summary.txt")
+
+# Pool task: render a batch of summaries, writing each file with one write() of the
+# rendered bytes (no text-file wrapper per file, which costs as much as the write)
+def _write_summaries(directory, summaries):
+    for summary in summaries:
+        fd = os.open(summary_filename(summary.month, directory), os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        try:
+            os.write(fd, render_text(summary).encode())
+        finally:
+            os.close(fd)
+    return len(summaries)
+
+# Write a summary file for every month (or the given months) of a ledger into directory.
+# Summaries are computed here from the ledger's totals; rendering and writing are
+# fanned out in batches to a process pool (or a thread pool with use_threads=True).
+# workers=1 does everything in this process. Returns the number of files written.
+def export_all(data, directory=".", months=None, workers=None, use_threads=False):
+    months = sorted(data.months if months is None else months)
+    summaries = [summary for summary in (MonthSummary.of(data, month) for month in months) if summary is not None]
+    os.makedirs(directory, exist_ok=True)
+    batches = [summaries[i:i + EXPORT_BATCH] for i in range(0, len(summaries), EXPORT_BATCH)]
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(batches) <= 1:
+        return sum(_write_summaries(directory, batch) for batch in batches)
+    pool = ThreadPoolExecutor if use_threads else ProcessPoolExecutor
+    with pool(max_workers=min(workers, len(batches))) as executor:
+        return sum(executor.map(_write_summaries, [directory] * len(batches), batches))
+
+def main():
+    from budget_tracker import load_data  # Same ledger files as the menu
+
+    parser = argparse.ArgumentParser(description="Export a summary file for every month in the budget ledger")
+    parser.add_argument("directory", nargs="?", default="summaries", help="Output directory (default: summaries)")
+    parser.add_argument("--workers", type=int, help="Pool size (default: one per CPU; 1 disables the pool)")
+    parser.add_argument("--threads", action="store_true", help="Use threads instead of processes")
+    args = parser.parse_args()
+
+    data = load_data()
+    count = export_all(data, args.directory, workers=args.workers, use_threads=args.threads)
+    data.storage.close()
+    print(f"Exported {count} monthly summaries to {args.directory}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+import argparse  # Command-line options
+import csv       # Streaming CSV statements
+import hashlib   # Row fingerprints for de-duplication
+import os        # File checks and fsync
+import re        # Compiled category rules
+import time      # Throughput reporting
+from array import array
+from datetime import date as calendar_date  # Date validation
+from functools import lru_cache
+
+import numpy as np  # Sorted fingerprint index
+
+from ledger import to_cents
+
+CHUNK_SIZE = 50_000  # Rows parsed, de-duplicated and applied per batch
+IMPORTED_SUFFIX = ".imported"  # Fingerprints of every imported row, next to the ledger
+UNCATEGORIZED = {"income": "Other Income", "expenses": "Uncategorized"}
+
+# Description keyword -> category; keywords match whole words only ("rent" does
+# not match "CURRENT"). The earliest match in a description wins, ties go to the
+# rule listed first. Prefix a pattern with "re:" for a regex.
+DEFAULT_RULES = [
+    ("payroll", "Salary"), ("salary", "Salary"), ("interest", "Interest"),
+    ("rent", "Rent"), ("mortgage", "Rent"),
+    ("grocery", "Food"), ("market", "Food"), ("restaurant", "Food"), ("cafe", "Food"), ("coffee", "Food"),
+    ("uber", "Transport"), ("lyft", "Transport"), ("fuel", "Transport"), ("shell", "Transport"),
+    ("netflix", "Fun"), ("spotify", "Fun"), ("cinema", "Fun"),
+    ("electric", "Utilities"), ("water", "Utilities"), ("internet", "Utilities"), ("phone", "Utilities"),
+    ("pharmacy", "Health"), ("doctor", "Health"), ("gym", "Health"),
+]
+
+# All rules compiled into one regex alternation with a named group per rule, so
+# each description is scanned once instead of once per rule; results are cached
+# because statements repeat the same merchants over and over
+class CategoryMatcher:
+    def __init__(self, rules=DEFAULT_RULES, cache_size=65536):
+        self.categories = []
+        parts = []
+        for pattern, category in rules:
+            regex = pattern[3:] if pattern.startswith("re:") else rf"(?<!\w){re.escape(pattern)}(?!\w)"
+            parts.append(f"(?P<r{len(self.categories)}>{regex})")
+            self.categories.append(category)
+        self.pattern = re.compile("|".join(parts) or "(?!)", re.IGNORECASE)
+        self.match = lru_cache(maxsize=cache_size)(self._match)
+
+    # Category for a description, or None if no rule matches
+    def _match(self, description):
+        found = self.pattern.search(description)
+        return None if found is None else self.categories[int(found.lastgroup[1:])]
+
+# Read "pattern,category" rows from a CSV rules file
+def load_rules(path):
+    with open(path, newline="", encoding="utf-8") as f:
+        return [(row[0].strip(), row[1].strip()) for row in csv.reader(f) if len(row) >= 2 and row[0].strip()]
+
+# "12.34", "-1,234.5", "(12.34)" -> signed cents; integer math for the common case
+def parse_cents(text):
+    if len(text) > 3 and text[-3] == "." and text[-2:].isdigit():
+        try:
+            return int(text[:-3] + text[-2:])  # Plain "-1234.56", by far the most common form
+        except ValueError:
+            pass
+    text = text.strip().replace(",", "").replace("$", "")
+    if text.startswith("(") and text.endswith(")"):
+        text = "-" + text[1:-1]
+    whole, _, fraction = text.partition(".")
+    digits = whole.lstrip("+-")
+    if len(fraction) <= 2 and (fraction == "" or fraction.isdigit()) and (digits.isdigit() or (digits == "" and fraction)):
+        sign = -1 if whole.startswith("-") else 1
+        return sign * (int(digits or 0) * 100 + int(fraction.ljust(2, "0")))
+    return to_cents(text)  # More decimals or unusual formats
+
+# "2024-01-31", "20240131", "01/31/2024" -> YYYYMMDD; ValueError for dates
+# that do not exist ("20241345", "2024-02-30")
+def parse_date(text):
+    text = text.strip()
+    if len(text) >= 10 and text[4] == "-":
+        year, month, day = int(text[:4]), int(text[5:7]), int(text[8:10])
+    elif len(text) >= 10 and text[2] == "/":
+        year, month, day = int(text[6:10]), int(text[:2]), int(text[3:5])
+    elif len(text) >= 8 and text[:8].isdigit():  # YYYYMMDD, possibly followed by a time as in OFX
+        year, month, day = int(text[:4]), int(text[4:6]), int(text[6:8])
+    else:
+        raise ValueError(f"Unrecognized date: {text!r}")
+    calendar_date(year, month, day)
+    return year * 10000 + month * 100 + day
+
+# Yield (date, description, cents, transaction id or "") from a CSV with
+# date, description and amount columns (negative amounts are expenses), or
+# None for a row that cannot be read
+def read_csv_statement(path):
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        reader = csv.reader(f)
+        first = next(reader, None)
+        if first is None:
+            return
+        columns = [name.strip().lower() for name in first]
+        if {"date", "description", "amount"} <= set(columns):
+            date_col, text_col, amount_col = (columns.index(name) for name in ("date", "description", "amount"))
+            id_col = columns.index("id") if "id" in columns else None
+            rows = reader
+        else:  # No header: date, description, amount
+            date_col, text_col, amount_col, id_col = 0, 1, 2, None
+            rows = _prepend(first, reader)
+        for row in rows:
+            try:
+                yield (parse_date(row[date_col]), row[text_col], parse_cents(row[amount_col]),
+                       row[id_col] if id_col is not None else "")
+            except (IndexError, ValueError, ArithmeticError):
+                yield None  # Malformed row
+
+def _prepend(first, rows):
+    yield first
+    yield from rows
+
+OFX_FIELD = re.compile(r"<(\w+)>([^<\r\n]*)")
+
+# Yield the same tuples (or None) from an OFX/QFX-style file: <STMTTRN> blocks
+# with DTPOSTED, TRNAMT, NAME/MEMO and FITID fields (closing tags optional)
+def read_ofx_statement(path):
+    with open(path, encoding="utf-8", errors="replace") as f:
+        fields = None
+        for line in f:
+            for tag, value in OFX_FIELD.findall(line):
+                tag = tag.upper()
+                if tag == "STMTTRN":
+                    fields = {}
+                elif fields is not None:
+                    fields[tag] = value.strip()
+            if fields is not None and "</STMTTRN>" in line.upper():
+                try:
+                    description = " ".join(filter(None, [fields.get("NAME"), fields.get("MEMO")]))
+                    yield (parse_date(fields["DTPOSTED"]), description, parse_cents(fields["TRNAMT"]),
+                           fields.get("FITID", ""))
+                except (KeyError, ValueError, ArithmeticError):
+                    yield None  # Malformed transaction
+                fields = None
+
+def read_statement(path):
+    with open(path, "rb") as f:
+        head = f.read(4096).upper()
+    if b"<OFX>" in head or b"OFXHEADER" in head or b"<STMTTRN>" in head:
+        return read_ofx_statement(path)
+    return read_csv_statement(path)
+
+# Yield lists of up to size items
+def chunked(rows, size=CHUNK_SIZE):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) >= size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+# Fingerprints of every row imported so far: an append-only file, extended after
+# each chunk reaches the ledger's log, and a sorted copy of what it held when the
+# import started. Rows within one statement never collide (see _fingerprint), so
+# lookups only need the earlier imports.
+class ImportIndex:
+    def __init__(self, path):
+        self.path = path
+        self.fingerprints = np.fromfile(path, dtype=np.uint64) if os.path.exists(path) else np.zeros(0, np.uint64)
+        self.fingerprints.sort()
+
+    # Boolean mask of fingerprints not seen in earlier imports
+    def unseen(self, fingerprints):
+        if len(self.fingerprints) == 0:
+            return np.ones(len(fingerprints), dtype=bool)
+        positions = np.searchsorted(self.fingerprints, fingerprints)
+        positions[positions == len(self.fingerprints)] = 0
+        return self.fingerprints[positions] != fingerprints
+
+    def add(self, fingerprints):
+        with open(self.path, "ab") as f:
+            fingerprints.tofile(f)
+            f.flush()
+            os.fsync(f.fileno())
+
+# 64-bit fingerprint of a statement row. Rows without a bank transaction id
+# are numbered within their (date, amount, description) group, so two identical
+# coffees on the same day both import but a re-import of the file matches again.
+def _fingerprint(date, description, cents, transaction_id, occurrence):
+    key = f"{date}|{cents}|{transaction_id}|{description.strip().lower()}|{occurrence}"
+    return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "little")
+
+# Stream a statement into the ledger; returns a report dict. Rows are
+# categorized, de-duplicated against earlier imports and logged chunk by chunk.
+def import_statement(ledger, path, matcher=None, chunk_size=CHUNK_SIZE, index_path=None):
+    matcher = matcher or CategoryMatcher()
+    if index_path is None:
+        index_path = (ledger.storage.path if ledger.storage is not None else "budget_ledger.bin") + IMPORTED_SUFFIX
+    index = ImportIndex(index_path)
+    report = {"rows": 0, "imported": 0, "duplicates": 0, "rejected": 0,
+              "income_cents": 0, "expense_cents": 0, "by_category": {}}
+    occurrences = {}  # Counts per identical row for the current date (statements are in date order)
+    current_date = None
+
+    for rows in chunked(read_statement(path), chunk_size):
+        chunk = [row for row in rows if row is not None]
+        report["rows"] += len(rows)
+        report["rejected"] += len(rows) - len(chunk)
+        fingerprints = array("Q")
+        for date, description, cents, transaction_id in chunk:
+            if date != current_date:
+                occurrences = {}
+                current_date = date
+            key = (cents, description, transaction_id)
+            occurrence = occurrences[key] = occurrences.get(key, -1) + 1
+            fingerprints.append(_fingerprint(date, description, cents, transaction_id, occurrence))
+        fingerprints = np.frombuffer(fingerprints, dtype=np.uint64)
+        fresh = index.unseen(fingerprints)
+
+        transactions = []
+        by_category = report["by_category"]
+        for (date, description, cents, _), is_new in zip(chunk, fresh.tolist()):
+            if not is_new:
+                continue
+            entry_type = "income" if cents > 0 else "expenses"
+            category = matcher.match(description) or UNCATEGORIZED[entry_type]
+            transactions.append((date, entry_type, category, abs(cents)))
+            by_category[category] = by_category.get(category, 0) + abs(cents)
+            report["income_cents" if cents > 0 else "expense_cents"] += abs(cents)
+
+        ledger.add_batch(transactions)  # Logged before the rows are marked as imported
+        index.add(fingerprints[fresh])
+        report["imported"] += len(transactions)
+        report["duplicates"] += len(chunk) - len(transactions)
+    return report
+
+def print_import_report(report, seconds):
+    rate = report["rows"] / seconds if seconds else 0
+    print("=== STATEMENT IMPORT ===")
+    print(f"Rows read: {report['rows']:,} in {seconds:.2f}s ({rate:,.0f} rows/sec)")
+    print(f"Imported: {report['imported']:,}  Skipped as already imported: {report['duplicates']:,}  "
+          f"Rejected as malformed: {report['rejected']:,}")
+    print(f"Income: ${report['income_cents'] / 100:,.2f}  Expenses: ${report['expense_cents'] / 100:,.2f}")
+    for category, cents in sorted(report["by_category"].items(), key=lambda item: -item[1]):
+        print(f"{category:<16} ${cents / 100:>16,.2f}")
+
+def main():
+    from budget_tracker import load_data  # Same ledger files as the menu
+
+    parser = argparse.ArgumentParser(description="Import a bank statement (CSV or OFX) into the budget ledger")
+    parser.add_argument("statement", help="CSV with date,description,amount columns, or an OFX/QFX file")
+    parser.add_argument("--rules", help="CSV of pattern,category rules (default: built-in keywords)")
+    parser.add_argument("--chunk-size", type=int, default=CHUNK_SIZE)
+    args = parser.parse_args()
+
+    matcher = CategoryMatcher(load_rules(args.rules)) if args.rules else CategoryMatcher()
+    ledger = load_data()
+    start = time.perf_counter()
+    report = import_statement(ledger, args.statement, matcher, args.chunk_size)
+    ledger.storage.snapshot(wait=True)  # Fold the bulk log into the snapshot
+    ledger.storage.close()
+    print_import_report(report, time.perf_counter() - start)
+
+if __name__ == "__main__":
+    main()
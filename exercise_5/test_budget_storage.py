@@ -0,0 +1,130 @@
+import os        # Log paths and sizes
+import random    # Deterministic change streams
+import tempfile  # Scratch ledger files
+import unittest
+
+from budget_storage import BudgetStorage
+from ledger import ENTRY_TYPES, Ledger
+
+CATEGORIES = ["Food", "Rent", "Fun", "Salary", "Café"]
+
+# Comparable contents of a ledger: transactions with category names, and every
+# month in the {"income": ..., "expenses": ..., "limits": ...} shape
+def contents(ledger):
+    names = ledger.categories
+    transactions = [(date, ENTRY_TYPES[kind], names[category_id], cents) for date, kind, category_id, cents
+                    in zip(ledger.dates, ledger.types, ledger.category_ids, ledger.amounts)]
+    return transactions, {month: ledger[month] for month in ledger.months}
+
+# Apply count random single adds, batches and limit changes to ledger
+def make_changes(ledger, rng, count):
+    for _ in range(count):
+        date = 20240101 + rng.randrange(12) * 100 + rng.randrange(28)
+        category = rng.choice(CATEGORIES)
+        choice = rng.random()
+        if choice < 0.6:
+            ledger.add(date, rng.choice(ENTRY_TYPES), category, rng.randint(1, 100_000))
+        elif choice < 0.8:
+            ledger.add_batch([(date, "expenses", category, rng.randint(1, 5_000)) for _ in range(rng.randint(1, 5))])
+        else:
+            ledger.set_limit(f"{date // 10000}-{date // 100 % 100:02d}", category, rng.randint(1, 500_000))
+
+class BudgetStorageTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "budget_ledger.bin")
+        self.rng = random.Random(0)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def open(self):
+        storage = BudgetStorage(self.path, snapshot_every=10**9, durable=False)
+        return storage, storage.load_into(Ledger())
+
+    def reopened(self):
+        storage, ledger = self.open()
+        storage.close()
+        return ledger
+
+    def test_replays_log_after_last_snapshot(self):
+        storage, ledger = self.open()
+        make_changes(ledger, self.rng, 200)
+        storage.snapshot(wait=True)
+        make_changes(ledger, self.rng, 200)  # Only in the new log
+        expected = contents(ledger)
+        storage.close()
+        self.assertLess(len(Ledger.load(self.path)), len(expected[0]))  # The snapshot alone is behind
+        self.assertEqual(contents(self.reopened()), expected)
+
+    def test_truncates_torn_tail_record(self):
+        storage, ledger = self.open()
+        make_changes(ledger, self.rng, 100)
+        expected = contents(ledger)
+        log_path = storage._log_path(storage.generation)
+        storage.close()
+        valid_size = os.path.getsize(log_path)
+        for torn in (b"T", b"T\x01\x02\x03", b"L" + bytes(12) + b"\x05\x00Fo"):
+            with open(log_path, "ab") as f:
+                f.write(torn)  # A record cut short by a crash
+            storage, ledger = self.open()
+            self.assertEqual(contents(ledger), expected)
+            self.assertEqual(os.path.getsize(log_path), valid_size)
+            storage.close()
+
+        # Appends after the truncation are recovered too
+        storage, ledger = self.open()
+        make_changes(ledger, self.rng, 50)
+        expected = contents(ledger)
+        storage.close()
+        self.assertEqual(contents(self.reopened()), expected)
+
+    # Crash after the log was rotated but before the snapshot was written:
+    # the old snapshot plus both logs still hold everything
+    def test_crash_before_snapshot_is_written(self):
+        storage, ledger = self.open()
+        make_changes(ledger, self.rng, 100)
+        storage.snapshot(wait=True)
+        make_changes(ledger, self.rng, 100)
+        storage._write_snapshot = lambda copy: None  # Dies before saving
+        storage.snapshot(wait=True)
+        make_changes(ledger, self.rng, 100)
+        expected = contents(ledger)
+        storage.close()
+        self.assertEqual(Ledger.load(self.path).generation, 1)
+        recovered = self.reopened()
+        self.assertEqual(contents(recovered), expected)
+
+    # Crash after the snapshot was renamed into place but before the older log
+    # was deleted: that log is already in the snapshot and must not be replayed again
+    def test_crash_before_old_log_is_removed(self):
+        storage, ledger = self.open()
+        make_changes(ledger, self.rng, 100)
+        storage._write_snapshot = lambda copy: copy.save(self.path)  # Dies before cleaning up
+        storage.snapshot(wait=True)
+        make_changes(ledger, self.rng, 100)
+        expected = contents(ledger)
+        storage.close()
+        self.assertTrue(os.path.exists(self.path + ".wal.0"))
+        storage, recovered = self.open()
+        self.assertEqual(contents(recovered), expected)
+        self.assertFalse(os.path.exists(self.path + ".wal.0"))
+        self.assertEqual(recovered.generation, 1)
+        make_changes(recovered, self.rng, 50)  # Keeps logging to the current generation
+        expected = contents(recovered)
+        storage.close()
+        self.assertEqual(contents(self.reopened()), expected)
+
+    def test_rebuilt_aggregates_match_stored(self):
+        storage, ledger = self.open()
+        make_changes(ledger, self.rng, 300)
+        storage.snapshot(wait=True)
+        make_changes(ledger, self.rng, 300)
+        storage.close()
+        for loaded in (Ledger.load(self.path), self.reopened()):
+            stored = contents(loaded)[1]
+            loaded.rebuild_aggregates()
+            self.assertEqual(contents(loaded)[1], stored)
+
+if __name__ == "__main__":
+    unittest.main()
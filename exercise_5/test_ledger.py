@@ -0,0 +1,42 @@
+import io  # Captured summary output
+import unittest
+from contextlib import redirect_stdout
+
+from budget_tracker import show_summary
+from ledger import Ledger, to_cents
+
+# Amounts are rounded to whole cents once, on entry, half-cents up as typed.
+# This deliberately differs from the old float totals, which kept sub-cent
+# amounts and binary rounding error: 1.005 printed as $1.00 (the float is
+# 1.00499...), and 0.10 + 0.20 spent against a 0.30 limit counted as over budget.
+class RoundingTest(unittest.TestCase):
+    def test_to_cents_rounds_half_up(self):
+        self.assertEqual(to_cents(1.005), 101)
+        self.assertEqual(to_cents(2.675), 268)
+        self.assertEqual(to_cents(0.004), 0)
+        self.assertEqual(to_cents(-1.005), -101)  # Half away from zero
+        self.assertEqual(to_cents(19.99), 1999)
+
+    def summary(self, ledger):
+        output = io.StringIO()
+        with redirect_stdout(output):
+            show_summary(ledger, "2024-01")
+        return output.getvalue()
+
+    def test_summary_shows_rounded_cents(self):
+        ledger = Ledger()
+        ledger.add(20240101, "income", "Salary", to_cents(1.005))
+        self.assertIn("Total Income: $1.01", self.summary(ledger))
+
+    def test_cent_totals_are_exact(self):
+        ledger = Ledger()
+        ledger.add(20240101, "income", "Salary", to_cents(100))
+        ledger.add(20240101, "expenses", "Food", to_cents(0.1))
+        ledger.add(20240101, "expenses", "Food", to_cents(0.2))
+        ledger.set_limit("2024-01", "Food", to_cents(0.3))
+        output = self.summary(ledger)
+        self.assertIn("Total Expenses: $0.30", output)
+        self.assertIn("No budget overruns.", output)
+
+if __name__ == "__main__":
+    unittest.main()
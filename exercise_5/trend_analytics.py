@@ -0,0 +1,137 @@
+import weakref  # Per-ledger matrix cache that does not keep ledgers alive
+from functools import cached_property
+
+import numpy as np  # Month x category matrix and vectorized trend math
+
+from ledger import ENTRY_TYPES
+
+ROLLING_WINDOW = 3  # Months in a rolling average
+ANOMALY_WINDOW = 6  # Trailing months an amount is compared against (at least 2)
+ANOMALY_Z = 3.0  # Standard deviations from the trailing mean that count as unusual
+MIN_ANOMALY_CENTS = 1000  # Ignore deviations smaller than $10
+
+# "YYYY-MM" <-> months since year 0
+def month_number(month):
+    return int(month[:4]) * 12 + int(month[5:7]) - 1
+
+def month_label(number):
+    return f"{number // 12:04d}-{number % 12 + 1:02d}"
+
+# Month x category totals (in cents) for one entry type over every month from
+# the ledger's first to its last, built from the transaction columns in one
+# vectorized pass. Prefix sums over months are computed once on first use, so
+# any range total afterwards costs O(1) per category.
+class TrendMatrix:
+    def __init__(self, ledger, entry_type="expenses"):
+        self.categories = list(ledger.categories)
+        if ledger.months:
+            numbers = [month_number(month) for month in ledger.months]
+            self.first, last = min(numbers), max(numbers)
+        else:
+            self.first, last = 0, -1
+        num_months, num_categories = last - self.first + 1, len(self.categories)
+        self.months = [month_label(number) for number in range(self.first, last + 1)]
+
+        dates = np.frombuffer(ledger.dates, dtype=np.uint32)  # Views, no copies
+        types = np.frombuffer(ledger.types, dtype=np.uint8)
+        category_ids = np.frombuffer(ledger.category_ids, dtype=np.uint32)
+        amounts = np.frombuffer(ledger.amounts, dtype=np.int64)
+        selected = types == ENTRY_TYPES.index(entry_type)
+        yyyymm = dates[selected] // 100
+        rows = (yyyymm // 100).astype(np.int64) * 12 + (yyyymm % 100) - 1 - self.first
+        cells = rows * num_categories + category_ids[selected]
+        # Float64 sums of integer cents are exact up to 2**53 cents per cell
+        totals = np.bincount(cells, weights=amounts[selected], minlength=num_months * num_categories)
+        self.matrix = np.rint(totals).astype(np.int64).reshape(num_months, num_categories)
+
+    def month_index(self, month):
+        index = month_number(month) - self.first
+        if not 0 <= index < len(self.months):
+            raise KeyError(f"no data for {month}")
+        return index
+
+    # Row range [first, stop) of start..end clipped to the months with data
+    def _rows(self, start, end):
+        first = max(month_number(start) - self.first, 0)
+        stop = min(month_number(end) - self.first + 1, len(self.months))
+        return first, max(first, stop)
+
+    def category_index(self, category):
+        return self.categories.index(category)
+
+    # Cumulative totals with a leading zero row: prefix[i] = sum of months [0, i)
+    @cached_property
+    def prefix(self):
+        prefix = np.zeros((len(self.months) + 1, len(self.categories)), dtype=np.int64)
+        np.cumsum(self.matrix, axis=0, out=prefix[1:])
+        return prefix
+
+    @cached_property
+    def prefix_squares(self):
+        prefix = np.zeros((len(self.months) + 1, len(self.categories)), dtype=np.float64)
+        np.cumsum(self.matrix.astype(np.float64) ** 2, axis=0, out=prefix[1:])
+        return prefix
+
+    # Per-category totals over start..end inclusive (cents); months without data count as zero
+    def range_total(self, start, end):
+        first, stop = self._rows(start, end)
+        return self.prefix[stop] - self.prefix[first]
+
+    # Per-category monthly average over start..end inclusive (cents)
+    def range_average(self, start, end):
+        return self.range_total(start, end) / max(month_number(end) - month_number(start) + 1, 1)
+
+    # Average of each month and the window - 1 months before it; NaN until a full window exists
+    def rolling_average(self, window=ROLLING_WINDOW):
+        result = np.full(self.matrix.shape, np.nan)
+        if window <= len(self.months):
+            result[window - 1:] = (self.prefix[window:] - self.prefix[:-window]) / window
+        return result
+
+    # Change from the previous month; the first month is NaN
+    def month_over_month(self):
+        result = np.full(self.matrix.shape, np.nan)
+        result[1:] = np.diff(self.matrix, axis=0)
+        return result
+
+    # Change from the same month a year earlier; the first year is NaN
+    def year_over_year(self):
+        result = np.full(self.matrix.shape, np.nan)
+        result[12:] = self.matrix[12:] - self.matrix[:-12]
+        return result
+
+    # Boolean matrix marking months whose amount is more than z standard
+    # deviations from the mean of the window months before it
+    def anomaly_flags(self, window=ANOMALY_WINDOW, z=ANOMALY_Z):
+        flags = np.zeros(self.matrix.shape, dtype=bool)
+        if len(self.months) <= window:
+            return flags
+        sums = (self.prefix[window:-1] - self.prefix[:-window - 1]).astype(np.float64)
+        squares = self.prefix_squares[window:-1] - self.prefix_squares[:-window - 1]
+        mean = sums / window
+        std = np.sqrt(np.maximum((squares - window * mean ** 2) / (window - 1), 0.0))  # Sample std
+        deviation = np.abs(self.matrix[window:] - mean)
+        flags[window:] = (deviation > z * std) & (deviation >= MIN_ANOMALY_CENTS)
+        return flags
+
+    # Flagged (month, category, cents, trailing mean cents) within start..end
+    def anomalies(self, start, end, window=ANOMALY_WINDOW, z=ANOMALY_Z):
+        first, stop = self._rows(start, end)
+        flags = self.anomaly_flags(window, z)
+        found = []
+        for row, column in zip(*np.nonzero(flags[first:stop])):
+            row += first
+            mean = (self.prefix[row, column] - self.prefix[row - window, column]) / window
+            found.append((self.months[row], self.categories[column], int(self.matrix[row, column]), mean))
+        return found
+
+_cache = weakref.WeakKeyDictionary()  # Ledger -> {entry type: (ledger size, TrendMatrix)}
+
+# TrendMatrix for a ledger, rebuilt only when it has changed since the last call
+# (transactions, months and categories only ever grow)
+def trends_for(ledger, entry_type="expenses"):
+    size = (len(ledger), len(ledger.months), len(ledger.categories))
+    cached = _cache.setdefault(ledger, {}).get(entry_type)
+    if cached is None or cached[0] != size:
+        cached = _cache[ledger][entry_type] = (size, TrendMatrix(ledger, entry_type))
+    return cached[1]